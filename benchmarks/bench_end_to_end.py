@@ -0,0 +1,317 @@
+"""
+End-to-End Pipeline Benchmark
+
+Runs the three pipeline stages (generate content, generate image, publish)
+against local stand-in services and a fake chat model, and reports latency,
+sequential throughput (back-to-back runs per minute, i.e. 1/latency plus
+per-run overhead, not a concurrency measurement) and peak memory for a single
+run and a batch of runs. No live credentials are needed.
+
+Run with:
+    python benchmarks/bench_end_to_end.py --runs 20
+    python benchmarks/bench_end_to_end.py --latency brave=80 --latency chat=400 --error-rate openai=0.1
+    python benchmarks/bench_end_to_end.py --json bench.json --baseline old_bench.json --tolerance 0.2
+"""
+
+import os
+import io
+import sys
+import json
+import math
+import time
+import shutil
+import importlib
+import tempfile
+import tracemalloc
+import contextlib
+import statistics
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'scripts'))
+
+from fake_chat_model import FakeChatModel
+from fake_services import SERVICES, FakeServices, ServiceConfig
+
+
+STAGES = [
+    ("generate_content", "linkedin_agent"),
+    ("generate_image", "openai_image_generator"),
+    ("publish", "linkedin_publisher"),
+]
+
+
+@contextlib.contextmanager
+def pipeline_environment(services: FakeServices, chat_model: FakeChatModel):
+    """
+    Point the pipeline modules at the stand-in services for the duration of
+    the block, restoring environment and module attributes afterwards.
+
+    The rate limiter uses a private database and quotas far above what the
+    benchmark sends, so its overhead is measured but it never throttles.
+    """
+    import engagement_harvester
+    import linkedin_agent
+    import linkedin_publisher
+    import rate_limiter
+    import sheets_manager
+
+    environment = services.environment()
+    saved_env = {name: os.environ.get(name) for name in environment}
+    limiter_dir = tempfile.mkdtemp(prefix="bench-rate-limits-")
+    patches = [
+        (rate_limiter, "RATE_LIMIT_DB", os.path.join(limiter_dir, "rate_limits.sqlite3")),
+        (rate_limiter, "QUOTAS", {api: (1e9, 1e9) for api in rate_limiter.DEFAULT_QUOTAS}),
+        (linkedin_agent, "BRAVE_SEARCH_URL", environment["BRAVE_SEARCH_API_URL"]),
+        (linkedin_agent, "create_chat_model", lambda model_name: chat_model),
+        (sheets_manager, "SHEETS_API_ENDPOINT", environment["GOOGLE_SHEETS_API_ENDPOINT"]),
+        (linkedin_publisher, "LINKEDIN_API_BASE", environment["LINKEDIN_API_BASE"]),
+        (engagement_harvester, "LINKEDIN_API_BASE", environment["LINKEDIN_API_BASE"]),
+    ]
+    saved_attrs = [(module, name, getattr(module, name)) for module, name, _ in patches]
+
+    os.environ.update(environment)
+    for module, name, value in patches:
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for module, name, value in saved_attrs:
+            setattr(module, name, value)
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        shutil.rmtree(limiter_dir, ignore_errors=True)
+
+
+def run_pipeline(workdir: str, verbose: bool = False) -> Dict[str, Any]:
+    """
+    Run all stages once in a working directory.
+
+    Args:
+        workdir: Directory for the stage input/output files
+        verbose: Show the scripts' own output
+
+    Returns:
+        Dictionary with success flag and per-stage latency in milliseconds
+    """
+    result: Dict[str, Any] = {"ok": True, "stages": {}}
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    output = sys.stdout if verbose else io.StringIO()
+    try:
+        for stage, module_name in STAGES:
+            module = importlib.import_module(module_name)
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(output):
+                    module.main()
+            except SystemExit as e:
+                if e.code:
+                    result["ok"] = False
+                    result["failed_stage"] = stage
+            result["stages"][stage] = (time.perf_counter() - start) * 1000.0
+            if not result["ok"]:
+                break
+    finally:
+        os.chdir(previous_dir)
+    result["total_ms"] = sum(result["stages"].values())
+    return result
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    # Nearest-rank percentile
+    ordered = sorted(values)
+    index = max(0, math.ceil(percentile / 100.0 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def run_benchmark(runs: int = 10, service_config: Optional[Dict[str, ServiceConfig]] = None,
+                  chat_latency_ms: float = 0.0, chat_error_rate: float = 0.0,
+                  image_bytes: int = 256 * 1024, verbose: bool = False) -> Dict[str, Any]:
+    """
+    Benchmark a single run followed by a batch of runs.
+
+    Args:
+        runs: Number of runs in the batch
+        service_config: Per-service latency/error settings
+        chat_latency_ms: Fake chat model latency per call
+        chat_error_rate: Fraction of chat model calls that fail
+        image_bytes: Size of the fake generated image
+        verbose: Show the scripts' own output
+
+    Returns:
+        Benchmark report dictionary
+    """
+    chat_model = FakeChatModel(latency_ms=chat_latency_ms, error_rate=chat_error_rate)
+    themes = [f"Previously used theme {i}" for i in range(30)]
+
+    with FakeServices(config=service_config, image_bytes=image_bytes, themes=themes) as services:
+        with pipeline_environment(services, chat_model), tempfile.TemporaryDirectory() as root:
+            # Single (cold) run: includes first-use imports of LangChain, OpenAI, Google clients
+            single = run_pipeline(os.path.join(root, _mkdir(root, "single")), verbose=verbose)
+
+            # Traced run for peak Python memory (tracing slows the run, so it is not timed)
+            tracemalloc.start()
+            run_pipeline(os.path.join(root, _mkdir(root, "traced")), verbose=verbose)
+            _, traced_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            # Batch (warm) runs
+            batch: List[Dict[str, Any]] = []
+            batch_start = time.perf_counter()
+            for i in range(runs):
+                batch.append(run_pipeline(os.path.join(root, _mkdir(root, f"run_{i}")), verbose=verbose))
+            batch_seconds = time.perf_counter() - batch_start
+
+        succeeded = [r for r in batch if r["ok"]]
+        totals = [r["total_ms"] for r in succeeded] or [0.0]
+        report = {
+            "single": {
+                "ok": single["ok"],
+                "total_ms": round(single["total_ms"], 2),
+                "stages_ms": {k: round(v, 2) for k, v in single["stages"].items()},
+                "peak_memory_bytes": traced_peak,
+            },
+            "batch": {
+                "runs": runs,
+                "succeeded": len(succeeded),
+                "sequential_runs_per_min": round(runs / batch_seconds * 60.0, 2) if batch_seconds else 0.0,
+                "latency_ms": {
+                    "mean": round(statistics.mean(totals), 2),
+                    "p50": round(_percentile(totals, 50), 2),
+                    "p95": round(_percentile(totals, 95), 2),
+                    "max": round(max(totals), 2),
+                },
+                "stages_p50_ms": {
+                    stage: round(_percentile([r["stages"][stage] for r in succeeded] or [0.0], 50), 2)
+                    for stage, _ in STAGES
+                },
+                "max_rss_bytes": _max_rss_bytes(),
+            },
+            "services": {
+                "requests": dict(services.requests),
+                "injected_errors": dict(services.errors),
+                "posts_published": len(services.published),
+            },
+            "chat_model_calls": chat_model.calls,
+        }
+    return report
+
+
+def _max_rss_bytes() -> int:
+    try:
+        import resource
+    except ImportError:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _mkdir(root: str, name: str) -> str:
+    os.makedirs(os.path.join(root, name), exist_ok=True)
+    return name
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare a report with a previous one.
+
+    Args:
+        report: Current benchmark report
+        baseline: Previous benchmark report
+        tolerance: Allowed relative increase (0.2 = 20%)
+
+    Returns:
+        List of regression descriptions (empty if none)
+    """
+    checks = [
+        ("batch p50 latency", ("batch", "latency_ms", "p50")),
+        ("batch p95 latency", ("batch", "latency_ms", "p95")),
+        ("peak memory", ("single", "peak_memory_bytes")),
+    ]
+    regressions = []
+    for label, path in checks:
+        current, previous = report, baseline
+        for key in path:
+            current, previous = current[key], previous[key]
+        if previous and current > previous * (1 + tolerance):
+            regressions.append(f"{label}: {current} vs baseline {previous} (+{(current / previous - 1) * 100:.0f}%)")
+    current_rate = report["batch"]["sequential_runs_per_min"]
+    # Older reports called the same measurement "throughput_runs_per_min"
+    baseline_rate = baseline["batch"].get("sequential_runs_per_min", baseline["batch"].get("throughput_runs_per_min"))
+    if baseline_rate and current_rate < baseline_rate * (1 - tolerance):
+        regressions.append(f"sequential runs/min: {current_rate} vs baseline {baseline_rate}")
+    return regressions
+
+
+def _parse_pairs(argv: List[str], flag: str) -> Dict[str, float]:
+    values = {}
+    for i, arg in enumerate(argv):
+        if arg == flag and i + 1 < len(argv):
+            name, _, value = argv[i + 1].partition("=")
+            values[name] = float(value)
+    return values
+
+
+def _flag_value(argv: List[str], flag: str, default: Optional[str] = None) -> Optional[str]:
+    if flag in argv:
+        return argv[argv.index(flag) + 1]
+    return default
+
+
+def main():
+    """
+    Run the benchmark from the command line and print the report.
+    """
+    argv = sys.argv[1:]
+    latencies = _parse_pairs(argv, "--latency")
+    error_rates = _parse_pairs(argv, "--error-rate")
+    unknown = (set(latencies) | set(error_rates)) - set(SERVICES) - {"chat"}
+    if unknown:
+        print(f"❌ Unknown service(s): {', '.join(sorted(unknown))} (expected {', '.join(SERVICES)}, chat)")
+        sys.exit(2)
+
+    service_config = {
+        name: ServiceConfig(latency_ms=latencies.get(name, 0.0), error_rate=error_rates.get(name, 0.0))
+        for name in SERVICES
+    }
+    report = run_benchmark(
+        runs=int(_flag_value(argv, "--runs", "10")),
+        service_config=service_config,
+        chat_latency_ms=latencies.get("chat", 0.0),
+        chat_error_rate=error_rates.get("chat", 0.0),
+        image_bytes=int(_flag_value(argv, "--image-bytes", str(256 * 1024))),
+        verbose="--verbose" in argv
+    )
+
+    print("=" * 50)
+    print("END-TO-END BENCHMARK")
+    print("=" * 50)
+    print(json.dumps(report, indent=2))
+
+    json_path = _flag_value(argv, "--json")
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to {json_path}")
+
+    baseline_path = _flag_value(argv, "--baseline")
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, float(_flag_value(argv, "--tolerance", "0.2")))
+        if regressions:
+            print("\n❌ Performance regressions detected:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
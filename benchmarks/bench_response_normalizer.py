@@ -0,0 +1,134 @@
+"""
+Response Normalizer Micro-Benchmark
+
+Times text extraction from model responses with the shared normalizer against
+the per-call flattening loop it replaced (intermediate list + " ".join), for
+string content, multi-part content and streamed chunks.
+
+Run with: python benchmarks/bench_response_normalizer.py [--number N] [--parts N] [--json out.json]
+"""
+
+import os
+import sys
+import json
+import timeit
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from response_normalizer import normalize_response, normalize_stream
+from fake_chat_model import FakeResponse
+
+# A post-sized JSON answer (~1.5 KB), as Gemini returns it
+POST_JSON = json.dumps({
+    "title": "Your AI agent is only as good as its tools",
+    "content": "Most teams start with the model. The winners start with the workflow. " * 20
+})
+
+USAGE = {"input_tokens": 1200, "output_tokens": 400, "total_tokens": 1600}
+
+
+def legacy_text(content: Any) -> str:
+    """The flattening loop previously duplicated in linkedin_agent."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for part in content:
+            if isinstance(part, dict) and 'text' in part:
+                parts.append(part['text'])
+            elif isinstance(part, str):
+                parts.append(part)
+            else:
+                parts.append(str(part))
+        return " ".join(parts)
+    return str(content)
+
+
+def split_parts(text: str, parts: int) -> List[Dict[str, str]]:
+    """Split text into ``parts`` Gemini-style content parts."""
+    size = max(1, -(-len(text) // parts))
+    return [{"type": "text", "text": text[i:i + size]} for i in range(0, len(text), size)]
+
+
+def _best_us(func, number: int, repeat: int = 5) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def run_benchmark(number: int = 10000, parts: int = 8) -> Dict[str, Dict]:
+    """
+    Time both extractors on each content format.
+
+    Args:
+        number: Calls per timing run (the best of 5 runs is reported)
+        parts: Number of content parts / stream chunks the answer is split into
+
+    Returns:
+        Dictionary of case name to {legacy_us, normalizer_us, exact}, where
+        exact tells whether the extracted text equals the original answer
+    """
+    string_response = FakeResponse(POST_JSON, USAGE)
+    list_response = FakeResponse(split_parts(POST_JSON, parts), USAGE)
+    # Streams report usage and the finish reason on the last chunk only
+    chunks = [FakeResponse([part], None, {}) for part in split_parts(POST_JSON, parts)]
+    chunks[-1] = FakeResponse(chunks[-1].content, USAGE)
+
+    cases = {
+        "string": (
+            lambda: legacy_text(string_response.content),
+            lambda: normalize_response(string_response).text
+        ),
+        "parts": (
+            lambda: legacy_text(list_response.content),
+            lambda: normalize_response(list_response).text
+        ),
+        "stream": (
+            lambda: legacy_text([legacy_text(chunk.content) for chunk in chunks]),
+            lambda: normalize_stream(chunks).text
+        ),
+    }
+    results = {}
+    for name, (legacy, normalizer) in cases.items():
+        results[name] = {
+            "legacy_us": round(_best_us(legacy, number), 3),
+            "normalizer_us": round(_best_us(normalizer, number), 3),
+            "legacy_exact": legacy() == POST_JSON,
+            "exact": normalizer() == POST_JSON
+        }
+    return results
+
+
+def main():
+    """
+    Print per-format timings and exit non-zero if the normalizer loses any text.
+    """
+    number = 10000
+    parts = 8
+    output = None
+    if "--number" in sys.argv:
+        number = int(sys.argv[sys.argv.index("--number") + 1])
+    if "--parts" in sys.argv:
+        parts = int(sys.argv[sys.argv.index("--parts") + 1])
+    if "--json" in sys.argv:
+        output = sys.argv[sys.argv.index("--json") + 1]
+
+    print("=" * 50)
+    print("RESPONSE NORMALIZER MICRO-BENCHMARK")
+    print("=" * 50)
+
+    results = run_benchmark(number=number, parts=parts)
+    for name, result in results.items():
+        status = "✅" if result["exact"] else "❌"
+        print(f"{status} {name}: {result['normalizer_us']:.2f} µs "
+              f"(legacy {result['legacy_us']:.2f} µs{'' if result['legacy_exact'] else ', corrupts text'})")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if not all(result["exact"] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
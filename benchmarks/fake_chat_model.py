@@ -0,0 +1,103 @@
+"""
+Fake Chat Model
+
+Stands in for ChatGoogleGenerativeAI in benchmarks. Answers post requests
+with a valid JSON post and image-prompt requests with a plain description,
+using Gemini 3's list-of-content-parts response format, after a configurable
+latency. Optionally fails a fraction of calls.
+"""
+
+import json
+import random
+import threading
+import time
+from typing import Any, List, Optional
+
+
+POST_CONTENT = " ".join([
+    "Last month I watched a team spend three days wiring a spreadsheet to a CRM by hand.",
+    "Every row copied, every typo fixed twice, every update a small act of faith.",
+    "Nobody on that team was lazy.",
+    "They simply did not know that an n8n workflow could do the same job in an afternoon.",
+    "That is the real gap in automation today.",
+    "It is not the tools, because the tools are cheap, visual and surprisingly capable.",
+    "The gap is the belief that automation belongs to engineers with years of backend experience.",
+    "I build AI agents and automations for a living, and most of my projects start with the same question.",
+    "What repetitive task is quietly eating your week?",
+    "Sometimes it is an AI agent that reads support tickets, tags them and drafts a first reply.",
+    "None of these need a six month roadmap.",
+    "They need someone willing to map the process, test small and iterate fast.",
+    "They pick one painful workflow, automate it, measure the hours saved and repeat.",
+    "If you are still copying data between tabs every Monday, that is your sign.",
+    "Start with one process, document every step and ask which of them a machine could do.",
+    "The hard part is rarely the technology.",
+    "It is deciding that your time is worth more than the task.",
+    "So here is my question for you today.",
+    "Which process in your business would you automate first if you knew it would work on the first try?",
+    "Tell me in the comments, or send me a message and let us map it together this week.",
+    "Let us build something that gives you your Mondays back.",
+])
+
+IMAGE_PROMPT = (
+    "Flat design illustration of a tangled web of spreadsheets transforming into a clean, "
+    "glowing automation flowchart, bold teal and orange palette, minimalist digital style"
+)
+
+
+class FakeResponse:
+    """Minimal stand-in for a LangChain AIMessage."""
+
+    def __init__(self, content: Any, usage_metadata: dict, response_metadata: Optional[dict] = None):
+        self.content = content
+        self.usage_metadata = usage_metadata
+        self.response_metadata = response_metadata or {"finish_reason": "STOP"}
+
+
+class FakeChatModel:
+    """
+    Chat model with deterministic output and configurable latency/failures.
+
+    Args:
+        latency_ms: Delay before each response
+        jitter_ms: Extra uniform random delay
+        error_rate: Fraction of calls that raise RuntimeError
+        seed: Random seed for jitter and failures
+        model_name: Reported model name
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0, model_name: str = "fake-chat-model"):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.model_name = model_name
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def invoke(self, messages: List[Any]) -> FakeResponse:
+        with self._lock:
+            self.calls += 1
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            failed = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if failed:
+            raise RuntimeError("injected chat model error")
+
+        system_prompt = str(getattr(messages[0], "content", ""))
+        prompt_chars = sum(len(str(getattr(m, "content", ""))) for m in messages)
+        if "Visual Prompt" in system_prompt:
+            text = IMAGE_PROMPT
+            parts = [{"type": "text", "text": text}]
+        else:
+            text = json.dumps({"title": "Your Mondays Are Worth More Than Copy and Paste", "content": POST_CONTENT})
+            # Split the JSON across parts the way Gemini 3 may return it
+            middle = len(text) // 2
+            parts = [{"type": "text", "text": text[:middle]}, {"type": "text", "text": text[middle:]}]
+        usage = {
+            "input_tokens": prompt_chars // 4,
+            "output_tokens": len(text) // 4,
+            "total_tokens": prompt_chars // 4 + len(text) // 4,
+        }
+        return FakeResponse(parts, usage, {"finish_reason": "STOP", "model_name": self.model_name})
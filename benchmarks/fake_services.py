@@ -0,0 +1,332 @@
+"""
+Local Stand-In Services
+
+A single threaded HTTP server that imitates the external APIs used by the
+pipeline, so it can be benchmarked without live credentials:
+
+- Brave Search      GET  /brave/res/v1/web/search
+- Google OAuth      POST /google/token
+- Google Sheets     GET  /google/v4/spreadsheets/{id}/values/{range}
+                    POST /google/v4/spreadsheets/{id}/values/{range}:append
+- OpenAI images     POST /openai/v1/images/generations
+                    GET  /openai/files/{name}.png
+- LinkedIn          POST /linkedin/v2/assets?action=registerUpload
+                    PUT  /linkedin/upload/{asset}
+                    POST /linkedin/v2/ugcPosts
+
+Each service has a configurable latency and error rate (HTTP 500/429 responses
+injected at random, seeded for reproducibility).
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+SERVICES = ("brave", "google", "openai", "linkedin")
+
+
+class ServiceConfig:
+    """
+    Latency and error injection settings for one stand-in service.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 500):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+
+def _sheet_of(a1_range: str) -> str:
+    """Tab name of an A1 range such as 'My Tab'!A:A (quotes doubled inside)."""
+    sheet = a1_range.rpartition("!")[0] or a1_range
+    if len(sheet) >= 2 and sheet[0] == sheet[-1] == "'":
+        sheet = sheet[1:-1].replace("''", "'")
+    return sheet
+
+
+def _search_results(query: str, count: int) -> List[Dict[str, Any]]:
+    topics = [
+        "AI agents", "n8n workflows", "no-code platforms", "LLM automation",
+        "Make scenarios", "chatbot builders", "Supabase backends", "Zapier AI",
+        "Flowise pipelines", "process mining", "RAG assistants", "Typebot flows",
+    ]
+    results = []
+    for i in range(count):
+        topic = topics[i % len(topics)]
+        results.append({
+            "title": f"{topic.title()} news #{i + 1} for {query}",
+            "description": f"How teams use {topic} to automate work. " * 3,
+            "url": f"https://example.com/{i + 1}",
+            "page_age": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(time.time() - i * 86400)),
+            "age": f"{i} days ago",
+        })
+    return results
+
+
+def _restli_list(value: str) -> List[str]:
+    """Items of a Rest.li 2.0 "List(a,b)" query value (already URL-decoded)."""
+    if not (value.startswith("List(") and value.endswith(")")):
+        return []
+    return [item for item in value[len("List("):-1].split(",") if item]
+
+
+class FakeServices:
+    """
+    Runs the stand-in HTTP server in a background thread.
+
+    Usage:
+        with FakeServices(config={"brave": ServiceConfig(latency_ms=50)}) as services:
+            os.environ.update(services.environment())
+            ...
+    """
+
+    def __init__(self, config: Optional[Dict[str, ServiceConfig]] = None, image_bytes: int = 256 * 1024,
+                 themes: Optional[List[str]] = None, seed: int = 0, strict_sheets: bool = False):
+        self.config = {name: ServiceConfig() for name in SERVICES}
+        self.config.update(config or {})
+        self.image = b"\x89PNG\r\n\x1a\n" + random.Random(seed).randbytes(image_bytes)
+        self.sheet_rows: Dict[str, List[List[str]]] = {}
+        # Like the real API, reject reads of tabs that do not exist
+        self.strict_sheets = strict_sheets
+        for title in themes or []:
+            self.sheet_rows.setdefault("Sheet1", [["TEMA"]]).append([title])
+        self.published: List[Dict[str, Any]] = []
+        self.uploads: Dict[str, int] = {}
+        self.requests: Dict[str, int] = {name: 0 for name in SERVICES}
+        self.errors: Dict[str, int] = {name: 0 for name in SERVICES}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def engagement(self, post_urn: str) -> Dict[str, int]:
+        """Deterministic engagement counts for a post URN."""
+        number = int(post_urn.rsplit(":", 1)[-1]) if post_urn.rsplit(":", 1)[-1].isdigit() else 0
+        reactions = 5 + (number * 37) % 50
+        return {"reactions": reactions, "comments": number % 7, "impressions": reactions * 40}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeServices":
+        services = self
+
+        class Handler(_Handler):
+            fake = services
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeServices":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def environment(self) -> Dict[str, str]:
+        """
+        Environment variables that point the pipeline at the stand-in services.
+
+        Returns:
+            Mapping of variable name to value
+        """
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_key = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ).decode("ascii")
+        credentials = {
+            "type": "service_account",
+            "project_id": "benchmark",
+            "private_key_id": "benchmark",
+            "private_key": private_key,
+            "client_email": "benchmark@benchmark.iam.gserviceaccount.com",
+            "client_id": "0",
+            "token_uri": f"{self.base_url}/google/token",
+        }
+        return {
+            "BRAVE_SEARCH_API_KEY": "fake",
+            "BRAVE_SEARCH_API_URL": f"{self.base_url}/brave/res/v1/web/search",
+            "GOOGLE_API_KEY": "fake",
+            "GOOGLE_SHEETS_CREDENTIALS": json.dumps(credentials),
+            "GOOGLE_SHEETS_API_ENDPOINT": f"{self.base_url}/google/",
+            "OPENAI_API_KEY": "fake",
+            "OPENAI_BASE_URL": f"{self.base_url}/openai/v1",
+            "LINKEDIN_ACCESS_TOKEN": "fake",
+            "LINKEDIN_API_BASE": f"{self.base_url}/linkedin/v2",
+        }
+
+    def _inject(self, service: str) -> Optional[int]:
+        """Apply latency and decide whether to fail this request."""
+        config = self.config[service]
+        with self._lock:
+            self.requests[service] += 1
+            delay = config.latency_ms + self._random.uniform(0, config.jitter_ms)
+            failed = self._random.random() < config.error_rate
+            if failed:
+                self.errors[service] += 1
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        return config.error_status if failed else None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakeServices
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None,
+              content_type: str = "application/json") -> None:
+        if isinstance(body, (bytes, bytearray)):
+            payload = bytes(body)
+        elif body is None:
+            payload = b""
+        else:
+            payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _dispatch(self, method: str) -> None:
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path)
+        service = path.strip("/").split("/", 1)[0]
+        body = self._body()
+        if service not in SERVICES:
+            self._send(404, {"error": f"unknown service {service}"})
+            return
+        error_status = self.fake._inject(service)
+        if error_status:
+            self._send(error_status, {"error": {"code": error_status, "message": "injected error"}})
+            return
+        handler = getattr(self, f"_{service}", None)
+        handler(method, path, parse_qs(parsed.query), body)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def _brave(self, method: str, path: str, query: Dict[str, List[str]], body: bytes) -> None:
+        q = query.get("q", [""])[0]
+        count = int(query.get("count", ["10"])[0])
+        self._send(200, {"web": {"results": _search_results(q, count)}})
+
+    def _google(self, method: str, path: str, query: Dict[str, List[str]], body: bytes) -> None:
+        if path == "/google/token":
+            self._send(200, {"access_token": "fake-token", "expires_in": 3600, "token_type": "Bearer"})
+            return
+        fake = self.fake
+        parts = path.split("/values")
+        if len(parts) != 2:
+            self._send(404, {"error": {"code": 404, "message": path}})
+            return
+        target = parts[1].lstrip("/")
+        if target.endswith(":append"):
+            sheet = _sheet_of(target[:-len(":append")])
+            values = json.loads(body or b"{}").get("values", [])
+            with fake._lock:
+                fake.sheet_rows.setdefault(sheet, [["TEMA"]]).extend(values)
+            self._send(200, {"updates": {"updatedCells": sum(len(row) for row in values)}})
+        elif target.startswith(":batchGet"):
+            ranges = query.get("ranges", [])
+            missing = [r for r in ranges if fake.strict_sheets and _sheet_of(r) not in fake.sheet_rows]
+            if missing:
+                self._send(400, {"error": {"code": 400, "message": f"Unable to parse range: {missing[0]}"}})
+                return
+            value_ranges = [
+                {"range": r, "values": list(fake.sheet_rows.get(_sheet_of(r), []))}
+                for r in ranges
+            ]
+            self._send(200, {"valueRanges": value_ranges})
+        else:
+            sheet = _sheet_of(target)
+            if fake.strict_sheets and sheet not in fake.sheet_rows:
+                self._send(400, {"error": {"code": 400, "message": f"Unable to parse range: {target}"}})
+                return
+            self._send(200, {"range": target, "values": list(fake.sheet_rows.get(sheet, []))})
+
+    def _openai(self, method: str, path: str, query: Dict[str, List[str]], body: bytes) -> None:
+        if path == "/openai/v1/images/generations":
+            url = f"{self.fake.base_url}/openai/files/{int(time.time() * 1000)}.png"
+            self._send(200, {"created": int(time.time()), "data": [{"url": url}]})
+        elif path.startswith("/openai/files/"):
+            self._send(200, self.fake.image, content_type="image/png")
+        else:
+            self._send(404, {"error": {"message": path}})
+
+    def _linkedin(self, method: str, path: str, query: Dict[str, List[str]], body: bytes) -> None:
+        fake = self.fake
+        if path == "/linkedin/v2/assets":
+            with fake._lock:
+                asset_id = f"urn:li:digitalmediaAsset:{len(fake.uploads) + 1}"
+                fake.uploads[asset_id] = 0
+            self._send(200, {"value": {
+                "asset": asset_id,
+                "uploadMechanism": {"com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {
+                    "uploadUrl": f"{fake.base_url}/linkedin/upload/{asset_id}"
+                }}
+            }})
+        elif path.startswith("/linkedin/upload/"):
+            asset_id = path[len("/linkedin/upload/"):]
+            with fake._lock:
+                fake.uploads[asset_id] = len(body)
+            self._send(201)
+        elif path == "/linkedin/v2/ugcPosts":
+            with fake._lock:
+                fake.published.append(json.loads(body))
+                post_id = f"urn:li:share:{len(fake.published)}"
+            self._send(201, {}, headers={"x-restli-id": post_id})
+        elif path == "/linkedin/v2/socialActions":
+            results = {
+                urn: {
+                    "likesSummary": {"totalLikes": fake.engagement(urn)["reactions"]},
+                    "commentsSummary": {"aggregatedTotalComments": fake.engagement(urn)["comments"]}
+                }
+                for urn in _restli_list(query.get("ids", [""])[0])
+            }
+            self._send(200, {"results": results, "statuses": {urn: 200 for urn in results}, "errors": {}})
+        elif path == "/linkedin/v2/organizationalEntityShareStatistics":
+            elements = [
+                {"share": urn, "totalShareStatistics": {"impressionCount": fake.engagement(urn)["impressions"]}}
+                for urn in _restli_list(query.get("shares", [""])[0])
+            ]
+            self._send(200, {"elements": elements})
+        else:
+            self._send(404, {"message": path})
@@ -0,0 +1,141 @@
+"""
+Import-Time Benchmark
+
+Measures how long each pipeline stage takes to import, using
+``python -X importtime``, and fails if a stage exceeds its startup budget.
+
+Run with: python benchmarks/import_time.py [--repeat N]
+"""
+
+import os
+import re
+import sys
+import subprocess
+from typing import Dict, List, Optional
+
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+
+# Startup budget per stage entry point, in milliseconds (cumulative import time
+# of the module itself, excluding interpreter startup)
+IMPORT_BUDGETS_MS = {
+    "linkedin_agent": 300,
+    "openai_image_generator": 300,
+    "linkedin_publisher": 300,
+    "sheets_manager": 100,
+}
+
+# Dependencies that must only be loaded when a code path actually needs them
+HEAVY_MODULES = [
+    "langchain_core",
+    "langchain_google_genai",
+    "openai",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "numpy",
+]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)\s*$")
+
+
+def _run_python(code: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SCRIPTS_DIR, env.get("PYTHONPATH")]))
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True
+    )
+
+
+def measure_import_time(module: str) -> float:
+    """
+    Measure the cumulative import time of a module in a fresh interpreter.
+
+    Args:
+        module: Name of the module to import
+
+    Returns:
+        Cumulative import time in milliseconds
+    """
+    result = _run_python(f"import {module}")
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and match.group(3) == module:
+            return int(match.group(2)) / 1000.0
+    raise RuntimeError(f"No importtime entry found for {module}")
+
+
+def loaded_heavy_modules(module: str) -> List[str]:
+    """
+    List the heavy dependencies that get loaded just by importing a module.
+
+    Args:
+        module: Name of the module to import
+
+    Returns:
+        Names from HEAVY_MODULES present in sys.modules after the import
+    """
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = _run_python(code).stdout.strip()
+    return output.split(",") if output else []
+
+
+def run_benchmark(repeat: int = 3, budgets: Optional[Dict[str, float]] = None) -> Dict[str, Dict]:
+    """
+    Measure every stage and compare it against its budget.
+
+    The best of ``repeat`` runs is used, so one noisy run does not fail the check.
+
+    Args:
+        repeat: Number of fresh interpreters per stage
+        budgets: Optional override of IMPORT_BUDGETS_MS
+
+    Returns:
+        Dictionary of stage name to measurement results
+    """
+    budgets = budgets or IMPORT_BUDGETS_MS
+    results = {}
+    for module, budget in budgets.items():
+        best = min(measure_import_time(module) for _ in range(repeat))
+        heavy = loaded_heavy_modules(module)
+        results[module] = {
+            "import_ms": round(best, 2),
+            "budget_ms": budget,
+            "heavy_modules": heavy,
+            "ok": best <= budget and not heavy
+        }
+    return results
+
+
+def main():
+    """
+    Print import times for every stage and exit non-zero if any is over budget.
+    """
+    repeat = 3
+    if "--repeat" in sys.argv:
+        repeat = int(sys.argv[sys.argv.index("--repeat") + 1])
+
+    print("=" * 50)
+    print("IMPORT-TIME BENCHMARK")
+    print("=" * 50)
+
+    results = run_benchmark(repeat=repeat)
+    for module, result in results.items():
+        status = "✅" if result["ok"] else "❌"
+        print(f"{status} {module}: {result['import_ms']:.1f} ms (budget {result['budget_ms']} ms)")
+        if result["heavy_modules"]:
+            print(f"   ⚠️ Eagerly loaded: {', '.join(result['heavy_modules'])}")
+
+    if not all(result["ok"] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Artifact Store for Stage Outputs
+
+Content-addressed storage for intermediate pipeline outputs (search results,
+generated post, image prompt, image, publish records), keyed by stage and a
+hash of the stage inputs. With resume mode enabled, a re-run reuses the
+outputs of every stage whose inputs are unchanged, so a retry only redoes the
+stage that actually failed.
+
+Layout:
+    <root>/blobs/<aa>/<sha256>               content (JSON or raw bytes)
+    <root>/stages/<stage>/<input_hash>.json  index entry pointing to a blob
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+from typing import Any, Callable, Optional
+
+
+ARTIFACT_DIR = os.environ.get("LINKEDIN_ARTIFACT_DIR", ".artifacts")
+
+
+def resume_enabled() -> bool:
+    """
+    Check whether resume mode was requested (``--resume`` or LINKEDIN_RESUME=1).
+
+    Returns:
+        True if prior stage outputs should be reused
+    """
+    return "--resume" in sys.argv[1:] or os.environ.get("LINKEDIN_RESUME", "").lower() in ("1", "true", "yes")
+
+
+def input_hash(inputs: Any) -> str:
+    """
+    Hash stage inputs in a canonical JSON form.
+
+    Args:
+        inputs: JSON-serializable stage inputs
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ArtifactStore:
+    """
+    Stage output store on the local filesystem.
+
+    Args:
+        root: Directory holding the store (defaults to LINKEDIN_ARTIFACT_DIR)
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or ARTIFACT_DIR
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], digest)
+
+    def _index_path(self, stage: str, key: str) -> str:
+        return os.path.join(self.root, "stages", stage, f"{key}.json")
+
+    def put_blob(self, data: bytes) -> str:
+        """
+        Store content under its own SHA-256 digest (deduplicated).
+
+        Args:
+            data: Raw content
+
+        Returns:
+            Hex digest of the content
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            _atomic_write(path, data)
+        return digest
+
+    def get_blob(self, digest: str) -> Optional[bytes]:
+        """
+        Read content by digest, verifying its integrity.
+
+        Args:
+            digest: Hex SHA-256 digest
+
+        Returns:
+            Content bytes or None if missing or corrupted
+        """
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != digest:
+            print(f"⚠️ Warning: Artifact blob {digest[:12]} is corrupted, ignoring it")
+            return None
+        return data
+
+    def _put_entry(self, stage: str, inputs: Any, digest: str, kind: str) -> str:
+        key = input_hash(inputs)
+        entry = {
+            "stage": stage,
+            "input_hash": key,
+            "blob": digest,
+            "kind": kind,
+            "created_at": time.time()
+        }
+        _atomic_write(self._index_path(stage, key), json.dumps(entry, indent=2).encode("utf-8"))
+        return digest
+
+    def _get_entry(self, stage: str, inputs: Any) -> Optional[dict]:
+        path = self._index_path(stage, input_hash(inputs))
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def put(self, stage: str, inputs: Any, value: Any) -> str:
+        """
+        Store a JSON-serializable stage output.
+
+        Args:
+            stage: Stage name, e.g. "agent.post"
+            inputs: Inputs that produced the value
+            value: Output to store
+
+        Returns:
+            Digest of the stored content
+        """
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        return self._put_entry(stage, inputs, self.put_blob(data), "json")
+
+    def get(self, stage: str, inputs: Any) -> Optional[Any]:
+        """
+        Load a JSON stage output for the given inputs.
+
+        Returns:
+            Stored value or None if there is no (valid) artifact
+        """
+        entry = self._get_entry(stage, inputs)
+        if not entry or entry.get("kind") != "json":
+            return None
+        data = self.get_blob(entry["blob"])
+        return json.loads(data) if data is not None else None
+
+    def put_bytes(self, stage: str, inputs: Any, data: bytes) -> str:
+        """
+        Store a binary stage output (e.g. an image).
+
+        Returns:
+            Digest of the stored content
+        """
+        return self._put_entry(stage, inputs, self.put_blob(data), "bytes")
+
+    def get_bytes(self, stage: str, inputs: Any) -> Optional[bytes]:
+        """
+        Load a binary stage output for the given inputs.
+
+        Returns:
+            Stored bytes or None if there is no (valid) artifact
+        """
+        entry = self._get_entry(stage, inputs)
+        if not entry or entry.get("kind") != "bytes":
+            return None
+        return self.get_blob(entry["blob"])
+
+    def save(self, stage: str, inputs: Any, value: Any) -> bool:
+        """
+        Best-effort put(): a storage failure is reported but never raised,
+        since losing an artifact only costs a recomputation.
+
+        Returns:
+            True if the value was stored
+        """
+        try:
+            self.put(stage, inputs, value)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Warning: Could not store {stage} artifact: {e}")
+            return False
+
+    def cached(self, stage: str, inputs: Any, compute: Callable[[], Any], resume: bool,
+               should_store: Callable[[Any], bool] = lambda value: value is not None) -> Any:
+        """
+        Return the stored output when resuming, otherwise compute and store it.
+
+        Outputs are always stored (when ``should_store`` accepts them), so a
+        later ``--resume`` run can pick them up.
+
+        Args:
+            stage: Stage name
+            inputs: Stage inputs
+            compute: Function producing the output
+            resume: Whether to reuse a stored output
+            should_store: Predicate deciding if an output is worth keeping
+
+        Returns:
+            Stage output
+        """
+        if resume:
+            value = self.get(stage, inputs)
+            if value is not None:
+                print(f"♻️ Reusing stored {stage} output")
+                return value
+        value = compute()
+        if should_store(value):
+            self.save(stage, inputs, value)
+        return value
@@ -0,0 +1,378 @@
+"""
+LinkedIn Engagement Harvester
+
+Pulls reactions, comments and impressions for published posts and keeps the
+latest snapshot per post in a compact columnar store (a compressed NumPy
+.npz file, one array per column), so the agent can favour themes that
+performed well.
+
+Harvesting is incremental: post ids come from the theme sheet (columns B:C,
+written by the publisher), and only posts that were never fetched, or that
+are still inside the freshness window and were not fetched recently, are
+polled. Counts are fetched in bulk, ENGAGEMENT_BATCH_SIZE posts per request.
+Impressions are only available for posts by organization pages; they are
+stored as -1 for member posts.
+
+Configuration (environment variables):
+    ENGAGEMENT_STORE             Store file (default .artifacts/engagement.npz)
+    ENGAGEMENT_WINDOW_DAYS       Keep polling posts this many days (default 14)
+    ENGAGEMENT_MIN_INTERVAL_H    Minimum hours between polls of a post (default 6)
+"""
+
+import os
+import json
+import time
+import zipfile
+import calendar
+import tempfile
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import numpy as np
+import requests
+
+from instrumentation import instrumented_stage, span
+from artifact_store import ARTIFACT_DIR
+from rate_limiter import acquire
+from sheets_manager import get_published_posts
+from linkedin_publisher import PERSON_URN, get_linkedin_access_token
+from profiles import load_profiles, profile_selection, select_profiles
+
+
+LINKEDIN_API_BASE = os.environ.get("LINKEDIN_API_BASE", "https://api.linkedin.com/v2")
+ENGAGEMENT_STORE = os.environ.get("ENGAGEMENT_STORE", os.path.join(ARTIFACT_DIR, "engagement.npz"))
+FRESHNESS_WINDOW_DAYS = float(os.environ.get("ENGAGEMENT_WINDOW_DAYS", "14"))
+MIN_POLL_INTERVAL_HOURS = float(os.environ.get("ENGAGEMENT_MIN_INTERVAL_H", "6"))
+ENGAGEMENT_BATCH_SIZE = 50
+
+# A comment takes more effort than a reaction, so it counts more
+COMMENT_WEIGHT = 2.0
+
+COLUMNS = {
+    "post_id": str,
+    "profile": str,
+    "theme": str,
+    "published_at": np.float64,   # epoch seconds, NaN if unknown
+    "fetched_at": np.float64,
+    "reactions": np.int64,
+    "comments": np.int64,
+    "impressions": np.int64,      # -1 if unavailable
+}
+
+
+def _empty_columns() -> Dict[str, np.ndarray]:
+    return {name: np.array([], dtype=dtype) for name, dtype in COLUMNS.items()}
+
+
+def _to_columns(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    if not rows:
+        return _empty_columns()
+    return {name: np.array([row[name] for row in rows], dtype=dtype) for name, dtype in COLUMNS.items()}
+
+
+def _parse_time(value: str) -> float:
+    """ISO 8601 UTC time ("2026-01-31T09:00:00Z") to epoch seconds, NaN if unparseable."""
+    try:
+        return float(calendar.timegm(time.strptime(value, "%Y-%m-%dT%H:%M:%SZ")))
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def load_engagement(path: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Load the engagement store.
+
+    Args:
+        path: Store file (defaults to ENGAGEMENT_STORE)
+
+    Returns:
+        Dictionary of column arrays (empty columns if there is no store yet)
+    """
+    path = path or ENGAGEMENT_STORE
+    if not os.path.exists(path):
+        return _empty_columns()
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in COLUMNS}
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+        print(f"⚠️ Warning: Could not read engagement store {path}: {e}")
+        return _empty_columns()
+
+
+def save_engagement(columns: Dict[str, np.ndarray], path: Optional[str] = None) -> None:
+    """
+    Atomically write the engagement store.
+
+    Args:
+        columns: Column arrays
+        path: Store file (defaults to ENGAGEMENT_STORE)
+    """
+    path = path or ENGAGEMENT_STORE
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, **columns)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def update_engagement(columns: Dict[str, np.ndarray], records: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Insert or replace the snapshots of the given posts.
+
+    Args:
+        columns: Current column arrays
+        records: New snapshots, one dict per post with every column
+
+    Returns:
+        Updated column arrays
+    """
+    rows = {
+        str(post_id): {name: columns[name][i].item() for name in COLUMNS}
+        for i, post_id in enumerate(columns["post_id"])
+    }
+    for record in records:
+        rows[record["post_id"]] = record
+    return _to_columns(list(rows.values()))
+
+
+def posts_due(posts: List[Dict[str, Any]], columns: Dict[str, np.ndarray], now: float) -> List[Dict[str, Any]]:
+    """
+    Select the posts to poll: never fetched, or inside the freshness window
+    and not fetched within the minimum interval.
+
+    Args:
+        posts: Published posts with post_id and published_at (epoch seconds)
+        columns: Current engagement store
+        now: Current time (epoch seconds)
+
+    Returns:
+        Posts that should be fetched now
+    """
+    last_fetch = dict(zip(columns["post_id"].tolist(), columns["fetched_at"].tolist()))
+    window = FRESHNESS_WINDOW_DAYS * 86400.0
+    interval = MIN_POLL_INTERVAL_HOURS * 3600.0
+    due = []
+    for post in posts:
+        fetched_at = last_fetch.get(post["post_id"])
+        if fetched_at is None:
+            due.append(post)
+        elif now - post["published_at"] <= window and now - fetched_at >= interval:
+            # NaN publication times compare False and are not re-polled
+            due.append(post)
+    return due
+
+
+def _batches(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _restli_list(urns: List[str]) -> str:
+    return "List(" + ",".join(quote(urn, safe="") for urn in urns) + ")"
+
+
+def fetch_social_actions(post_ids: List[str], access_token: str) -> Dict[str, Dict[str, int]]:
+    """
+    Fetch reaction and comment counts with batched socialActions requests.
+
+    Args:
+        post_ids: Post URNs
+        access_token: LinkedIn OAuth2 access token
+
+    Returns:
+        Dictionary mapping post URN to {"reactions", "comments"}; posts
+        LinkedIn returned no data for are missing
+    """
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "X-Restli-Protocol-Version": "2.0.0"
+    }
+    counts = {}
+    for batch in _batches(post_ids, ENGAGEMENT_BATCH_SIZE):
+        with span("linkedin.social_actions.batch_get", posts=len(batch)) as s:
+            acquire("linkedin")
+            response = requests.get(
+                f"{LINKEDIN_API_BASE}/socialActions?ids={_restli_list(batch)}",
+                headers=headers,
+                timeout=30
+            )
+            s.record_http(response)
+            response.raise_for_status()
+        for urn, actions in response.json().get("results", {}).items():
+            counts[urn] = {
+                "reactions": int(actions.get("likesSummary", {}).get("totalLikes", 0)),
+                "comments": int(actions.get("commentsSummary", {}).get("aggregatedTotalComments", 0))
+            }
+    return counts
+
+
+def fetch_impressions(organization_urn: str, post_ids: List[str], access_token: str) -> Dict[str, int]:
+    """
+    Fetch impression counts of an organization's posts with batched share
+    statistics requests.
+
+    Args:
+        organization_urn: Organization that authored the posts
+        post_ids: Post URNs
+        access_token: LinkedIn OAuth2 access token
+
+    Returns:
+        Dictionary mapping post URN to impression count
+    """
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "X-Restli-Protocol-Version": "2.0.0"
+    }
+    impressions = {}
+    for batch in _batches(post_ids, ENGAGEMENT_BATCH_SIZE):
+        with span("linkedin.share_statistics.get", posts=len(batch)) as s:
+            acquire("linkedin")
+            response = requests.get(
+                f"{LINKEDIN_API_BASE}/organizationalEntityShareStatistics?q=organizationalEntity"
+                f"&organizationalEntity={quote(organization_urn, safe='')}&shares={_restli_list(batch)}",
+                headers=headers,
+                timeout=30
+            )
+            s.record_http(response)
+            response.raise_for_status()
+        for element in response.json().get("elements", []):
+            share = element.get("share") or element.get("ugcPost")
+            if share:
+                impressions[share] = int(element.get("totalShareStatistics", {}).get("impressionCount", 0))
+    return impressions
+
+
+def harvest(profiles: Optional[List[Dict[str, Any]]] = None, now: Optional[float] = None,
+            path: Optional[str] = None) -> Dict[str, int]:
+    """
+    Poll engagement for every due post of the given profiles and update the store.
+
+    Args:
+        profiles: Profiles whose sheet tabs list the posts (defaults to all profiles)
+        now: Current time (epoch seconds), for tests
+        path: Store file (defaults to ENGAGEMENT_STORE)
+
+    Returns:
+        Dictionary with the number of known, polled and updated posts
+    """
+    profiles = profiles or load_profiles()
+    now = time.time() if now is None else now
+    columns = load_engagement(path)
+
+    posts_by_sheet = get_published_posts([p["sheet_name"] for p in profiles])
+    posts = []
+    for profile in profiles:
+        author = profile.get("person_urn") or PERSON_URN
+        for post in posts_by_sheet.get(profile["sheet_name"], []):
+            # Skip placeholders such as linkedin_publisher.UNKNOWN_POST_ID
+            if post["post_id"].startswith("urn:li:"):
+                posts.append({**post, "published_at": _parse_time(post["published_at"]),
+                              "profile": profile["id"], "author": author})
+
+    due = posts_due(posts, columns, now)
+    print(f"📈 {len(posts)} published posts, {len(due)} due for an engagement update")
+    if not due:
+        return {"posts": len(posts), "polled": 0, "updated": 0}
+
+    access_token = get_linkedin_access_token()
+    post_ids = [post["post_id"] for post in due]
+    counts = fetch_social_actions(post_ids, access_token)
+
+    impressions: Dict[str, int] = {}
+    organizations = {post["author"] for post in due if post["author"].startswith("urn:li:organization:")}
+    for organization in organizations:
+        org_posts = [post["post_id"] for post in due if post["author"] == organization]
+        try:
+            impressions.update(fetch_impressions(organization, org_posts, access_token))
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ Warning: Could not fetch impressions for {organization}: {e}")
+
+    records = [
+        {
+            "post_id": post["post_id"],
+            "profile": post["profile"],
+            "theme": post["theme"],
+            "published_at": post["published_at"],
+            "fetched_at": now,
+            "reactions": counts[post["post_id"]]["reactions"],
+            "comments": counts[post["post_id"]]["comments"],
+            "impressions": impressions.get(post["post_id"], -1),
+        }
+        for post in due if post["post_id"] in counts
+    ]
+    save_engagement(update_engagement(columns, records), path)
+    print(f"✅ Updated engagement for {len(records)} posts")
+    return {"posts": len(posts), "polled": len(due), "updated": len(records)}
+
+
+def top_themes(limit: int = 5, profile_id: Optional[str] = None, path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Themes with the highest engagement (reactions + COMMENT_WEIGHT x comments),
+    summed over posts with the same theme.
+
+    Args:
+        limit: Number of themes to return
+        profile_id: Only consider this profile's posts
+        path: Store file (defaults to ENGAGEMENT_STORE)
+
+    Returns:
+        List of {"theme", "engagement", "reactions", "comments", "posts"}, best first
+    """
+    columns = load_engagement(path)
+    mask = np.ones(len(columns["post_id"]), dtype=bool)
+    if profile_id is not None:
+        mask &= columns["profile"] == profile_id
+    if not mask.any():
+        return []
+
+    themes, inverse = np.unique(columns["theme"][mask], return_inverse=True)
+    reactions = np.bincount(inverse, weights=columns["reactions"][mask])
+    comments = np.bincount(inverse, weights=columns["comments"][mask])
+    posts = np.bincount(inverse)
+    engagement = reactions + COMMENT_WEIGHT * comments
+    order = np.argsort(-engagement, kind="stable")[:limit]
+    return [
+        {
+            "theme": str(themes[i]),
+            "engagement": float(engagement[i]),
+            "reactions": int(reactions[i]),
+            "comments": int(comments[i]),
+            "posts": int(posts[i])
+        }
+        for i in order if engagement[i] > 0
+    ]
+
+
+@instrumented_stage("harvest_engagement")
+def main():
+    """
+    Main execution function for the engagement harvester.
+    Polls due posts of the selected profiles (--profile / LINKEDIN_PROFILE,
+    default all) and prints the current top themes.
+    """
+    print("=" * 50)
+    print("LINKEDIN ENGAGEMENT HARVESTER")
+    print("=" * 50)
+
+    profiles = select_profiles(load_profiles(), profile_selection())
+    summary = harvest(profiles)
+
+    for profile in profiles:
+        best = top_themes(profile_id=profile["id"])
+        if best:
+            print(f"\n🏆 Top themes for {profile['name']}:")
+            for item in best:
+                print(f"   {item['engagement']:.0f}  {item['theme']}")
+
+    with open("harvest_result.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
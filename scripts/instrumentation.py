@@ -0,0 +1,371 @@
+"""
+Instrumentation for the LinkedIn Content Pipeline
+
+Lightweight spans around each stage and every external call (Sheets, Brave,
+Gemini, DALL-E, LinkedIn). Each span records its duration, bytes sent and
+received, retries and LLM token usage. Results are written to a JSON metrics
+document (metrics.json, next to publish_result.json) and optionally in
+Prometheus text format (metrics.prom).
+
+Enable with the LINKEDIN_METRICS environment variable:
+    LINKEDIN_METRICS=1           JSON only
+    LINKEDIN_METRICS=prometheus  JSON and Prometheus text
+
+When disabled, span() returns a shared no-op object, so instrumented code
+pays only for a function call.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import contextvars
+from functools import wraps
+from types import GeneratorType
+from typing import Any, Callable, Dict, List, Optional
+
+
+METRICS_FILE = "metrics.json"
+PROMETHEUS_FILE = "metrics.prom"
+
+_mode = os.environ.get("LINKEDIN_METRICS", "").strip().lower()
+_enabled = _mode not in ("", "0", "false", "off")
+_prometheus = _mode == "prometheus"
+
+_lock = threading.Lock()
+_finished: List["Span"] = []
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+def _payload_size(payload: Any) -> int:
+    if payload is None:
+        return 0
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return len(payload)
+    if isinstance(payload, str):
+        return len(payload.encode("utf-8"))
+    if isinstance(payload, (tuple, GeneratorType)):
+        # Parts of one payload, sized lazily so callers never join them up front
+        return sum(_payload_size(part) for part in payload)
+    try:
+        return len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+class Span:
+    """
+    A timed unit of work. Use as a context manager via span().
+    """
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.parent: Optional[str] = None
+        self.start = 0.0
+        self.duration_ms = 0.0
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._t0 = 0.0
+        self._token = None
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        self.parent = parent.name if parent is not None else None
+        self._token = _current_span.set(self)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration_ms = (time.perf_counter() - self._t0) * 1000.0
+        _current_span.reset(self._token)
+        if exc_type is not None and not (exc_type is SystemExit and not exc.code):
+            self.status = "error"
+            self.error = f"{exc_type.__name__}: {exc}"
+        with _lock:
+            _finished.append(self)
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        """Attach extra attributes (model name, HTTP status, ...)."""
+        self.attrs.update(attrs)
+
+    def add_retry(self, count: int = 1) -> None:
+        """Count a retried or hedged attempt."""
+        self.retries += count
+
+    def record_payload(self, sent: Any = None, received: Any = None) -> None:
+        """
+        Add request/response sizes. Accepts bytes, str or JSON-serializable
+        objects; sizes are only computed when instrumentation is enabled.
+        """
+        self.bytes_out += _payload_size(sent)
+        self.bytes_in += _payload_size(received)
+
+    def record_http(self, response: Any) -> None:
+        """Record body sizes and status code from a requests.Response."""
+        content = getattr(response, "content", None)
+        if isinstance(content, (bytes, bytearray)):
+            self.bytes_in += len(content)
+        body = getattr(getattr(response, "request", None), "body", None)
+        if isinstance(body, (bytes, bytearray, str)):
+            self.bytes_out += _payload_size(body)
+        status_code = getattr(response, "status_code", None)
+        if isinstance(status_code, int):
+            self.attrs["http_status"] = status_code
+
+    def record_usage(self, usage: Optional[Dict[str, Any]]) -> None:
+        """Record LLM token usage (LangChain ``usage_metadata`` format)."""
+        if not isinstance(usage, dict):
+            return
+        self.input_tokens += int(usage.get("input_tokens") or 0)
+        self.output_tokens += int(usage.get("output_tokens") or 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "retries": self.retries,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "attrs": self.attrs
+        }
+
+
+class _NoopSpan:
+    """Shared stand-in returned by span() when instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def add_retry(self, count: int = 1) -> None:
+        pass
+
+    def record_payload(self, sent: Any = None, received: Any = None) -> None:
+        pass
+
+    def record_http(self, response: Any) -> None:
+        pass
+
+    def record_usage(self, usage: Optional[Dict[str, Any]]) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def is_enabled() -> bool:
+    """Return True if spans are being recorded."""
+    return _enabled
+
+
+def configure(enabled: bool = True, prometheus: bool = False) -> None:
+    """
+    Enable or disable instrumentation at runtime (overrides LINKEDIN_METRICS).
+
+    Args:
+        enabled: Whether to record spans
+        prometheus: Also write metrics.prom when writing metrics
+    """
+    global _enabled, _prometheus
+    _enabled = enabled
+    _prometheus = prometheus
+
+
+def reset() -> None:
+    """Discard all recorded spans."""
+    with _lock:
+        _finished.clear()
+
+
+def span(name: str, **attrs: Any):
+    """
+    Create a span for a stage or an external call.
+
+    Args:
+        name: Dotted span name, e.g. "brave.search"
+        **attrs: Extra attributes stored with the span. They are evaluated
+                 even when instrumentation is disabled, so pass values the
+                 caller already has rather than formatting new ones
+
+    Returns:
+        Context manager yielding the span
+    """
+    if not _enabled:
+        return _NOOP_SPAN
+    return Span(name, attrs)
+
+
+def current_span():
+    """
+    Return the innermost active span in this context (a no-op span if none),
+    so helpers can annotate the caller's span without being passed it.
+    """
+    active = _current_span.get() if _enabled else None
+    return active if active is not None else _NOOP_SPAN
+
+
+def finished_spans() -> List[Dict[str, Any]]:
+    """Return all finished spans as dictionaries."""
+    with _lock:
+        return [s.to_dict() for s in _finished]
+
+
+def _summarize(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    totals = {"bytes_in": 0, "bytes_out": 0, "retries": 0, "input_tokens": 0, "output_tokens": 0, "errors": 0}
+    for item in spans:
+        for key in ("bytes_in", "bytes_out", "retries", "input_tokens", "output_tokens"):
+            totals[key] += item[key]
+        totals["errors"] += item["status"] == "error"
+    return totals
+
+
+def _prometheus_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(document: Dict[str, Any]) -> str:
+    """
+    Render a metrics document in Prometheus text exposition format.
+
+    Args:
+        document: Document as written by write_metrics()
+
+    Returns:
+        Prometheus text format string
+    """
+    series: Dict[str, Dict[tuple, float]] = {}
+    meta = {
+        "linkedin_span_duration_seconds_sum": ("summary", "Time spent in instrumented spans"),
+        "linkedin_span_duration_seconds_count": (None, None),
+        "linkedin_span_bytes_in_total": ("counter", "Bytes received by instrumented spans"),
+        "linkedin_span_bytes_out_total": ("counter", "Bytes sent by instrumented spans"),
+        "linkedin_span_retries_total": ("counter", "Retried or hedged attempts"),
+        "linkedin_span_errors_total": ("counter", "Spans that ended with an error"),
+        "linkedin_llm_tokens_total": ("counter", "LLM tokens used"),
+    }
+    for stage, stage_data in document.get("stages", {}).items():
+        for item in stage_data.get("spans", []):
+            labels = (("stage", stage), ("span", item["name"]))
+            def add(metric: str, value: float, extra: tuple = ()) -> None:
+                key = labels + extra
+                series.setdefault(metric, {})
+                series[metric][key] = series[metric].get(key, 0) + value
+            add("linkedin_span_duration_seconds_sum", item["duration_ms"] / 1000.0)
+            add("linkedin_span_duration_seconds_count", 1)
+            add("linkedin_span_bytes_in_total", item["bytes_in"])
+            add("linkedin_span_bytes_out_total", item["bytes_out"])
+            add("linkedin_span_retries_total", item["retries"])
+            add("linkedin_span_errors_total", item["status"] == "error")
+            if item["input_tokens"] or item["output_tokens"]:
+                add("linkedin_llm_tokens_total", item["input_tokens"], (("direction", "input"),))
+                add("linkedin_llm_tokens_total", item["output_tokens"], (("direction", "output"),))
+
+    lines = []
+    for metric, (metric_type, help_text) in meta.items():
+        if metric not in series:
+            continue
+        if metric_type:
+            family = metric[:-4] if metric_type == "summary" else metric
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {metric_type}")
+        for key, value in series[metric].items():
+            label_text = ",".join(f'{k}="{_prometheus_label(str(v))}"' for k, v in key)
+            lines.append(f"{metric}{{{label_text}}} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(stage: str, path: str = METRICS_FILE) -> Optional[Dict[str, Any]]:
+    """
+    Write the recorded spans for a stage to the metrics document.
+
+    Stages run as separate processes, so an existing document (passed along
+    from the previous stage) is loaded and this stage's entry is merged in.
+
+    Args:
+        stage: Stage name, e.g. "generate_content"
+        path: Path of the JSON metrics document
+
+    Returns:
+        The full metrics document, or None when instrumentation is disabled
+    """
+    if not _enabled:
+        return None
+
+    document: Dict[str, Any] = {"stages": {}}
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+            document.setdefault("stages", {})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Warning: Could not read existing metrics, overwriting: {e}")
+            document = {"stages": {}}
+
+    spans = finished_spans()
+    root = next((s for s in spans if s["name"] == f"stage.{stage}"), None)
+    document["stages"][stage] = {
+        "duration_ms": root["duration_ms"] if root else None,
+        "status": root["status"] if root else None,
+        "totals": _summarize(spans),
+        "spans": spans
+    }
+    document["updated_at"] = time.time()
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+
+    if _prometheus:
+        prom_path = os.path.join(os.path.dirname(path), PROMETHEUS_FILE)
+        with open(prom_path, "w", encoding="utf-8") as f:
+            f.write(render_prometheus(document))
+
+    print(f"📈 Metrics saved to {path}")
+    return document
+
+
+def instrumented_stage(stage: str) -> Callable:
+    """
+    Decorator for a stage entry point: wraps it in a "stage.<name>" span and
+    writes the metrics document when it returns or exits.
+
+    Args:
+        stage: Stage name, e.g. "publish"
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            reset()
+            try:
+                with span(f"stage.{stage}"):
+                    return func(*args, **kwargs)
+            finally:
+                try:
+                    write_metrics(stage)
+                except Exception as e:
+                    print(f"⚠️ Warning: Could not write metrics: {e}", file=sys.stderr)
+        return wrapper
+    return decorator
@@ -9,12 +9,44 @@ This script implements an AI-powered content creator that:
 """
 
 import os
+import sys
 import json
+import time
+import contextvars
 import requests
-from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, SystemMessage
-from sheets_manager import get_recent_themes
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from sheets_manager import SHEET_NAME, get_recent_themes, get_recent_themes_batch
+from instrumentation import instrumented_stage, span
+from artifact_store import ARTIFACT_DIR, ArtifactStore, resume_enabled
+from rate_limiter import acquire
+from llm_invoker import FALLBACK_MODELS, LATENCY_BUDGET_S, HedgedInvoker, LatencyTracker
+from response_normalizer import NormalizedResponse, normalize_response, response_text
+from post_validator import build_repair_prompt, parse_post_json, repair_post
+from profiles import DEFAULT_PROFILE, build_system_prompt, load_profiles, profile_file, profile_selection, select_profiles
+
+# LangChain and the Gemini client take most of this module's startup time, so
+# they are imported inside the functions that need them.
+
+# Targeted repair prompts allowed per post before giving up
+MAX_REPAIR_ATTEMPTS = 1
+
+# Number of ranked search results sent to the model
+SEARCH_TOP_K = 5
+
+# Keywords and tools of the default profile, used to rank search results by relevance
+PROFILE_KEYWORDS = DEFAULT_PROFILE["keywords"]
+
+# Best performing past themes shown to the model
+TOP_THEMES_LIMIT = 5
+
+# Profiles generated at the same time in a multi-profile run
+MAX_PROFILE_WORKERS = int(os.environ.get("LINKEDIN_PROFILE_WORKERS", "4"))
+
+BRAVE_SEARCH_URL = os.environ.get("BRAVE_SEARCH_API_URL", "https://api.search.brave.com/res/v1/web/search")
+
+# Observed model latencies, used to pick the hedge deadline on the next run
+LLM_LATENCY_HISTORY = os.environ.get("LLM_LATENCY_HISTORY", os.path.join(ARTIFACT_DIR, "llm_latency.json"))
 
 
 def brave_search(query: str) -> str:
@@ -31,7 +63,7 @@ def brave_search(query: str) -> str:
     if not api_key:
         return json.dumps({"error": "BRAVE_SEARCH_API_KEY not found in environment"})
     
-    url = "https://api.search.brave.com/res/v1/web/search"
+    url = BRAVE_SEARCH_URL
     headers = {
         "Accept": "application/json",
         "Accept-Encoding": "gzip",
@@ -40,17 +72,22 @@ def brave_search(query: str) -> str:
     params = {"q": query, "count": 10}
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        with span("brave.search", query=query) as s:
+            acquire("brave")
+            response = requests.get(url, headers=headers, params=params, timeout=30)
+            s.record_http(response)
+            response.raise_for_status()
+            data = response.json()
         
-        # Extract web results
+        # Extract web results (all of them; they are ranked locally before prompting)
         results = []
-        for item in data.get("web", {}).get("results", [])[:5]:
+        for item in data.get("web", {}).get("results", []):
             results.append({
                 "title": item.get("title", ""),
                 "description": item.get("description", ""),
-                "url": item.get("url", "")
+                "url": item.get("url", ""),
+                "age": item.get("age", ""),
+                "page_age": item.get("page_age", "")
             })
         
         return json.dumps({"results": results})
@@ -58,118 +95,338 @@ def brave_search(query: str) -> str:
         return json.dumps({"error": str(e), "results": []})
 
 
-def generate_linkedin_content(model_name: str = "gemini-3-flash-preview") -> Dict[str, Any]:
+def get_used_themes(limit: int = 20, sheet_name: str = SHEET_NAME) -> str:
     """
-    Generate LinkedIn post content using AI.
+    Retrieve previously used themes from Google Sheets.
+    
+    Args:
+        limit: Maximum number of themes to retrieve
+        sheet_name: Sheet tab holding the themes
+        
+    Returns:
+        JSON string with a "themes" list (and "error" if the lookup failed)
+    """
+    try:
+        themes = get_recent_themes(limit=limit, sheet_name=sheet_name)
+        return json.dumps({"themes": themes})
+    except Exception as e:
+        return json.dumps({"error": str(e), "themes": []})
+
+
+def get_top_themes(profile_id: Optional[str] = None, limit: int = TOP_THEMES_LIMIT) -> List[str]:
+    """
+    Retrieve the past themes with the highest engagement from the local
+    engagement store (filled by engagement_harvester.py).
+    
+    Args:
+        profile_id: Only consider this profile's posts
+        limit: Maximum number of themes
+        
+    Returns:
+        Themes, best first (empty if nothing was harvested yet)
+    """
+    # Imported here: the harvester pulls in NumPy, which the agent otherwise
+    # only needs for ranking
+    from engagement_harvester import top_themes
+    
+    try:
+        return [item["theme"] for item in top_themes(limit=limit, profile_id=profile_id)]
+    except Exception as e:
+        print(f"⚠️ Warning: Could not read engagement data: {e}")
+        return []
+
+
+def search_queries(queries: List[str], store: ArtifactStore, resume: bool) -> Dict[str, str]:
+    """
+    Run each distinct search query once (today's results are reused when resuming).
+    
+    Args:
+        queries: Search queries, possibly with duplicates
+        store: Artifact store for search results
+        resume: Reuse stored results
+        
+    Returns:
+        Dictionary mapping each query to its brave_search() JSON string
+    """
+    day = time.strftime("%Y-%m-%d", time.gmtime())
+    results = {}
+    for query in dict.fromkeys(queries):
+        results[query] = store.cached(
+            "agent.search",
+            {"query": query, "day": day},
+            lambda query=query: brave_search(query),
+            resume,
+            should_store=lambda found: "error" not in json.loads(found)
+        )
+    return results
+
+
+def merge_search_results(results_by_query: Dict[str, str], queries: List[str]) -> str:
+    """
+    Combine the results of a profile's queries, dropping duplicate URLs.
+    
+    Args:
+        results_by_query: Output of search_queries()
+        queries: The profile's queries
+        
+    Returns:
+        JSON string in brave_search() format
+    """
+    if len(queries) == 1:
+        return results_by_query[queries[0]]
+    
+    merged, seen, errors = [], set(), []
+    for query in queries:
+        data = json.loads(results_by_query[query])
+        if "error" in data:
+            errors.append(data["error"])
+        for result in data.get("results", []):
+            if result.get("url") not in seen:
+                seen.add(result.get("url"))
+                merged.append(result)
+    combined: Dict[str, Any] = {"results": merged}
+    if errors and not merged:
+        combined["error"] = errors[0]
+    return json.dumps(combined)
+
+
+def rank_search_results(search_results: str, used_themes: List[str], top_k: int = SEARCH_TOP_K,
+                        keywords: Optional[List[str]] = None) -> str:
+    """
+    Keep the top-k search results by relevance, novelty and recency.
+    
+    Args:
+        search_results: JSON string returned by brave_search()
+        used_themes: Previously used themes (ranked down as not novel)
+        top_k: Number of results to keep
+        keywords: Profile keywords for relevance (defaults to PROFILE_KEYWORDS)
+        
+    Returns:
+        JSON string with the ranked "results" (compact, without ranking fields)
+    """
+    from search_ranker import rank_results
+    
+    data = json.loads(search_results)
+    results = data.get("results", [])
+    if not results:
+        return search_results
+    
+    ranked = rank_results(results, keywords or PROFILE_KEYWORDS, used_themes, top_k=top_k)
+    print(f"🏆 Ranked {len(results)} search results, keeping top {len(ranked)}")
+    data["results"] = [
+        {"title": r["title"], "description": r["description"], "url": r["url"], "age": r.get("age", "")}
+        for r in ranked
+    ]
+    return json.dumps(data)
+
+
+def create_chat_model(model_name: str):
+    """
+    Create the chat model used for content generation.
     
     Args:
         model_name: Google Gemini model to use
         
     Returns:
-        Dictionary with title, content, and image_prompt
+        LangChain chat model instance
     """
-    # Initialize model
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    
     api_key = os.environ.get("GOOGLE_API_KEY")
-    model = ChatGoogleGenerativeAI(
+    return ChatGoogleGenerativeAI(
         model=model_name,
         google_api_key=api_key,
-        temperature=0.7
+        temperature=0.7,
+        timeout=LATENCY_BUDGET_S
     )
+
+
+def create_llm(model_name: str) -> HedgedInvoker:
+    """
+    Create the hedged invoker for content generation: the primary model
+    followed by the LLM_FALLBACK_MODELS cascade.
     
-    # Get used themes from Google Sheets
-    print("📊 Fetching used themes from Google Sheets...")
-    try:
-        used_themes = get_recent_themes(limit=20)
-        print(f"Found {len(used_themes)} used themes")
-    except Exception as e:
-        print(f"⚠️ Warning: Could not fetch used themes: {e}")
-        used_themes = []
-    
-    # Search for trending content
-    print("🔍 Searching for trending AI/Automation content...")
-    search_query = "latest AI automation low-code no-code news 2026"
-    search_results = brave_search(search_query)
-    
-    # Content generation prompt
-    system_prompt = """You are an AI Content Strategist for Guilherme's LinkedIn profile.
-
-Guilherme is an n8n developer, specialist in Low-Code, No-Code, and Artificial Intelligence. He works with automations, AI agent creation, chatbots, and process optimization. Tools: n8n, Make, Zapier, Bubble.io, Framer, ManyChat, Typebot, Supabase, Flowise, and various AI APIs.
-
-Contact: WhatsApp 21977709013 | Email: guifaceads@gmail.com
-
-YOUR TASK:
-1. Analyze the search results for AI/Automation/Low-Code topics
-2. Choose ONE compelling and recent topic that is NOT in the used themes list
-3. Create an engaging LinkedIn post following these guidelines:
-
-CONTENT GUIDELINES:
-- Create a strong hook at the beginning (evoke pain, curiosity, or personal dilemma)
-- Use engaging narrative that leads to reflection
-- Include a call to action at the end
-- Avoid corporate language; use human, informal, direct tone
-- 250-300 words max
-- Mention tools like n8n, Make, or AI agents if relevant
-- Write in English
-- NO ** formatting
-- NO emojis
-
-OUTPUT FORMAT (JSON):
-{
-  "title": "Hook-based title without **",
-  "content": "Full post (250-300 words, English, no emojis, no **)"
-}"""
+    Args:
+        model_name: Primary Google Gemini model
+        
+    Returns:
+        HedgedInvoker over the model cascade
+    """
+    names = [model_name] + [name for name in FALLBACK_MODELS if name != model_name]
+    models = [(name, create_chat_model(name)) for name in names]
+    return HedgedInvoker(models, tracker=LatencyTracker(LLM_LATENCY_HISTORY))
+
+
+def _has_text(response: Any) -> bool:
+    """Accept any response with non-empty text; post guidelines are checked afterwards."""
+    return bool(response_text(response.content).strip())
+
+
+def _invoke(llm: HedgedInvoker, messages: List[Any], purpose: str) -> Tuple[NormalizedResponse, str]:
+    """
+    Invoke the model cascade inside a span and normalize the answer.
     
-    user_prompt = f"""Used Themes (AVOID THESE):
-{json.dumps(used_themes, indent=2)}
+    Args:
+        llm: Hedged invoker over the model cascade
+        messages: Chat messages to send
+        purpose: Span label (post, repair, image_prompt)
+        
+    Returns:
+        Tuple of (normalized response, name of the model that answered)
+    """
+    with span("gemini.invoke", purpose=purpose) as s:
+        response, model_used = llm.invoke(messages, validate=_has_text)
+        normalized = normalize_response(response)
+        s.record_payload(sent=(m.content for m in messages), received=normalized.text)
+        s.record_usage(normalized.usage)
+        if normalized.finish_reason:
+            s.set(finish_reason=normalized.finish_reason)
+    if normalized.truncated:
+        print(f"⚠️ Warning: {model_used} hit its output token limit ({purpose}), the response may be cut off")
+    return normalized, model_used
 
-Search Results:
-{search_results}
 
-Based on these results, create a compelling LinkedIn post for Guilherme. Choose a recent topic NOT in the used themes list. Return ONLY valid JSON with 'title' and 'content' keys."""
+def generate_post(llm: HedgedInvoker, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+    """
+    Ask the model for a post, then validate and repair it.
+    
+    Mechanical guideline violations are fixed locally; only posts that are
+    unparseable or too short get one short, targeted repair prompt instead of
+    a full regeneration.
+    
+    Args:
+        llm: Hedged invoker over the model cascade
+        system_prompt: Content strategist system prompt
+        user_prompt: Prompt with used themes and search results
+        
+    Returns:
+        Dictionary with title, content, model (the model that answered) and
+        validation_issues (empty if valid)
+    """
+    from langchain_core.messages import HumanMessage, SystemMessage
     
-    print("📝 Generating LinkedIn post content...")
     messages = [
         SystemMessage(content=system_prompt),
         HumanMessage(content=user_prompt)
     ]
     
-    response = model.invoke(messages)
-    
-    # Extract content - handle both string and list formats
-    if isinstance(response.content, str):
-        content_text = response.content
-    elif isinstance(response.content, list):
-        # Gemini 3 returns list of content parts (dicts with 'text' key)
-        parts = []
-        for part in response.content:
-            if isinstance(part, dict) and 'text' in part:
-                parts.append(part['text'])
-            elif isinstance(part, str):
-                parts.append(part)
-            else:
-                parts.append(str(part))
-        content_text = " ".join(parts)
-    else:
-        content_text = str(response.content)
+    response, model_used = _invoke(llm, messages, "post")
+    content_text = response.text
     
-    # Parse JSON from response
-    try:
-        import re
-        json_match = re.search(r'\{[\s\S]*"title"[\s\S]*"content"[\s\S]*\}', content_text)
-        if json_match:
-            post_data = json.loads(json_match.group(0))
-        else:
-            post_data = json.loads(content_text)
-    except json.JSONDecodeError as e:
-        print(f"⚠️ Warning: Could not parse JSON: {e}")
-        print(f"Response: {content_text[:200]}...")
-        post_data = {
-            "title": "AI & Automation Insights",
-            "content": content_text[:300] if len(content_text) > 300 else content_text
-        }
+    # Validate locally; repair mechanical issues without calling the model again
+    post_data, issues = repair_post(parse_post_json(content_text))
     
-    print(f"✅ Post generated: {post_data.get('title', 'N/A')}")
+    for attempt in range(MAX_REPAIR_ATTEMPTS):
+        if not issues:
+            break
+        print(f"⚠️ Post failed validation ({'; '.join(i['message'] for i in issues)}), requesting a targeted fix...")
+        repair_prompt = build_repair_prompt(post_data, issues, content_text)
+        response, model_used = _invoke(llm, [HumanMessage(content=repair_prompt)], "repair")
+        content_text = response.text
+        repaired, repaired_issues = repair_post(parse_post_json(content_text))
+        if not isinstance(post_data, dict) or len(repaired_issues) <= len(issues):
+            post_data, issues = repaired, repaired_issues
+    
+    if not isinstance(post_data, dict):
+        print(f"⚠️ Warning: Could not parse JSON. Response: {content_text[:200]}...")
+        post_data = {"title": "", "content": ""}
+    if issues:
+        print(f"⚠️ Warning: Post still invalid: {'; '.join(i['message'] for i in issues)}")
+    post_data["model"] = model_used
+    post_data["validation_issues"] = [issue["message"] for issue in issues]
+    
+    return post_data
+
+
+def generate_image_prompt(llm: HedgedInvoker, image_system_prompt: str, image_user_prompt: str) -> str:
+    """
+    Ask the model for an image prompt that complements the post.
+    
+    Args:
+        llm: Hedged invoker over the model cascade
+        image_system_prompt: Visual prompt generator system prompt
+        image_user_prompt: Prompt containing the post content
+        
+    Returns:
+        Image prompt description
+    """
+    from langchain_core.messages import HumanMessage, SystemMessage
     
+    image_messages = [
+        SystemMessage(content=image_system_prompt),
+        HumanMessage(content=image_user_prompt)
+    ]
+    
+    image_response, _ = _invoke(llm, image_messages, "image_prompt")
+    return image_response.text.strip()
+
+
+def generate_profile_content(profile: Dict[str, Any], llm: HedgedInvoker, store: ArtifactStore,
+                             used_themes: List[str], search_results: str, model_name: str,
+                             resume: bool, top_themes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Generate the post and image prompt for one profile from already fetched
+    themes and search results.
+
+    Args:
+        profile: Profile config
+        llm: Hedged invoker over the model cascade
+        store: Artifact store for the post and image prompt
+        used_themes: The profile's previously used themes
+        search_results: JSON string with the profile's search results
+        model_name: Primary model name (part of the artifact keys)
+        resume: Reuse stored outputs
+        top_themes: Past themes with the highest engagement, best first
+
+    Returns:
+        Dictionary with title, content, image_prompt, model and validation_issues
+        (a post with validation issues gets no image prompt)
+    """
+    # Rank all fetched results locally and keep only the best ones for the prompt
+    search_results = rank_search_results(search_results, used_themes, keywords=profile["keywords"])
+
+    # Content generation prompt
+    system_prompt = build_system_prompt(profile)
+
+    # Past performance, when harvested, steers the topic choice
+    engagement_section = ""
+    if top_themes:
+        engagement_section = f"""Best Performing Past Themes (the audience engaged most with these; prefer similar angles, do not repeat them):
+{json.dumps(top_themes, indent=2)}
+
+"""
+
+    user_prompt = f"""Used Themes (AVOID THESE):
+{json.dumps(used_themes, indent=2)}
+
+{engagement_section}Search Results:
+{search_results}
+
+Based on these results, create a compelling LinkedIn post for {profile["name"]}. Choose a recent topic NOT in the used themes list. Return ONLY valid JSON with 'title' and 'content' keys."""
+
+    print(f"📝 Generating LinkedIn post content for {profile['name']}...")
+    post_inputs = {"model": model_name, "system_prompt": system_prompt, "user_prompt": user_prompt}
+    post_data = store.cached(
+        "agent.post",
+        post_inputs,
+        lambda: generate_post(llm, system_prompt, user_prompt),
+        resume,
+        should_store=lambda post: not post["validation_issues"]
+    )
+
+    if post_data["validation_issues"]:
+        # The publisher would reject this post, so don't pay for an image prompt and image
+        print(f"❌ Post for {profile['name']} is invalid, skipping the image prompt")
+        return {
+            "title": post_data.get("title", ""),
+            "content": post_data.get("content", ""),
+            "image_prompt": "",
+            "model": post_data.get("model", model_name),
+            "validation_issues": post_data["validation_issues"]
+        }
+
+    print(f"✅ Post generated: {post_data.get('title', 'N/A')}")
+
     # Generate image prompt
     print("🎨 Generating image prompt...")
     image_system_prompt = """You are an AI Visual Prompt Generator.
@@ -182,69 +439,179 @@ RULES:
 - Avoid generic office images; use visual metaphors
 - Output a single descriptive prompt in English (NOT JSON)
 - Style: modern, professional, eye-catching"""
-    
+
     image_user_prompt = f"""Generate an image prompt for this post:
 
 {post_data.get('content', '')}
 
 Return ONLY the image prompt description, no JSON."""
-    
-    image_messages = [
-        SystemMessage(content=image_system_prompt),
-        HumanMessage(content=image_user_prompt)
-    ]
-    
-    image_response = model.invoke(image_messages)
-    
-    # Extract image prompt - handle both string and list formats  
-    if isinstance(image_response.content, str):
-        image_prompt = image_response.content.strip()
-    elif isinstance(image_response.content, list):
-        # Gemini 3 returns list of dicts with 'text' key
-        parts = []
-        for part in image_response.content:
-            if isinstance(part, dict) and 'text' in part:
-                parts.append(part['text'])
-            elif isinstance(part, str):
-                parts.append(part)
-            else:
-                parts.append(str(part))
-        image_prompt = " ".join(parts).strip()
-    else:
-        image_prompt = str(image_response.content).strip()
-    
+
+    image_inputs = {"model": model_name, "system_prompt": image_system_prompt, "user_prompt": image_user_prompt}
+    image_prompt = store.cached(
+        "agent.image_prompt",
+        image_inputs,
+        lambda: generate_image_prompt(llm, image_system_prompt, image_user_prompt),
+        resume,
+        should_store=bool
+    )
+
     print(f"✅ Image prompt generated!")
     print(f"🎨 Prompt: {image_prompt[:80]}...")
-    
+
     return {
         "title": post_data.get("title", ""),
         "content": post_data.get("content", ""),
-        "image_prompt": image_prompt
+        "image_prompt": image_prompt,
+        "model": post_data.get("model", model_name),
+        "validation_issues": post_data.get("validation_issues", [])
     }
 
 
-def main():
+def generate_linkedin_content(model_name: str = "gemini-3-flash-preview", resume: bool = False,
+                              profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Generate LinkedIn post content using AI.
+
+    Every intermediate output is stored in the artifact store; with resume
+    enabled, outputs whose inputs are unchanged are reused instead of
+    repeating the search or the model calls.
+
+    Args:
+        model_name: Google Gemini model to use
+        resume: Reuse stored outputs from a previous run
+        profile: Profile to write for (defaults to DEFAULT_PROFILE)
+
+    Returns:
+        Dictionary with title, content, and image_prompt
+    """
+    profile = profile or DEFAULT_PROFILE
+    store = ArtifactStore()
+
+    # Initialize the model cascade
+    llm = create_llm(model_name)
+
+    # Get used themes from Google Sheets
+    print("📊 Fetching used themes from Google Sheets...")
+    themes_data = json.loads(get_used_themes(limit=20, sheet_name=profile["sheet_name"]))
+    used_themes = themes_data["themes"]
+    if "error" in themes_data:
+        print(f"⚠️ Warning: Could not fetch used themes: {themes_data['error']}")
+    else:
+        print(f"Found {len(used_themes)} used themes")
+
+    # Search for trending content
+    print("🔍 Searching for trending AI/Automation content...")
+    search_results = merge_search_results(search_queries(profile["queries"], store, resume), profile["queries"])
+
+    return generate_profile_content(profile, llm, store, used_themes, search_results, model_name, resume,
+                                    top_themes=get_top_themes(profile["id"]))
+
+
+def generate_for_profiles(profiles: List[Dict[str, Any]], model_name: str = "gemini-3-flash-preview",
+                          resume: bool = False) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    Generate content for several profiles in one run.
+
+    Shared work is done once: every distinct search query runs a single time
+    and all profiles' theme tabs are read with one Sheets batchGet. Post and
+    image prompt generation then runs concurrently per profile.
+
+    Args:
+        profiles: Profiles to generate for
+        model_name: Google Gemini model to use
+        resume: Reuse stored outputs from a previous run
+
+    Returns:
+        Tuple of (outputs by profile id, error messages by profile id)
+    """
+    store = ArtifactStore()
+    llm = create_llm(model_name)
+
+    print(f"📊 Fetching used themes for {len(profiles)} profiles from Google Sheets...")
+    themes_by_sheet = get_recent_themes_batch([p["sheet_name"] for p in profiles], limit=20)
+
+    all_queries = [query for p in profiles for query in p["queries"]]
+    print(f"🔍 Running {len(set(all_queries))} distinct searches for {len(all_queries)} profile queries...")
+    results_by_query = search_queries(all_queries, store, resume)
+
+    outputs: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    workers = max(1, min(MAX_PROFILE_WORKERS, len(profiles)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Each task runs in a copy of the current context so its spans nest under this stage
+        futures = {
+            p["id"]: executor.submit(
+                contextvars.copy_context().run,
+                generate_profile_content,
+                p, llm, store, themes_by_sheet.get(p["sheet_name"], []),
+                merge_search_results(results_by_query, p["queries"]), model_name, resume,
+                get_top_themes(p["id"])
+            )
+            for p in profiles
+        }
+        for profile_id, future in futures.items():
+            try:
+                outputs[profile_id] = future.result()
+            except Exception as e:
+                print(f"❌ Error generating content for profile {profile_id}: {e}")
+                errors[profile_id] = str(e)
+
+    return outputs, errors
+
+
+@instrumented_stage("generate_content")
+def main(resume: Optional[bool] = None, selection: Optional[str] = None):
     """
     Main execution function for LinkedIn content generation.
+
+    Args:
+        resume: Reuse stored stage outputs (defaults to --resume / LINKEDIN_RESUME)
+        selection: Profiles to generate for, "all" or comma-separated ids
+                   (defaults to --profile / LINKEDIN_PROFILE; None runs the default profile)
     """
+    if resume is None:
+        resume = resume_enabled()
+    if selection is None:
+        selection = profile_selection()
+
     print("=" * 50)
     print("LINKEDIN CONTENT GENERATOR")
     print("=" * 50)
-    
+
+    if selection:
+        profiles = select_profiles(load_profiles(), selection)
+        outputs, errors = generate_for_profiles(profiles, resume=resume)
+        for profile_id, output in outputs.items():
+            output_file = profile_file("linkedin_post.json", profile_id)
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
+            print(f"💾 Output for {profile_id} saved to {output_file}")
+            if output["validation_issues"]:
+                errors[profile_id] = "; ".join(output["validation_issues"])
+        if errors:
+            print(f"❌ Generation failed for: {', '.join(errors)}")
+            sys.exit(1)
+        return outputs
+
     # Generate content
-    output = generate_linkedin_content()
-    
+    output = generate_linkedin_content(resume=resume)
+
     # Save to JSON file
     output_file = "linkedin_post.json"
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(output, f, indent=2, ensure_ascii=False)
-    
+
     print(f"\n💾 Output saved to {output_file}")
     print("\n" + "=" * 50)
     print("FINAL OUTPUT:")
     print("=" * 50)
     print(json.dumps(output, indent=2, ensure_ascii=False))
-    
+
+    if output["validation_issues"]:
+        # Fail here rather than in the image and publish stages
+        print(f"❌ Post is invalid: {'; '.join(output['validation_issues'])}")
+        sys.exit(1)
+
     return output
 
 
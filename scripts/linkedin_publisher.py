@@ -7,19 +7,29 @@ Publishes posts to LinkedIn using the LinkedIn API and updates Google Sheets.
 import os
 import json
 import sys
+import time
 import base64
-from typing import Optional, Dict, Any
+import hashlib
+from typing import Optional, Dict, Any, Tuple
 import requests
-from sheets_manager import add_theme
+from sheets_manager import SHEET_NAME, add_theme
+from instrumentation import instrumented_stage, span
+from artifact_store import ArtifactStore, resume_enabled
+from post_validator import repair_post
+from rate_limiter import acquire
+from profiles import profile_file, profile_selection, resolve_profile
 
 
 # LinkedIn API Configuration
-LINKEDIN_API_BASE = "https://api.linkedin.com/v2"
+LINKEDIN_API_BASE = os.environ.get("LINKEDIN_API_BASE", "https://api.linkedin.com/v2")
 
 # ⚠️ IMPORTANT: Replace with your LinkedIn Person URN
 # Get your Person URN by following the instructions in CREDENTIALS_SETUP.md
 PERSON_URN = "urn:li:person:YOUR_PERSON_URN_HERE"
 
+# Returned for a published post when LinkedIn sends no x-restli-id header
+UNKNOWN_POST_ID = "unknown"
+
 
 def get_linkedin_access_token() -> str:
     """
@@ -34,13 +44,14 @@ def get_linkedin_access_token() -> str:
     return token
 
 
-def upload_image_to_linkedin(image_base64: str, access_token: str) -> Optional[str]:
+def upload_image_to_linkedin(image_base64: str, access_token: str, owner_urn: str = PERSON_URN) -> Optional[str]:
     """
     Upload an image to LinkedIn and get the asset URN.
     
     Args:
         image_base64: Base64-encoded image data
         access_token: LinkedIn OAuth2 access token
+        owner_urn: LinkedIn member or organization owning the image
         
     Returns:
         Asset URN string or None if upload failed
@@ -58,7 +69,7 @@ def upload_image_to_linkedin(image_base64: str, access_token: str) -> Optional[s
         register_payload = {
             "registerUploadRequest": {
                 "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
-                "owner": PERSON_URN,
+                "owner": owner_urn,
                 "serviceRelationships": [
                     {
                         "relationshipType": "OWNER",
@@ -69,13 +80,16 @@ def upload_image_to_linkedin(image_base64: str, access_token: str) -> Optional[s
         }
         
         print("📤 Registering image upload with LinkedIn...")
-        register_response = requests.post(
-            register_url,
-            headers=headers,
-            json=register_payload,
-            timeout=30
-        )
-        register_response.raise_for_status()
+        with span("linkedin.assets.register_upload") as s:
+            acquire("linkedin")
+            register_response = requests.post(
+                register_url,
+                headers=headers,
+                json=register_payload,
+                timeout=30
+            )
+            s.record_http(register_response)
+            register_response.raise_for_status()
         register_data = register_response.json()
         
         # Extract upload URL and asset URN
@@ -93,13 +107,16 @@ def upload_image_to_linkedin(image_base64: str, access_token: str) -> Optional[s
         }
         
         print("📤 Uploading image binary...")
-        upload_response = requests.put(
-            upload_url,
-            headers=upload_headers,
-            data=image_bytes,
-            timeout=60
-        )
-        upload_response.raise_for_status()
+        with span("linkedin.assets.upload") as s:
+            acquire("linkedin")
+            upload_response = requests.put(
+                upload_url,
+                headers=upload_headers,
+                data=image_bytes,
+                timeout=60
+            )
+            s.record_http(upload_response)
+            upload_response.raise_for_status()
         
         print("✅ Image uploaded successfully!")
         return asset_urn
@@ -112,8 +129,9 @@ def upload_image_to_linkedin(image_base64: str, access_token: str) -> Optional[s
 def create_linkedin_post(
     text: str,
     image_asset_urn: Optional[str] = None,
-    access_token: Optional[str] = None
-) -> bool:
+    access_token: Optional[str] = None,
+    author_urn: str = PERSON_URN
+) -> Optional[str]:
     """
     Create a post on LinkedIn.
     
@@ -121,9 +139,10 @@ def create_linkedin_post(
         text: The post content text
         image_asset_urn: Optional asset URN for image attachment
         access_token: LinkedIn OAuth2 access token
+        author_urn: LinkedIn member or organization to post as
         
     Returns:
-        True if successful, False otherwise
+        Post URN (from the x-restli-id header) if successful, None otherwise
     """
     if access_token is None:
         access_token = get_linkedin_access_token()
@@ -138,7 +157,7 @@ def create_linkedin_post(
     
     # Build the post payload
     payload: Dict[str, Any] = {
-        "author": PERSON_URN,
+        "author": author_urn,
         "lifecycleState": "PUBLISHED",
         "specificContent": {
             "com.linkedin.ugc.ShareContent": {
@@ -168,34 +187,69 @@ def create_linkedin_post(
     
     try:
         print("📤 Publishing post to LinkedIn...")
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
+        with span("linkedin.ugc_posts.create", has_image=image_asset_urn is not None) as s:
+            acquire("linkedin")
+            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            s.record_http(response)
+            response.raise_for_status()
         
-        post_id = response.headers.get("x-restli-id", "unknown")
+        post_id = response.headers.get("x-restli-id") or UNKNOWN_POST_ID
         print(f"✅ Post published successfully! ID: {post_id}")
-        return True
+        return post_id
         
     except requests.exceptions.HTTPError as e:
         print(f"❌ HTTP Error publishing post: {e}")
         print(f"📄 Response: {e.response.text}")
-        return False
+        return None
     except Exception as e:
         print(f"❌ Unexpected error publishing post: {e}")
-        return False
+        return None
 
 
-def main():
+def upload_image(store: ArtifactStore, image_base64: str, image_digest: str,
+                 access_token: str, owner_urn: str, resume: bool) -> Optional[str]:
     """
-    Main execution function for LinkedIn publishing.
-    Reads post data from linkedin_post.json and publishes to LinkedIn.
+    Upload an image once per owner, reusing a stored asset URN on resume.
+    
+    Args:
+        store: Artifact store holding previous uploads
+        image_base64: Base64-encoded image data
+        image_digest: SHA-256 of the image bytes
+        access_token: LinkedIn OAuth2 access token
+        owner_urn: LinkedIn member or organization owning the image
+        resume: Reuse a stored upload for the same owner and image
+        
+    Returns:
+        Asset URN string or None if upload failed
     """
-    # Load post data
-    input_file = "linkedin_post.json"
+    upload_inputs = {"owner": owner_urn, "image": image_digest}
+    stored_urn = store.get("publish.upload", upload_inputs) if resume else None
+    if stored_urn:
+        print(f"\n♻️ Reusing uploaded image asset: {stored_urn}")
+        return stored_urn
     
-    if not os.path.exists(input_file):
-        print(f"❌ Error: {input_file} not found. Run linkedin_agent.py first.")
-        sys.exit(1)
+    print("\n🖼️ Image detected, uploading to LinkedIn...")
+    image_asset_urn = upload_image_to_linkedin(image_base64, access_token, owner_urn=owner_urn)
+    if image_asset_urn:
+        store.save("publish.upload", upload_inputs, image_asset_urn)
+    else:
+        print("⚠️ Image upload failed, will post without image")
+    return image_asset_urn
+
+
+def load_post(input_file: str) -> Tuple[str, str]:
+    """
+    Read a generated post and run the last local check on it.
+    
+    Exits the process if the post has no content or breaks the content
+    guidelines, since nothing should reach LinkedIn in that case.
     
+    Args:
+        input_file: Path of the linkedin_post.json written by the agent
+        
+    Returns:
+        Tuple of (title, content)
+    """
     with open(input_file, "r", encoding="utf-8") as f:
         post_data = json.load(f)
     
@@ -203,29 +257,90 @@ def main():
     content = post_data.get("content", "")
     
     if not content:
-        print("❌ Error: No content found in linkedin_post.json")
+        print(f"❌ Error: No content found in {input_file}")
         sys.exit(1)
     
-    # Check for image file
-    image_file = "linkedin_image.png"
-    image_base64 = None
+    # Last local check before anything reaches LinkedIn
+    checked_post, issues = repair_post({"title": title, "content": content})
+    if issues:
+        print("❌ Error: Post does not meet the content guidelines:")
+        for issue in issues:
+            print(f"   - {issue['message']}")
+        sys.exit(1)
+    return checked_post["title"], checked_post["content"]
+
+
+def load_image(image_file: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Load the generated image, if there is one.
     
-    if os.path.exists(image_file):
-        # Check if file has content (not a placeholder)
-        file_size = os.path.getsize(image_file)
-        if file_size > 0:
-            print(f"\n🖼️ Image file detected: {image_file} ({file_size} bytes)")
-            try:
-                with open(image_file, "rb") as img_f:
-                    image_base64 = base64.b64encode(img_f.read()).decode('utf-8')
-                print(f"✅ Image loaded and encoded ({len(image_base64)} chars)")
-            except Exception as e:
-                print(f"⚠️ Warning: Failed to load image file: {e}")
-                image_base64 = None
-        else:
-            print(f"\n📝 Image file is empty (placeholder), will post text only")
-    else:
+    Args:
+        image_file: Path of the image written by the image generator
+        
+    Returns:
+        Tuple of (base64-encoded image, SHA-256 of the image bytes), both None
+        for a text-only post
+    """
+    if not os.path.exists(image_file):
         print("\n📝 No image file found, will post text only")
+        return None, None
+    
+    # Check if file has content (not a placeholder)
+    file_size = os.path.getsize(image_file)
+    if file_size == 0:
+        print(f"\n📝 Image file is empty (placeholder), will post text only")
+        return None, None
+    
+    print(f"\n🖼️ Image file detected: {image_file} ({file_size} bytes)")
+    try:
+        with open(image_file, "rb") as img_f:
+            image_bytes = img_f.read()
+        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        print(f"✅ Image loaded and encoded ({len(image_base64)} chars)")
+        return image_base64, hashlib.sha256(image_bytes).hexdigest()
+    except Exception as e:
+        print(f"⚠️ Warning: Failed to load image file: {e}")
+        return None, None
+
+
+@instrumented_stage("publish")
+def main(resume: Optional[bool] = None, selection: Optional[str] = None):
+    """
+    Main execution function for LinkedIn publishing.
+    Reads post data from linkedin_post.json and publishes to LinkedIn.
+    
+    With resume enabled, steps that already succeeded for the same post
+    (image upload, publishing, Sheets update) are not repeated, so a retry
+    never publishes the same post twice.
+    
+    Args:
+        resume: Reuse stored step results (defaults to --resume / LINKEDIN_RESUME)
+        selection: Profile id to publish for (defaults to --profile /
+                   LINKEDIN_PROFILE; uses its files, author URN and sheet tab)
+    """
+    if resume is None:
+        resume = resume_enabled()
+    if selection is None:
+        selection = profile_selection()
+    try:
+        profile = resolve_profile(selection)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    profile_id = profile["id"] if profile else None
+    author_urn = (profile or {}).get("person_urn") or PERSON_URN
+    sheet_name = profile["sheet_name"] if profile else SHEET_NAME
+    store = ArtifactStore()
+    
+    # Load post data
+    input_file = profile_file("linkedin_post.json", profile_id)
+    
+    if not os.path.exists(input_file):
+        print(f"❌ Error: {input_file} not found. Run linkedin_agent.py first.")
+        sys.exit(1)
+    
+    title, content = load_post(input_file)
+    image_base64, image_digest = load_image(profile_file("linkedin_image.png", profile_id))
     
     # Get LinkedIn access token
     try:
@@ -234,29 +349,50 @@ def main():
         print(f"❌ {e}")
         sys.exit(1)
     
+    post_inputs = {"author": author_urn, "text": content, "image": image_digest}
+    published = store.get("publish.post", post_inputs) if resume else None
+    
     # Upload image if present
-    image_asset_urn = None
-    if image_base64:
-        print("\n🖼️ Image detected, uploading to LinkedIn...")
-        image_asset_urn = upload_image_to_linkedin(image_base64, access_token)
-        if not image_asset_urn:
-            print("⚠️ Image upload failed, will post without image")
+    image_asset_urn = published.get("image_asset_urn") if published else None
+    if image_base64 and not published:
+        image_asset_urn = upload_image(store, image_base64, image_digest, access_token, author_urn, resume)
     
     # Publish post
-    print("\n📝 Publishing post...")
-    print(f"Title: {title}")
-    print(f"Content length: {len(content)} chars")
-    
-    success = create_linkedin_post(
-        text=content,
-        image_asset_urn=image_asset_urn,
-        access_token=access_token
-    )
+    if published:
+        print("\n♻️ Post was already published by a previous run, not publishing again")
+        # Records from before post ids were kept have none
+        post_id = published.get("post_id") or UNKNOWN_POST_ID
+        published_at = published.get("published_at")
+    else:
+        print("\n📝 Publishing post...")
+        print(f"Title: {title}")
+        print(f"Content length: {len(content)} chars")
+        
+        post_id = create_linkedin_post(
+            text=content,
+            image_asset_urn=image_asset_urn,
+            access_token=access_token,
+            author_urn=author_urn
+        )
+        published_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        if post_id:
+            store.save("publish.post", post_inputs, {
+                "image_asset_urn": image_asset_urn,
+                "post_id": post_id,
+                "published_at": published_at
+            })
     
-    if success:
+    if post_id:
         # Update Google Sheets with the new theme
         print("\n📊 Updating Google Sheets...")
-        sheets_success = add_theme(title)
+        theme_inputs = {"post": post_inputs, "title": title}
+        if resume and store.get("publish.add_theme", theme_inputs):
+            print("♻️ Theme was already added by a previous run")
+            sheets_success = True
+        else:
+            sheets_success = add_theme(title, sheet_name=sheet_name, post_id=post_id, published_at=published_at)
+            if sheets_success:
+                store.save("publish.add_theme", theme_inputs, True)
         
         if sheets_success:
             print("✅ Google Sheets updated successfully")
@@ -267,6 +403,8 @@ def main():
         result = {
             "success": True,
             "published": True,
+            "post_id": post_id,
+            "published_at": published_at,
             "has_image": image_asset_urn is not None,
             "sheets_updated": sheets_success
         }
@@ -287,7 +425,7 @@ def main():
         sys.exit(1)
     
     # Save result
-    with open("publish_result.json", "w", encoding="utf-8") as f:
+    with open(profile_file("publish_result.json", profile_id), "w", encoding="utf-8") as f:
         json.dump(result, f, indent=2)
 
 
@@ -0,0 +1,292 @@
+"""
+Hedged LLM Invocation
+
+Latency-budget-aware wrapper around one or more chat models. A request goes
+to the primary model first; if it has not answered by the hedge deadline (a
+percentile of recently observed latencies), a hedged request is fired to the
+next model in the fallback cascade (or the same model when there is none).
+The first valid response wins and the other requests are cancelled: queued
+ones are never sent (their rate-limit token is refunded) and in-flight calls
+to models with a native ``ainvoke`` are torn down. Failed attempts fail over
+to the next model immediately, and the whole call is bounded by a total
+latency budget. Time spent waiting on the rate limiter counts towards neither
+the hedge deadline nor the budget, and is not recorded as model latency.
+
+Configuration (environment variables):
+    LLM_FALLBACK_MODELS    Comma-separated fallback models (default "gemini-2.5-flash")
+    LLM_HEDGE_PERCENTILE   Latency percentile used as hedge deadline (default 90)
+    LLM_HEDGE_AFTER_S      Hedge deadline until enough latencies are known (default 20)
+    LLM_LATENCY_BUDGET_S   Total time allowed per call (default 120)
+"""
+
+import os
+import json
+import math
+import time
+import queue
+import asyncio
+import inspect
+import tempfile
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import CancelledError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from instrumentation import current_span
+from rate_limiter import acquire
+
+
+FALLBACK_MODELS = [m.strip() for m in os.environ.get("LLM_FALLBACK_MODELS", "gemini-2.5-flash").split(",") if m.strip()]
+HEDGE_PERCENTILE = float(os.environ.get("LLM_HEDGE_PERCENTILE", "90"))
+DEFAULT_HEDGE_AFTER_S = float(os.environ.get("LLM_HEDGE_AFTER_S", "20"))
+LATENCY_BUDGET_S = float(os.environ.get("LLM_LATENCY_BUDGET_S", "120"))
+
+# Samples needed before the percentile replaces DEFAULT_HEDGE_AFTER_S
+MIN_LATENCY_SAMPLES = 5
+# Rate limiter quota shared by all model requests
+RATE_LIMIT_API = "gemini"
+# Lower bound for the hedge deadline, so fast models are not hedged on noise
+MIN_HEDGE_AFTER_S = 1.0
+LATENCY_HISTORY_SIZE = 100
+# Event posted once a request has cleared the rate limiter and is being sent
+_SENT = object()
+
+
+class LatencyTracker:
+    """
+    Recent successful-call latencies per model, optionally persisted to a
+    JSON file so the percentile survives short-lived runs.
+
+    Args:
+        path: JSON file for the history (None keeps it in memory only)
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for model, values in json.load(f).items():
+                        self._samples[model] = deque(values, maxlen=LATENCY_HISTORY_SIZE)
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"⚠️ Warning: Could not read LLM latency history: {e}")
+
+    def record(self, model: str, seconds: float) -> None:
+        """Add a latency sample and persist the history."""
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=LATENCY_HISTORY_SIZE)).append(round(seconds, 3))
+            if self.path:
+                # Written under the lock and swapped in atomically, so concurrent
+                # profiles never interleave writes or let an older snapshot win
+                self._save({name: list(values) for name, values in self._samples.items()})
+
+    def _save(self, snapshot: Dict[str, List[float]]) -> None:
+        directory = os.path.dirname(self.path) or "."
+        tmp_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            print(f"⚠️ Warning: Could not save LLM latency history: {e}")
+
+    def percentile(self, model: str, percentile: float) -> Optional[float]:
+        """
+        Nearest-rank latency percentile for a model.
+
+        Returns:
+            Latency in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            values = sorted(self._samples.get(model, ()))
+        if len(values) < MIN_LATENCY_SAMPLES:
+            return None
+        index = max(0, math.ceil(percentile / 100.0 * len(values)) - 1)
+        return values[index]
+
+
+class _Attempt:
+    """
+    One request of a hedged call, cancellable from the calling thread.
+
+    Args:
+        name: Model name
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        # Stamped once the rate limiter lets the request through
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancel = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def call(self, model: Any, messages: List[Any]) -> Any:
+        """Invoke the model; natively async models can be cancelled mid-request."""
+        if self.cancel.is_set():
+            raise CancelledError()
+        if not inspect.iscoroutinefunction(getattr(model, "ainvoke", None)):
+            return model.invoke(messages)
+
+        async def run():
+            # Publish the task before checking the flag, so abort() sees one or the other
+            self._loop, self._task = asyncio.get_running_loop(), asyncio.current_task()
+            if self.cancel.is_set():
+                raise CancelledError()
+            return await model.ainvoke(messages)
+
+        return asyncio.run(run())
+
+    def abort(self) -> None:
+        """Cancel the request: it is not sent if still queued, and an async call is torn down."""
+        self.cancel.set()
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # Loop already closed: the call has finished
+
+
+class HedgedInvoker:
+    """
+    Invoke a cascade of chat models with hedging and a latency budget.
+
+    Args:
+        models: (name, chat model) pairs; the first is the primary
+        tracker: Latency history used for the hedge deadline
+        hedge_percentile: Percentile of primary latency to wait before hedging
+        latency_budget_s: Total time allowed for one call
+        max_attempts: Maximum requests per call (defaults to one more than the cascade)
+    """
+
+    def __init__(self, models: List[Tuple[str, Any]], tracker: Optional[LatencyTracker] = None,
+                 hedge_percentile: float = HEDGE_PERCENTILE, latency_budget_s: float = LATENCY_BUDGET_S,
+                 max_attempts: Optional[int] = None):
+        if not models:
+            raise ValueError("HedgedInvoker needs at least one model")
+        self.models = models
+        self.tracker = tracker or LatencyTracker()
+        self.hedge_percentile = hedge_percentile
+        self.latency_budget_s = latency_budget_s
+        self.max_attempts = max_attempts or len(models) + 1
+
+    @property
+    def primary_name(self) -> str:
+        return self.models[0][0]
+
+    def hedge_after(self) -> float:
+        """Seconds to wait for the primary before firing a hedged request."""
+        observed = self.tracker.percentile(self.primary_name, self.hedge_percentile)
+        if observed is None:
+            return DEFAULT_HEDGE_AFTER_S
+        return max(MIN_HEDGE_AFTER_S, observed)
+
+    def _launch(self, attempt: int, messages: List[Any], events: "queue.Queue") -> _Attempt:
+        name, model = self.models[min(attempt, len(self.models) - 1)]
+        request = _Attempt(name)
+
+        def run():
+            try:
+                acquire(RATE_LIMIT_API, cancel=request.cancel)
+                request.started = time.perf_counter()
+                events.put((request, _SENT, None))
+                result = request.call(model, messages)
+                request.finished = time.perf_counter()
+                events.put((request, result, None))
+            except BaseException as e:
+                events.put((request, None, e))
+
+        # Run in a copy of the caller's context so the rate limiter wait lands on
+        # the caller's span. Daemon threads: a request that cannot be cancelled
+        # must not keep the process alive
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(run,), name=f"llm-{name}-{attempt}", daemon=True).start()
+        return request
+
+    def invoke(self, messages: List[Any], validate: Optional[Callable[[Any], bool]] = None) -> Tuple[Any, str]:
+        """
+        Send the messages and return the first valid response.
+
+        Args:
+            messages: Chat messages
+            validate: Predicate on the response; invalid responses count as failures
+
+        Returns:
+            Tuple of (response, name of the model that answered)
+
+        Raises:
+            TimeoutError: If no valid response arrived within the latency budget
+            RuntimeError: If every attempt failed
+        """
+        hedge_delay = self.hedge_after()
+        # The budget and the hedge deadline start when a request is actually
+        # sent, not while it waits on the rate limiter
+        deadline: Optional[float] = None
+        next_hedge: Optional[float] = None
+
+        events: "queue.Queue" = queue.Queue()
+        latest = self._launch(0, messages, events)
+        pending = {latest}
+        attempts = 1
+        errors: List[str] = []
+
+        try:
+            while pending:
+                now = time.perf_counter()
+                if deadline is not None and now >= deadline:
+                    break
+                wake = [t for t in (deadline, next_hedge if attempts < self.max_attempts else None) if t is not None]
+                try:
+                    request, response, error = events.get(timeout=max(0.0, min(wake) - now) if wake else None)
+                except queue.Empty:
+                    request = None
+
+                if request is not None and response is _SENT:
+                    if deadline is None:
+                        deadline = request.started + self.latency_budget_s
+                    if request is latest:
+                        next_hedge = request.started + hedge_delay
+                    continue
+
+                if request is not None:
+                    pending.discard(request)
+                    if error is None and (validate is None or validate(response)):
+                        self.tracker.record(request.name, request.finished - request.started)
+                        span = current_span()
+                        span.add_retry(attempts - 1)
+                        span.set(model=request.name, attempts=attempts, hedged=attempts > 1)
+                        if attempts > 1:
+                            print(f"🏁 {request.name} answered first after {attempts} attempts")
+                        return response, request.name
+                    reason = f"{type(error).__name__}: {error}" if error else "invalid response"
+                    errors.append(f"{request.name}: {reason}")
+                    print(f"⚠️ LLM attempt on {request.name} failed ({reason})")
+
+                now = time.perf_counter()
+                failed_over = not pending
+                if attempts < self.max_attempts and (failed_over or (next_hedge is not None and now >= next_hedge)):
+                    if not failed_over:
+                        print(f"⏱️ No answer after {now - latest.started:.1f}s, sending hedged request")
+                    latest = self._launch(attempts, messages, events)
+                    pending.add(latest)
+                    attempts += 1
+                    next_hedge = None
+        finally:
+            # Losers are cancelled rather than left running (and billed); their
+            # late results are never read, so their latencies are not recorded
+            for request in pending:
+                request.abort()
+
+        current_span().add_retry(attempts - 1)
+        if pending:
+            raise TimeoutError(f"No LLM response within {self.latency_budget_s:.0f}s budget ({attempts} attempts)")
+        raise RuntimeError(f"All {attempts} LLM attempts failed: {'; '.join(errors)}")
@@ -9,25 +9,46 @@ import json
 import sys
 import requests
 from typing import Optional
-from openai import OpenAI
+from instrumentation import instrumented_stage, span
+from artifact_store import ArtifactStore, resume_enabled
+from rate_limiter import acquire
+from profiles import profile_file, profile_selection, resolve_profile
 
 
-def generate_image(prompt: str) -> Optional[str]:
+def generate_image(prompt: str, resume: bool = False, output_path: str = "linkedin_image.png") -> Optional[str]:
     """
     Generate an image using OpenAI DALL-E 2.
     
     Args:
         prompt: Text description of the image to generate
+        resume: Reuse a stored image generated from the same prompt
+        output_path: Where to save the image
         
     Returns:
         Path to saved image file or None if generation failed
     """
+    store = ArtifactStore()
+    image_inputs = {"model": "dall-e-2", "size": "1024x1024", "prompt": prompt}
+    
+    if resume:
+        image_bytes = store.get_bytes("image.generate", image_inputs)
+        if image_bytes:
+            with open(output_path, "wb") as f:
+                f.write(image_bytes)
+            print(f"♻️ Reusing stored image for this prompt ({len(image_bytes)} bytes)")
+            print(f"💾 Image saved to {output_path}")
+            return output_path
+    
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         print("❌ Error: OPENAI_API_KEY not found in environment variables")
         return None
     
     try:
+        # Imported lazily: the OpenAI SDK is slow to load and only this
+        # code path needs it
+        from openai import OpenAI
+        
         print(f"🎨 Generating image with OpenAI DALL-E 2...")
         print(f"📝 Prompt: {prompt[:100]}...")
         
@@ -35,12 +56,15 @@ def generate_image(prompt: str) -> Optional[str]:
         client = OpenAI(api_key=api_key)
         
         # Generate image
-        response = client.images.generate(
-            model="dall-e-2",
-            prompt=prompt,
-            size="1024x1024",
-            n=1,
-        )
+        with span("openai.images.generate", model="dall-e-2") as s:
+            acquire("openai")
+            response = client.images.generate(
+                model="dall-e-2",
+                prompt=prompt,
+                size="1024x1024",
+                n=1,
+            )
+            s.record_payload(sent=prompt)
         
         # Extract image URL
         image_url = response.data[0].url
@@ -51,13 +75,17 @@ def generate_image(prompt: str) -> Optional[str]:
             
         # Download and save image
         print(f"⬇️ Downloading image from {image_url[:50]}...")
-        img_response = requests.get(image_url)
-        
-        output_path = "linkedin_image.png"
+        with span("openai.image.download") as s:
+            img_response = requests.get(image_url)
+            s.record_http(img_response)
         
         if img_response.status_code == 200:
             with open(output_path, "wb") as f:
                 f.write(img_response.content)
+            try:
+                store.put_bytes("image.generate", image_inputs, img_response.content)
+            except OSError as e:
+                print(f"⚠️ Warning: Could not store image artifact: {e}")
             print(f"✅ Image generated and downloaded successfully!")
             print(f"💾 Image saved to {output_path}")
             return output_path
@@ -72,13 +100,31 @@ def generate_image(prompt: str) -> Optional[str]:
         return None
 
 
-def main():
+@instrumented_stage("generate_image")
+def main(resume: Optional[bool] = None, selection: Optional[str] = None):
     """
     Main execution function for image generation.
     Reads prompt from linkedin_post.json and generates image.
+    
+    Args:
+        resume: Reuse a stored image (defaults to --resume / LINKEDIN_RESUME)
+        selection: Profile id whose post to illustrate (defaults to --profile /
+                   LINKEDIN_PROFILE; files get a _<id> suffix)
     """
+    if resume is None:
+        resume = resume_enabled()
+    if selection is None:
+        selection = profile_selection()
+    try:
+        profile = resolve_profile(selection)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    profile_id = profile["id"] if profile else None
+    
     # Load prompt from previous step
-    input_file = "linkedin_post.json"
+    input_file = profile_file("linkedin_post.json", profile_id)
+    image_file = profile_file("linkedin_image.png", profile_id)
     
     if not os.path.exists(input_file):
         print(f"❌ Error: {input_file} not found. Run linkedin_agent.py first.")
@@ -90,11 +136,11 @@ def main():
     image_prompt = post_data.get("image_prompt", "")
     
     if not image_prompt:
-        print("❌ Error: No image_prompt found in linkedin_post.json")
+        print(f"❌ Error: No image_prompt found in {input_file}")
         sys.exit(1)
     
     # Generate image
-    image_path = generate_image(image_prompt)
+    image_path = generate_image(image_prompt, resume=resume, output_path=image_file)
     
     if image_path:
         # Update JSON with image info
@@ -104,7 +150,7 @@ def main():
         with open(input_file, "w", encoding="utf-8") as f:
             json.dump(post_data, f, indent=2, ensure_ascii=False)
         
-        print("✅ Updated linkedin_post.json with image data")
+        print(f"✅ Updated {input_file} with image data")
         
         # Save result
         output = {
@@ -122,7 +168,7 @@ def main():
         
         # Create empty placeholder file so Kestra workflow doesn't fail
         # Publisher will check if actual image data exists
-        placeholder_path = "linkedin_image.png"
+        placeholder_path = image_file
         with open(placeholder_path, "w") as f:
             f.write("")  # Empty file as placeholder
         print(f"📝 Created placeholder file: {placeholder_path}")
@@ -134,7 +180,7 @@ def main():
         }
     
     # Save result
-    with open("image_result.json", "w", encoding="utf-8") as f:
+    with open(profile_file("image_result.json", profile_id), "w", encoding="utf-8") as f:
         json.dump(output, f, indent=2)
     
     print("\n" + "="*50)
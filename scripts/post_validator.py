@@ -0,0 +1,215 @@
+"""
+LinkedIn Post Validator
+
+Fast local checks for generated posts: JSON shape, word count, emojis,
+markdown markers and title length. Mechanical violations (emojis, markdown,
+long titles, slightly long posts) are repaired locally; only semantic
+problems (unparseable output, posts that are too short) need another model
+call, for which build_repair_prompt() creates a short, targeted prompt.
+"""
+
+import re
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+MIN_WORDS = 250
+MAX_WORDS = 300
+MAX_TITLE_CHARS = 150
+
+# Emoji and pictograph ranges, plus the joiners/selectors used to build sequences
+EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001F000-\U0001FAFF"  # Mahjong, cards, emoticons, symbols & pictographs, transport, ...
+    "\U0001F1E6-\U0001F1FF"  # Regional indicators (flags)
+    "\u2600-\u27BF"          # Miscellaneous symbols, dingbats
+    "\u2B00-\u2BFF"          # Arrows, stars (e.g. U+2B50)
+    "\u2300-\u23FF"          # Miscellaneous technical (e.g. U+23F0)
+    "\uFE0F\u200D\u20E3"     # Variation selector, zero-width joiner, keycap
+    "]+"
+)
+BOLD_PATTERN = re.compile(r"\*\*|__")
+HEADING_PATTERN = re.compile(r"^\s{0,3}#{1,6}\s+", re.MULTILINE)
+INLINE_MARKDOWN_PATTERN = re.compile(r"`+|~~")
+SENTENCE_PATTERN = re.compile(r"[^.!?]+(?:[.!?]+[\"')\]]*|$)\s*")
+JSON_OBJECT_PATTERN = re.compile(r'\{[\s\S]*"title"[\s\S]*"content"[\s\S]*\}')
+
+# Issue codes that repair_post() fixes without a model call
+MECHANICAL_ISSUES = {"emoji", "markdown", "title_too_long", "title_missing", "too_long"}
+
+
+def word_count(text: str) -> int:
+    """Count whitespace-separated words."""
+    return len(text.split())
+
+
+def parse_post_json(text: str) -> Optional[Dict[str, str]]:
+    """
+    Extract a {"title", "content"} object from a model response.
+
+    Args:
+        text: Raw response text (may wrap the JSON in prose or code fences)
+
+    Returns:
+        Dictionary with string title and content, or None if none was found
+    """
+    candidates = [text.strip()]
+    match = JSON_OBJECT_PATTERN.search(text)
+    if match:
+        candidates.append(match.group(0))
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def _issue(code: str, message: str) -> Dict[str, Any]:
+    return {"code": code, "message": message, "mechanical": code in MECHANICAL_ISSUES}
+
+
+def validate_post(post: Any) -> List[Dict[str, Any]]:
+    """
+    Check a post against the content guidelines.
+
+    Args:
+        post: Parsed post (expected: dict with "title" and "content" strings)
+
+    Returns:
+        List of issues, each {"code", "message", "mechanical"}; empty if valid
+    """
+    if not isinstance(post, dict) or not isinstance(post.get("content"), str) or not post["content"].strip():
+        return [_issue("shape", "Response is not a JSON object with non-empty 'title' and 'content' strings")]
+
+    issues = []
+    title = post.get("title")
+    content = post["content"]
+
+    if not isinstance(title, str) or not title.strip():
+        issues.append(_issue("title_missing", "Title is missing"))
+    elif len(title) > MAX_TITLE_CHARS:
+        issues.append(_issue("title_too_long", f"Title has {len(title)} characters (max {MAX_TITLE_CHARS})"))
+
+    combined = f"{title if isinstance(title, str) else ''}\n{content}"
+    if EMOJI_PATTERN.search(combined):
+        issues.append(_issue("emoji", "Post contains emojis"))
+    if BOLD_PATTERN.search(combined) or HEADING_PATTERN.search(combined) or INLINE_MARKDOWN_PATTERN.search(combined):
+        issues.append(_issue("markdown", "Post contains markdown formatting"))
+
+    words = word_count(content)
+    if words > MAX_WORDS:
+        issues.append(_issue("too_long", f"Post has {words} words (max {MAX_WORDS})"))
+    elif words < MIN_WORDS:
+        issues.append(_issue("too_short", f"Post has {words} words (min {MIN_WORDS})"))
+
+    return issues
+
+
+def _strip_formatting(text: str) -> str:
+    text = EMOJI_PATTERN.sub("", text)
+    text = BOLD_PATTERN.sub("", text)
+    text = HEADING_PATTERN.sub("", text)
+    text = INLINE_MARKDOWN_PATTERN.sub("", text)
+    # Tidy spaces left behind, keeping paragraph breaks
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r" *\n *", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def _shorten_title(title: str) -> str:
+    cut = title[:MAX_TITLE_CHARS].rstrip()
+    if " " in cut and len(title) > MAX_TITLE_CHARS:
+        cut = cut[:cut.rfind(" ")].rstrip(" ,;:-")
+    return cut
+
+
+def _trim_to_max_words(content: str) -> str:
+    """
+    Drop whole sentences before the last paragraph (which holds the call to
+    action) until the post fits MAX_WORDS. Returns the content unchanged if
+    that is not possible.
+    """
+    paragraphs = content.split("\n\n")
+    closing = paragraphs[-1] if len(paragraphs) > 1 else ""
+    body = "\n\n".join(paragraphs[:-1]) if closing else content
+    budget = MAX_WORDS - word_count(closing)
+
+    kept = []
+    used = 0
+    for paragraph in body.split("\n\n"):
+        sentences = []
+        for sentence in SENTENCE_PATTERN.findall(paragraph):
+            words = word_count(sentence)
+            if used + words > budget:
+                break
+            sentences.append(sentence.strip())
+            used += words
+        if sentences:
+            kept.append(" ".join(sentences))
+        if used >= budget or len(sentences) < len(SENTENCE_PATTERN.findall(paragraph)):
+            break
+
+    trimmed = "\n\n".join(kept + ([closing] if closing else []))
+    return trimmed if MIN_WORDS <= word_count(trimmed) <= MAX_WORDS else content
+
+
+def repair_post(post: Any) -> Tuple[Any, List[Dict[str, Any]]]:
+    """
+    Apply local repairs for mechanical violations and re-validate.
+
+    Args:
+        post: Parsed post
+
+    Returns:
+        Tuple of (repaired post, remaining issues)
+    """
+    issues = validate_post(post)
+    if not issues or not any(issue["mechanical"] for issue in issues):
+        return post, issues
+
+    repaired = dict(post)
+    repaired["content"] = _strip_formatting(post["content"])
+    title = post.get("title") if isinstance(post.get("title"), str) else ""
+    title = _strip_formatting(title).replace("\n", " ")
+    if not title:
+        # Use the opening hook as the title
+        first_sentence = SENTENCE_PATTERN.findall(repaired["content"])[:1]
+        title = first_sentence[0].strip() if first_sentence else ""
+    repaired["title"] = _shorten_title(title)
+
+    if word_count(repaired["content"]) > MAX_WORDS:
+        repaired["content"] = _trim_to_max_words(repaired["content"])
+
+    return repaired, validate_post(repaired)
+
+
+def build_repair_prompt(post: Any, issues: List[Dict[str, Any]], raw_text: str = "") -> str:
+    """
+    Build a short prompt asking the model to fix only the remaining issues.
+
+    Args:
+        post: Best parsed version of the post (may be None)
+        issues: Remaining issues from repair_post()
+        raw_text: Raw model response, used when the post could not be parsed
+
+    Returns:
+        Prompt text
+    """
+    problems = "\n".join(f"- {issue['message']}" for issue in issues)
+    if isinstance(post, dict) and isinstance(post.get("content"), str) and post["content"].strip():
+        draft = json.dumps({"title": post.get("title", ""), "content": post["content"]}, ensure_ascii=False)
+    else:
+        draft = raw_text
+    return f"""Fix this LinkedIn post draft. Problems:
+{problems}
+
+Keep the topic, hook, tone and call to action. The content must be {MIN_WORDS}-{MAX_WORDS} words, in English, with no emojis and no markdown (no **, #, or backticks).
+
+Draft:
+{draft}
+
+Return ONLY valid JSON with 'title' and 'content' keys."""
@@ -0,0 +1,207 @@
+"""
+LinkedIn Profile Configuration
+
+A profile describes one LinkedIn account the pipeline writes for: persona,
+contact details, topic area and tools to mention, ranking keywords, search
+queries, the Sheets tab holding its used themes and the LinkedIn author URN to
+publish as.
+
+Profiles are read from a JSON file (LINKEDIN_PROFILES_FILE, default
+profiles.json) holding a list of profiles or {"profiles": [...]}. Without the
+file, the built-in default profile is used.
+"""
+
+import os
+import sys
+import json
+from typing import Any, Dict, List, Optional
+
+
+PROFILES_FILE = os.environ.get("LINKEDIN_PROFILES_FILE", "profiles.json")
+
+DEFAULT_PROFILE: Dict[str, Any] = {
+    "id": "guilherme",
+    "name": "Guilherme",
+    "persona": (
+        "Guilherme is an n8n developer, specialist in Low-Code, No-Code, and Artificial Intelligence. "
+        "He works with automations, AI agent creation, chatbots, and process optimization. "
+        "Tools: n8n, Make, Zapier, Bubble.io, Framer, ManyChat, Typebot, Supabase, Flowise, and various AI APIs."
+    ),
+    "contact": "WhatsApp 21977709013 | Email: guifaceads@gmail.com",
+    "keywords": [
+        "AI", "automation", "AI agents", "chatbots", "low-code", "no-code", "process optimization",
+        "n8n", "Make", "Zapier", "Bubble.io", "Framer", "ManyChat", "Typebot", "Supabase", "Flowise"
+    ],
+    "queries": ["latest AI automation low-code no-code news 2026"],
+    # Topic area the strategist picks from, and tools worth mentioning in posts
+    "topics": "AI/Automation/Low-Code",
+    "tools": "n8n, Make, or AI agents",
+    "sheet_name": "Sheet1",
+    # None publishes as linkedin_publisher.PERSON_URN
+    "person_urn": None
+}
+
+REQUIRED_FIELDS = ("id", "name", "persona")
+
+SYSTEM_PROMPT_TEMPLATE = """You are an AI Content Strategist for {name}'s LinkedIn profile.
+
+{persona}
+
+Contact: {contact}
+
+YOUR TASK:
+1. Analyze the search results for {topics} topics
+2. Choose ONE compelling and recent topic that is NOT in the used themes list
+3. Create an engaging LinkedIn post following these guidelines:
+
+CONTENT GUIDELINES:
+- Create a strong hook at the beginning (evoke pain, curiosity, or personal dilemma)
+- Use engaging narrative that leads to reflection
+- Include a call to action at the end
+- Avoid corporate language; use human, informal, direct tone
+- 250-300 words max
+- Mention tools like {tools} if relevant
+- Write in English
+- NO ** formatting
+- NO emojis
+
+OUTPUT FORMAT (JSON):
+{{
+  "title": "Hook-based title without **",
+  "content": "Full post (250-300 words, English, no emojis, no **)"
+}}"""
+
+
+def load_profiles(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Load profile configs, filling unspecified fields from the default profile.
+
+    Args:
+        path: Profiles JSON file (defaults to LINKEDIN_PROFILES_FILE)
+
+    Returns:
+        List of profiles (just the default profile if the file does not exist)
+
+    Raises:
+        ValueError: If the file is malformed or a profile is incomplete
+    """
+    path = path or PROFILES_FILE
+    if not os.path.exists(path):
+        return [dict(DEFAULT_PROFILE)]
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data.get("profiles") if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path} must contain a non-empty list of profiles")
+
+    profiles = []
+    seen = set()
+    for entry in entries:
+        missing = [field for field in REQUIRED_FIELDS if not (isinstance(entry, dict) and entry.get(field))]
+        if missing:
+            raise ValueError(f"Profile in {path} is missing {', '.join(missing)}")
+        if entry["id"] in seen:
+            raise ValueError(f"Duplicate profile id in {path}: {entry['id']}")
+        seen.add(entry["id"])
+        # Each profile tracks its themes in its own tab unless configured otherwise
+        profiles.append({**DEFAULT_PROFILE, "contact": "", "person_urn": None, "sheet_name": entry["id"], **entry})
+    return profiles
+
+
+def select_profiles(profiles: List[Dict[str, Any]], selection: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Pick profiles by a selection string.
+
+    Args:
+        profiles: All profiles
+        selection: "all", or comma-separated profile ids
+
+    Returns:
+        Selected profiles, in config order
+
+    Raises:
+        ValueError: If a requested profile id does not exist
+    """
+    if not selection or selection == "all":
+        return profiles
+    wanted = [item.strip() for item in selection.split(",") if item.strip()]
+    known = {profile["id"] for profile in profiles}
+    unknown = [item for item in wanted if item not in known]
+    if unknown:
+        raise ValueError(f"Unknown profile(s): {', '.join(unknown)}")
+    return [profile for profile in profiles if profile["id"] in wanted]
+
+
+def profile_selection() -> Optional[str]:
+    """
+    Read the requested profiles from ``--profile <ids|all>`` or LINKEDIN_PROFILE.
+
+    Returns:
+        Selection string, or None for the classic single-profile run
+    """
+    args = sys.argv[1:]
+    for i, arg in enumerate(args):
+        if arg.startswith("--profile="):
+            return arg.split("=", 1)[1]
+        if arg == "--profile" and i + 1 < len(args):
+            return args[i + 1]
+    return os.environ.get("LINKEDIN_PROFILE") or None
+
+
+def profile_file(filename: str, profile_id: Optional[str]) -> str:
+    """
+    Per-profile variant of an output file name.
+
+    Args:
+        filename: Base name, e.g. "linkedin_post.json"
+        profile_id: Profile id (None keeps the base name)
+
+    Returns:
+        File name such as "linkedin_post_<id>.json"
+    """
+    if not profile_id:
+        return filename
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}_{profile_id}{ext}"
+
+
+def build_system_prompt(profile: Dict[str, Any]) -> str:
+    """
+    Render the content strategist system prompt for a profile.
+
+    Args:
+        profile: Profile config
+
+    Returns:
+        System prompt text
+    """
+    return SYSTEM_PROMPT_TEMPLATE.format(
+        name=profile["name"],
+        persona=profile["persona"],
+        contact=profile.get("contact", ""),
+        topics=profile.get("topics") or DEFAULT_PROFILE["topics"],
+        tools=profile.get("tools") or DEFAULT_PROFILE["tools"]
+    )
+
+
+def resolve_profile(selection: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Resolve the profile for a stage that handles one profile per run
+    (image generation, publishing).
+
+    Args:
+        selection: A single profile id, or None for the classic run
+
+    Returns:
+        Profile config, or None for the classic run
+
+    Raises:
+        ValueError: If the selection does not name exactly one profile
+    """
+    if not selection:
+        return None
+    profiles = select_profiles(load_profiles(), selection)
+    if len(profiles) != 1:
+        raise ValueError(f"Select exactly one profile for this stage (got {len(profiles)}); run it once per profile")
+    return profiles[0]
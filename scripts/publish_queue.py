@@ -0,0 +1,609 @@
+"""
+Scheduled Publish Queue
+
+Decouples generation from publishing. Posts are generated ahead of time and
+enqueued, together with their image, for a time slot in a durable SQLite
+queue. A dispatcher keeps the pending posts in a heap ordered by scheduled
+time. While it waits for the earliest slot it uploads the images of posts
+due soon, then publishes each post at its slot with a single
+create_linkedin_post call, so neither generation nor uploads delay a post.
+Images are uploaded by the dispatcher (again before every retry) rather than
+at enqueue time, since an asset registered days before the post may no
+longer be accepted.
+
+Slots are PUBLISH_SLOTS (default "09:00,16:00", the times of the scheduled
+workflow) on PUBLISH_WEEKDAYS (default MON-FRI) in PUBLISH_TIMEZONE (default
+America/Sao_Paulo). Each profile gets the next free slot of its own. The queue
+lives at PUBLISH_QUEUE_DB (default: publish_queue.sqlite3 in the artifact
+directory); it must be on storage that persists between runs.
+
+Usage:
+    python scripts/publish_queue.py enqueue [--profile ID] [--at 2026-10-20T09:00]
+    python scripts/publish_queue.py dispatch [--horizon SECONDS] [--max-posts N]
+    python scripts/publish_queue.py list
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sheets_manager import SHEET_NAME, add_theme
+from instrumentation import instrumented_stage, span
+from artifact_store import ARTIFACT_DIR
+from linkedin_publisher import (
+    PERSON_URN, create_linkedin_post, get_linkedin_access_token, load_image, load_post, upload_image_to_linkedin
+)
+from profiles import profile_file, profile_selection, resolve_profile
+
+
+PUBLISH_QUEUE_DB = os.environ.get("PUBLISH_QUEUE_DB", os.path.join(ARTIFACT_DIR, "publish_queue.sqlite3"))
+
+PUBLISH_SLOTS = os.environ.get("PUBLISH_SLOTS", "09:00,16:00")
+PUBLISH_WEEKDAYS = os.environ.get("PUBLISH_WEEKDAYS", "MON-FRI")
+PUBLISH_TIMEZONE = os.environ.get("PUBLISH_TIMEZONE", "America/Sao_Paulo")
+
+# Publish attempts per post, and the delay before retrying a failed one
+PUBLISH_MAX_ATTEMPTS = int(os.environ.get("PUBLISH_MAX_ATTEMPTS", "3"))
+PUBLISH_RETRY_DELAY_S = float(os.environ.get("PUBLISH_RETRY_DELAY_S", "60"))
+
+# How often a waiting dispatcher checks the queue for newly enqueued posts
+DISPATCH_POLL_S = 30.0
+
+# A dispatcher without a horizon uploads images of posts due within this many seconds
+PUBLISH_UPLOAD_LEAD_S = float(os.environ.get("PUBLISH_UPLOAD_LEAD_S", "600"))
+
+WEEKDAYS = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
+
+# A post is claimed ("publishing") before the LinkedIn call; a claim left behind
+# by a crash during the call is never retried automatically, since the post may
+# be live already. Errors before the call put the post back to "pending".
+PENDING, PUBLISHING, PUBLISHED, FAILED = "pending", "publishing", "published", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scheduled_at REAL NOT NULL,
+    profile TEXT,
+    author_urn TEXT NOT NULL,
+    sheet_name TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    image_base64 TEXT,
+    image_asset_urn TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    post_id TEXT,
+    published_at TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS posts_status_scheduled ON posts (status, scheduled_at);
+"""
+
+
+def _timezone(name: str):
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception as e:
+        print(f"⚠️ Warning: Unknown time zone {name!r} ({e}), using UTC")
+        return timezone.utc
+
+
+def parse_slots(value: str) -> List[Tuple[int, int]]:
+    """
+    Parse "HH:MM,HH:MM" into sorted (hour, minute) pairs.
+
+    Args:
+        value: Comma-separated times of day
+
+    Returns:
+        List of (hour, minute)
+    """
+    slots = []
+    for item in value.split(","):
+        if item.strip():
+            hour, _, minute = item.strip().partition(":")
+            slots.append((int(hour), int(minute or 0)))
+    return sorted(slots)
+
+
+def parse_weekdays(value: str) -> List[int]:
+    """
+    Parse "MON-FRI" or "MON,WED,FRI" into weekday numbers (Monday = 0).
+
+    Args:
+        value: Day names or ranges, comma-separated
+
+    Returns:
+        Sorted weekday numbers
+    """
+    days = set()
+    for item in value.upper().split(","):
+        first, _, last = item.strip().partition("-")
+        if not first:
+            continue
+        start = WEEKDAYS.index(first)
+        end = WEEKDAYS.index(last) if last else start
+        days.update(range(start, end + 1))
+    return sorted(days)
+
+
+def next_slot(after: float, taken: Any = (), slots: Optional[str] = None,
+              weekdays: Optional[str] = None, tz_name: Optional[str] = None) -> float:
+    """
+    Find the first publishing slot later than ``after`` that is not taken.
+
+    Args:
+        after: Unix timestamp the slot must follow
+        taken: Timestamps of slots already used
+        slots: Times of day (defaults to PUBLISH_SLOTS)
+        weekdays: Publishing days (defaults to PUBLISH_WEEKDAYS)
+        tz_name: Time zone of the slots (defaults to PUBLISH_TIMEZONE)
+
+    Returns:
+        Unix timestamp of the slot
+    """
+    times = parse_slots(slots or PUBLISH_SLOTS)
+    days = parse_weekdays(weekdays or PUBLISH_WEEKDAYS)
+    if not times or not days:
+        raise ValueError("No publishing slots configured")
+    tz = _timezone(tz_name or PUBLISH_TIMEZONE)
+    taken = set(taken)
+    day = datetime.fromtimestamp(after, tz).date()
+    # Plenty of room even when every slot of the coming weeks is taken
+    for _ in range(366 * 5):
+        if day.weekday() in days:
+            for hour, minute in times:
+                slot = datetime(day.year, day.month, day.day, hour, minute, tzinfo=tz).timestamp()
+                if slot > after and slot not in taken:
+                    return slot
+        day += timedelta(days=1)
+    raise ValueError("No free publishing slot found")
+
+
+def parse_time(value: str, tz_name: Optional[str] = None) -> float:
+    """
+    Parse an ISO 8601 time; times without an offset are in PUBLISH_TIMEZONE.
+
+    Args:
+        value: e.g. "2026-10-20T09:00" or "2026-10-20T12:00:00+00:00"
+        tz_name: Time zone for naive times (defaults to PUBLISH_TIMEZONE)
+
+    Returns:
+        Unix timestamp
+    """
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=_timezone(tz_name or PUBLISH_TIMEZONE))
+    return moment.timestamp()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def enqueue(title: str, content: str, author_urn: str = PERSON_URN, sheet_name: str = SHEET_NAME,
+            image_base64: Optional[str] = None, profile_id: Optional[str] = None,
+            scheduled_at: Optional[float] = None, path: Optional[str] = None,
+            now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Add a ready-to-publish post to the queue.
+
+    Enqueuing the same content for the same author again returns the existing
+    entry, even once it is published, so a retried generation run (which may
+    reuse a stored post on resume) never schedules a duplicate.
+
+    Args:
+        title: Post title (recorded in Google Sheets after publishing)
+        content: Post text
+        author_urn: LinkedIn member or organization to post as
+        sheet_name: Sheets tab that records the theme
+        image_base64: Base64-encoded image, uploaded when the post is published
+                      (None for a text-only post)
+        profile_id: Profile the post belongs to
+        scheduled_at: Unix timestamp to publish at (defaults to the author's next free slot)
+        path: Queue database (defaults to PUBLISH_QUEUE_DB)
+        now: Current time (defaults to time.time())
+
+    Returns:
+        The queue entry
+    """
+    now = time.time() if now is None else now
+    conn = _connect(path or PUBLISH_QUEUE_DB)
+    try:
+        # BEGIN IMMEDIATE so concurrent enqueues cannot pick the same slot
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            existing = conn.execute(
+                "SELECT * FROM posts WHERE author_urn = ? AND content = ? AND status IN (?, ?, ?)",
+                (author_urn, content, PENDING, PUBLISHING, PUBLISHED)
+            ).fetchone()
+            if existing is None:
+                if scheduled_at is None:
+                    taken = [row[0] for row in conn.execute(
+                        "SELECT scheduled_at FROM posts WHERE author_urn = ? AND status != ?",
+                        (author_urn, FAILED)
+                    )]
+                    scheduled_at = next_slot(now, taken)
+                cursor = conn.execute(
+                    "INSERT INTO posts (scheduled_at, profile, author_urn, sheet_name, title, content, image_base64)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (scheduled_at, profile_id, author_urn, sheet_name, title, content, image_base64)
+                )
+                existing = conn.execute("SELECT * FROM posts WHERE id = ?", (cursor.lastrowid,)).fetchone()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return dict(existing)
+    finally:
+        conn.close()
+
+
+def list_posts(status: Optional[str] = None, path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    List queue entries in scheduled order.
+
+    Args:
+        status: Only entries with this status (default: all)
+        path: Queue database (defaults to PUBLISH_QUEUE_DB)
+
+    Returns:
+        List of queue entries
+    """
+    conn = _connect(path or PUBLISH_QUEUE_DB)
+    try:
+        if status:
+            rows = conn.execute("SELECT * FROM posts WHERE status = ? ORDER BY scheduled_at, id", (status,))
+        else:
+            rows = conn.execute("SELECT * FROM posts ORDER BY scheduled_at, id")
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+class PublishDispatcher:
+    """
+    Publishes queued posts at their scheduled time.
+
+    Pending entries are kept in a heap of (scheduled_at, id). The dispatcher
+    sleeps until the earliest one is due, re-reading the queue at least every
+    DISPATCH_POLL_S so posts enqueued meanwhile are picked up. Before sleeping
+    it uploads the images of posts due within the upload lead time. When a
+    post is due, it claims the entry in the database (several dispatchers can
+    share one queue) and publishes it.
+
+    Args:
+        path: Queue database (defaults to PUBLISH_QUEUE_DB)
+        access_token: LinkedIn OAuth2 access token (defaults to LINKEDIN_ACCESS_TOKEN)
+        clock: Returns the current Unix time
+        sleep: Sleeps for the given number of seconds
+    """
+
+    def __init__(self, path: Optional[str] = None, access_token: Optional[str] = None,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep):
+        self.path = path or PUBLISH_QUEUE_DB
+        self.access_token = access_token
+        self.clock = clock
+        self.sleep = sleep
+        self._conn = _connect(self.path)
+        self._heap: List[Tuple[float, int]] = []
+        self._queued: Dict[int, float] = {}
+        # (id, scheduled_at) of entries whose image upload was already tried
+        self._uploaded: set = set()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def refresh(self) -> None:
+        """Push pending entries that are new or were rescheduled onto the heap."""
+        for row in self._conn.execute("SELECT id, scheduled_at FROM posts WHERE status = ?", (PENDING,)):
+            if self._queued.get(row["id"]) != row["scheduled_at"]:
+                self._queued[row["id"]] = row["scheduled_at"]
+                heapq.heappush(self._heap, (row["scheduled_at"], row["id"]))
+
+    def prepare_uploads(self, until: float) -> int:
+        """
+        Upload the images of pending posts due by ``until``, ahead of their slot.
+
+        Each entry is tried once per scheduled time, so a retry (which gets a
+        new time) is uploaded again. A failed upload is retried at the slot.
+
+        Args:
+            until: Unix timestamp; posts due later are left alone
+
+        Returns:
+            Number of uploads attempted
+        """
+        due = self._conn.execute(
+            "SELECT id, scheduled_at FROM posts WHERE status = ? AND image_base64 IS NOT NULL"
+            " AND image_asset_urn IS NULL AND scheduled_at <= ? ORDER BY scheduled_at, id",
+            (PENDING, until)
+        ).fetchall()
+        attempted = 0
+        for row in due:
+            key = (row["id"], row["scheduled_at"])
+            if key in self._uploaded:
+                continue
+            self._uploaded.add(key)
+            entry = self._conn.execute(
+                "SELECT author_urn, image_base64 FROM posts WHERE id = ?", (row["id"],)
+            ).fetchone()
+            attempted += 1
+            print(f"\n🖼️ Uploading image of queued post {row['id']} ahead of its slot...")
+            image_asset_urn = upload_image_to_linkedin(
+                entry["image_base64"], self.access_token, owner_urn=entry["author_urn"]
+            )
+            if not image_asset_urn:
+                print("⚠️ Image upload failed, will retry at the slot")
+                continue
+            self._conn.execute(
+                "UPDATE posts SET image_asset_urn = ? WHERE id = ? AND status = ? AND scheduled_at = ?",
+                (image_asset_urn, row["id"], PENDING, row["scheduled_at"])
+            )
+        return attempted
+
+    def _claim(self, entry_id: int, scheduled_at: float) -> Optional[Dict[str, Any]]:
+        # Only an entry still pending for this slot is claimed; stale heap items are dropped
+        cursor = self._conn.execute(
+            "UPDATE posts SET status = ?, attempts = attempts + 1 WHERE id = ? AND status = ? AND scheduled_at = ?",
+            (PUBLISHING, entry_id, PENDING, scheduled_at)
+        )
+        if cursor.rowcount != 1:
+            return None
+        return dict(self._conn.execute("SELECT * FROM posts WHERE id = ?", (entry_id,)).fetchone())
+
+    def _release(self, entry: Dict[str, Any], error: BaseException) -> None:
+        # Nothing was sent, so the attempt does not count
+        self._conn.execute(
+            "UPDATE posts SET status = ?, attempts = attempts - 1, error = ? WHERE id = ? AND status = ?",
+            (PENDING, f"{type(error).__name__}: {error}", entry["id"], PUBLISHING)
+        )
+
+    def publish(self, entry: Dict[str, Any]) -> str:
+        """
+        Publish a claimed entry and record the outcome.
+
+        The image normally was uploaded by prepare_uploads() already; if not
+        (the dispatcher started after the slot, or the early upload failed),
+        it is uploaded now, and if that fails too the post goes out text-only,
+        as with linkedin_publisher.py. A failed attempt drops the asset, so a
+        retry never reuses an asset LinkedIn may have rejected.
+
+        Args:
+            entry: Queue entry in the "publishing" state
+
+        Returns:
+            New status of the entry: PUBLISHED, PENDING (retry scheduled) or FAILED
+        """
+        sent = False
+        try:
+            if self.access_token is None:
+                self.access_token = get_linkedin_access_token()
+
+            with span("publish_queue.publish", profile=entry["profile"]) as s:
+                s.set(lateness_ms=round((self.clock() - entry["scheduled_at"]) * 1000.0, 3))
+                image_asset_urn = entry["image_asset_urn"]
+                if entry["image_base64"] and not image_asset_urn:
+                    image_asset_urn = upload_image_to_linkedin(
+                        entry["image_base64"], self.access_token, owner_urn=entry["author_urn"]
+                    )
+                    if not image_asset_urn:
+                        print("⚠️ Image upload failed, will post without image")
+                sent = True
+                post_id = create_linkedin_post(
+                    text=entry["content"],
+                    image_asset_urn=image_asset_urn,
+                    access_token=self.access_token,
+                    author_urn=entry["author_urn"]
+                )
+        except BaseException as e:
+            if not sent:
+                self._release(entry, e)
+            raise
+        published_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.clock()))
+
+        if not post_id:
+            if entry["attempts"] < PUBLISH_MAX_ATTEMPTS:
+                retry_at = self.clock() + PUBLISH_RETRY_DELAY_S
+                print(f"⚠️ Publishing post {entry['id']} failed, retrying in {PUBLISH_RETRY_DELAY_S:.0f}s")
+                self._conn.execute(
+                    "UPDATE posts SET status = ?, scheduled_at = ?, image_asset_urn = NULL, error = ? WHERE id = ?",
+                    (PENDING, retry_at, "LinkedIn did not accept the post", entry["id"])
+                )
+                return PENDING
+            else:
+                print(f"❌ Publishing post {entry['id']} failed {entry['attempts']} times, giving up")
+                self._conn.execute(
+                    "UPDATE posts SET status = ?, image_asset_urn = NULL, error = ? WHERE id = ?",
+                    (FAILED, "LinkedIn did not accept the post", entry["id"])
+                )
+                return FAILED
+
+        # The image is no longer needed once the post is live
+        self._conn.execute(
+            "UPDATE posts SET status = ?, post_id = ?, published_at = ?, image_asset_urn = ?, image_base64 = NULL,"
+            " error = NULL WHERE id = ?",
+            (PUBLISHED, post_id, published_at, image_asset_urn, entry["id"])
+        )
+        # The post is live; recording its theme is off the critical path
+        if not add_theme(entry["title"], sheet_name=entry["sheet_name"], post_id=post_id, published_at=published_at):
+            print("⚠️ Warning: Failed to update Google Sheets, but post was published")
+        return PUBLISHED
+
+    def run(self, horizon_s: Optional[float] = None, max_posts: Optional[int] = None) -> Dict[str, int]:
+        """
+        Publish due posts as their slots arrive.
+
+        Args:
+            horizon_s: Stop once the queue is empty or the next post is due
+                       more than this many seconds from now (None: run forever).
+                       Images of posts due within the horizon are uploaded
+                       while waiting (PUBLISH_UPLOAD_LEAD_S without a horizon)
+            max_posts: Stop after this many publish attempts
+
+        Returns:
+            Dictionary with the number of posts published, attempts rescheduled
+            for a retry, and posts that failed for good
+        """
+        # Fail before claiming anything if there is no token
+        if self.access_token is None:
+            self.access_token = get_linkedin_access_token()
+
+        upload_lead_s = PUBLISH_UPLOAD_LEAD_S if horizon_s is None else horizon_s
+        summary = {"published": 0, "retried": 0, "failed": 0}
+        outcomes = {PUBLISHED: "published", PENDING: "retried", FAILED: "failed"}
+        stuck = list_posts(PUBLISHING, self.path)
+        if stuck:
+            print(f"⚠️ Warning: {len(stuck)} post(s) were interrupted while publishing; "
+                  "check LinkedIn before re-queuing them")
+
+        while max_posts is None or sum(summary.values()) < max_posts:
+            self.refresh()
+            now = self.clock()
+            if not self._heap:
+                if horizon_s is not None:
+                    break
+                self.sleep(DISPATCH_POLL_S)
+                continue
+
+            scheduled_at, entry_id = self._heap[0]
+            if scheduled_at > now:
+                if horizon_s is not None and scheduled_at - now > horizon_s:
+                    break
+                if self.prepare_uploads(now + upload_lead_s):
+                    continue  # Uploads took time; check what is due now
+                self.sleep(min(scheduled_at - now, DISPATCH_POLL_S))
+                continue
+
+            heapq.heappop(self._heap)
+            if self._queued.get(entry_id) == scheduled_at:
+                del self._queued[entry_id]
+            entry = self._claim(entry_id, scheduled_at)
+            if entry is None:
+                continue
+            print(f"\n📤 Publishing queued post {entry_id}: {entry['title']}")
+            summary[outcomes[self.publish(entry)]] += 1
+        return summary
+
+
+@instrumented_stage("enqueue")
+def enqueue_main(selection: Optional[str] = None, scheduled_at: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Queue the generated post (and its image) of a profile.
+
+    Args:
+        selection: Profile id (defaults to --profile / LINKEDIN_PROFILE)
+        scheduled_at: Unix timestamp to publish at (defaults to the next free slot)
+
+    Returns:
+        The queue entry
+    """
+    if selection is None:
+        selection = profile_selection()
+    try:
+        profile = resolve_profile(selection)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    profile_id = profile["id"] if profile else None
+    author_urn = (profile or {}).get("person_urn") or PERSON_URN
+    sheet_name = profile["sheet_name"] if profile else SHEET_NAME
+
+    input_file = profile_file("linkedin_post.json", profile_id)
+    if not os.path.exists(input_file):
+        print(f"❌ Error: {input_file} not found. Run linkedin_agent.py first.")
+        sys.exit(1)
+    title, content = load_post(input_file)
+    image_base64, _ = load_image(profile_file("linkedin_image.png", profile_id))
+
+    entry = enqueue(title, content, author_urn=author_urn, sheet_name=sheet_name,
+                    image_base64=image_base64, profile_id=profile_id, scheduled_at=scheduled_at)
+    slot = datetime.fromtimestamp(entry["scheduled_at"], _timezone(PUBLISH_TIMEZONE))
+    if entry["status"] == PUBLISHED:
+        print(f"\n♻️ Post was already published as {entry['post_id']}, not queuing it again")
+    else:
+        print(f"\n🗓️ Post {entry['id']} scheduled for {slot.isoformat()}")
+
+    with open(profile_file("enqueue_result.json", profile_id), "w", encoding="utf-8") as f:
+        json.dump({"id": entry["id"], "status": entry["status"], "scheduled_at": slot.isoformat(),
+                   "title": title, "has_image": image_base64 is not None}, f, indent=2)
+    return entry
+
+
+@instrumented_stage("dispatch")
+def dispatch_main(horizon_s: Optional[float] = None, max_posts: Optional[int] = None) -> Dict[str, int]:
+    """
+    Run the dispatcher and write dispatch_result.json.
+
+    Args:
+        horizon_s: See PublishDispatcher.run
+        max_posts: See PublishDispatcher.run
+
+    Exits with an error if a post failed for good; attempts that are retried
+    later do not count as failures.
+
+    Returns:
+        Dictionary with published, retried and failed counts
+    """
+    try:
+        access_token = get_linkedin_access_token()
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    dispatcher = PublishDispatcher(access_token=access_token)
+    try:
+        summary = dispatcher.run(horizon_s=horizon_s, max_posts=max_posts)
+    finally:
+        dispatcher.close()
+    print(f"\n✅ Dispatcher done: {summary['published']} published, {summary['retried']} retried, "
+          f"{summary['failed']} failed")
+    with open("dispatch_result.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    if summary["failed"]:
+        sys.exit(1)
+    return summary
+
+
+def _option(name: str) -> Optional[str]:
+    args = sys.argv[1:]
+    if name in args and args.index(name) + 1 < len(args):
+        return args[args.index(name) + 1]
+    return None
+
+
+def main():
+    """
+    Command line entry point: enqueue, dispatch or list.
+    """
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "enqueue":
+        at = _option("--at")
+        enqueue_main(scheduled_at=parse_time(at) if at else None)
+    elif command == "dispatch":
+        horizon = _option("--horizon")
+        max_posts = _option("--max-posts")
+        dispatch_main(horizon_s=float(horizon) if horizon else None,
+                      max_posts=int(max_posts) if max_posts else None)
+    elif command == "list":
+        tz = _timezone(PUBLISH_TIMEZONE)
+        for entry in list_posts():
+            slot = datetime.fromtimestamp(entry["scheduled_at"], tz).strftime("%Y-%m-%d %H:%M")
+            print(f"{entry['id']:>4}  {slot}  {entry['status']:<10}  {entry['profile'] or '-':<12}  {entry['title']}")
+    else:
+        print(f"❌ Unknown command: {command} (use enqueue, dispatch or list)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Shared Rate Limiter for External APIs
+
+Token buckets stored in a SQLite database, so overlapping runs (scheduled,
+manual, retries) in separate processes or containers on one host share one
+quota per API. Each acquire() reserves the next free slot in a single
+transaction and sleeps exactly until it, which keeps throughput at the quota
+instead of bursting into 429s and retrying.
+
+Quotas are "<requests per minute>/<burst>" and can be overridden per API with
+RATE_LIMIT_<API>, e.g. RATE_LIMIT_BRAVE=60/1. The database lives at
+RATE_LIMIT_DB (default: linkedin_rate_limits.sqlite3 in the temp directory,
+which is private to a container); point it at a directory mounted into every
+container that should share the quotas, as the Kestra flow does.
+"""
+
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import CancelledError
+from typing import Dict, Optional, Tuple
+
+from instrumentation import current_span
+
+
+RATE_LIMIT_DB = os.environ.get("RATE_LIMIT_DB", os.path.join(tempfile.gettempdir(), "linkedin_rate_limits.sqlite3"))
+
+# (requests per minute, burst) per API
+DEFAULT_QUOTAS: Dict[str, Tuple[float, float]] = {
+    "brave": (60, 1),       # Free plan: 1 query per second
+    "gemini": (60, 5),
+    "openai": (5, 1),       # DALL-E: 5 images per minute on the lowest tier
+    "sheets": (60, 10),     # 60 requests per minute per user
+    "linkedin": (30, 5),
+}
+
+
+def _parse_quota(value: str) -> Tuple[float, float]:
+    per_minute, _, burst = value.partition("/")
+    return float(per_minute), float(burst or 1)
+
+
+def _load_quotas() -> Dict[str, Tuple[float, float]]:
+    quotas = dict(DEFAULT_QUOTAS)
+    for api in quotas:
+        override = os.environ.get(f"RATE_LIMIT_{api.upper()}")
+        if override:
+            try:
+                quotas[api] = _parse_quota(override)
+            except ValueError:
+                print(f"⚠️ Warning: Ignoring invalid RATE_LIMIT_{api.upper()}={override!r}")
+    return quotas
+
+
+QUOTAS = _load_quotas()
+
+_local = threading.local()
+
+
+def _connection(path: str) -> sqlite3.Connection:
+    """One connection per thread and database path."""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    if path not in connections:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (api TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        connections[path] = conn
+    return connections[path]
+
+
+def reserve(api: str) -> float:
+    """
+    Take one token from the API's bucket, going into debt if it is empty.
+
+    Args:
+        api: API name, a key of QUOTAS
+
+    Returns:
+        Seconds the caller must wait before sending its request
+    """
+    per_minute, burst = QUOTAS[api]
+    rate = per_minute / 60.0
+    conn = _connection(RATE_LIMIT_DB)
+    # BEGIN IMMEDIATE takes the write lock, serializing reservations across processes
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        now = time.time()
+        row = conn.execute("SELECT tokens, updated FROM buckets WHERE api = ?", (api,)).fetchone()
+        tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+        tokens -= 1.0
+        conn.execute(
+            "INSERT OR REPLACE INTO buckets (api, tokens, updated) VALUES (?, ?, ?)",
+            (api, tokens, now)
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return max(0.0, -tokens / rate)
+
+
+def refund(api: str) -> None:
+    """
+    Return a token taken by reserve() for a request that was never sent.
+
+    Args:
+        api: API name, a key of QUOTAS
+    """
+    per_minute, burst = QUOTAS[api]
+    conn = _connection(RATE_LIMIT_DB)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("UPDATE buckets SET tokens = MIN(?, tokens + 1.0) WHERE api = ?", (burst, api))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def acquire(api: str, cancel: Optional[threading.Event] = None) -> float:
+    """
+    Block until a request to the API fits its quota.
+
+    The wait is recorded on the current span. If the shared database cannot
+    be used, the request proceeds unthrottled rather than failing the run.
+
+    Args:
+        api: API name, a key of QUOTAS
+        cancel: Event that abandons the request; its token is refunded
+
+    Returns:
+        Seconds waited
+
+    Raises:
+        CancelledError: If ``cancel`` was set before the request could be sent
+    """
+    try:
+        wait = reserve(api)
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️ Warning: Rate limiter unavailable ({e}), sending {api} request unthrottled")
+        return 0.0
+    if wait > 0:
+        current_span().set(rate_limit_wait_ms=round(wait * 1000.0, 3))
+        if cancel is None:
+            time.sleep(wait)
+        else:
+            cancel.wait(wait)
+    if cancel is not None and cancel.is_set():
+        try:
+            refund(api)
+        except (sqlite3.Error, OSError):
+            pass
+        raise CancelledError(f"{api} request cancelled before it was sent")
+    return wait
@@ -0,0 +1,148 @@
+"""
+LLM Response Normalizer
+
+One place that turns a chat model response into plain text plus metadata,
+shared by every model call. Handles the content formats LangChain chat
+models return:
+
+- a plain string (returned as is, without copying)
+- a list of content parts: strings or dicts such as {"type": "text", "text": ...}
+  (Gemini 3); non-text parts like thinking blocks are skipped
+- a stream of message chunks, each with string or list content
+
+Parts are concatenated exactly, with no separator, so JSON split across
+parts stays valid. Token usage and finish reason are exposed alongside the
+text.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class NormalizedResponse:
+    """
+    Text and metadata of a model response.
+
+    Args:
+        text: Concatenated response text
+        usage: Token usage in LangChain ``usage_metadata`` format (or None)
+        finish_reason: Why generation stopped, e.g. "STOP" or "MAX_TOKENS"
+        model: Model name reported by the provider
+    """
+
+    __slots__ = ("text", "usage", "finish_reason", "model")
+
+    def __init__(self, text: str, usage: Optional[Dict[str, int]] = None,
+                 finish_reason: Optional[str] = None, model: Optional[str] = None):
+        self.text = text
+        self.usage = usage
+        self.finish_reason = finish_reason
+        self.model = model
+
+    @property
+    def input_tokens(self) -> int:
+        return int((self.usage or {}).get("input_tokens") or 0)
+
+    @property
+    def output_tokens(self) -> int:
+        return int((self.usage or {}).get("output_tokens") or 0)
+
+    @property
+    def truncated(self) -> bool:
+        """True if the model stopped because it hit the output token limit."""
+        return (self.finish_reason or "").upper() in ("MAX_TOKENS", "LENGTH")
+
+
+def _collect_text(content: Any, out: List[str]) -> None:
+    """Append the text parts of ``content`` to ``out``."""
+    if content.__class__ is str:
+        out.append(content)
+        return
+    if not isinstance(content, list):
+        if content is not None:
+            out.append(str(content))
+        return
+    for part in content:
+        if part.__class__ is dict:
+            # Text parts carry "text"; thinking, tool-call and media parts do not
+            if part.get("type", "text") == "text":
+                text = part.get("text")
+                if text.__class__ is str:
+                    out.append(text)
+        elif isinstance(part, str):
+            out.append(part)
+
+
+def response_text(content: Any) -> str:
+    """
+    Extract the text of a response's ``content``.
+
+    Args:
+        content: String or list of content parts
+
+    Returns:
+        Exact concatenation of the text parts
+    """
+    if isinstance(content, str):
+        return content
+    out: List[str] = []
+    _collect_text(content, out)
+    # A single part is returned as is rather than copied by join
+    return out[0] if len(out) == 1 else "".join(out)
+
+
+def _metadata(message: Any) -> Dict[str, Any]:
+    metadata = getattr(message, "response_metadata", None)
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def normalize_response(response: Any) -> NormalizedResponse:
+    """
+    Normalize a complete (non-streamed) model response.
+
+    Args:
+        response: LangChain AIMessage (or anything with ``content``)
+
+    Returns:
+        NormalizedResponse
+    """
+    metadata = _metadata(response)
+    usage = getattr(response, "usage_metadata", None)
+    return NormalizedResponse(
+        response_text(getattr(response, "content", response)),
+        usage=usage if isinstance(usage, dict) else None,
+        finish_reason=metadata.get("finish_reason"),
+        model=metadata.get("model_name")
+    )
+
+
+def normalize_stream(chunks: Iterable[Any]) -> NormalizedResponse:
+    """
+    Normalize a streamed response in a single pass over its chunks.
+
+    Text parts are collected as chunks arrive and joined once at the end. Token usage is summed
+    over chunks (LangChain reports per-chunk deltas). The finish reason and
+    model come from the last chunk that reports them.
+
+    Args:
+        chunks: Message chunks, e.g. from ``model.stream(messages)``
+
+    Returns:
+        NormalizedResponse
+    """
+    out: List[str] = []
+    usage: Optional[Dict[str, int]] = None
+    finish_reason = None
+    model = None
+    for chunk in chunks:
+        _collect_text(getattr(chunk, "content", chunk), out)
+
+        chunk_usage = getattr(chunk, "usage_metadata", None)
+        if isinstance(chunk_usage, dict):
+            usage = usage or {}
+            for key, value in chunk_usage.items():
+                if isinstance(value, int):
+                    usage[key] = usage.get(key, 0) + value
+        metadata = _metadata(chunk)
+        finish_reason = metadata.get("finish_reason") or finish_reason
+        model = metadata.get("model_name") or model
+    return NormalizedResponse("".join(out), usage=usage, finish_reason=finish_reason, model=model)
@@ -0,0 +1,220 @@
+"""
+Search Result Ranker
+
+Scores every fetched search result locally before prompting, so only the
+best top-k results are sent to the model. The score combines:
+
+- relevance: BM25 of the result text against the profile's keywords/tools
+- novelty:   1 - highest TF-IDF cosine similarity to a previously used theme
+- recency:   exponential decay on the result's age
+
+Results that match none of the profile keywords only fill up the top-k after
+every relevant result. All scoring is vectorized with NumPy over the whole
+result set.
+"""
+
+import re
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+DEFAULT_WEIGHTS = {"relevance": 0.4, "novelty": 0.35, "recency": 0.25}
+RECENCY_HALF_LIFE_DAYS = 7.0
+# Recency score for results whose age is unknown
+UNKNOWN_RECENCY = 0.5
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9.+#-]*[a-z0-9+#]|[a-z0-9]")
+_RELATIVE_AGE_PATTERN = re.compile(r"(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago")
+_UNIT_DAYS = {"minute": 1 / 1440, "hour": 1 / 24, "day": 1, "week": 7, "month": 30, "year": 365}
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the this to was "
+    "were will with you your our we what why new".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase and split text into terms, keeping tool names like "n8n" and "bubble.io".
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of terms without stopwords
+    """
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _term_matrix(documents: Sequence[List[str]], vocabulary: Dict[str, int]) -> np.ndarray:
+    """Term-frequency matrix (documents x vocabulary)."""
+    matrix = np.zeros((len(documents), len(vocabulary)), dtype=np.float64)
+    rows, cols = [], []
+    for row, tokens in enumerate(documents):
+        for token in tokens:
+            col = vocabulary.get(token)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    if rows:
+        np.add.at(matrix, (np.array(rows), np.array(cols)), 1.0)
+    return matrix
+
+
+def bm25_scores(documents: Sequence[List[str]], query: List[str], k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """
+    Okapi BM25 score of each tokenized document for a tokenized query.
+
+    Args:
+        documents: Tokenized documents
+        query: Query terms
+        k1: Term frequency saturation
+        b: Length normalization
+
+    Returns:
+        Array of scores, one per document
+    """
+    if not documents:
+        return np.zeros(0)
+    vocabulary = {term: i for i, term in enumerate(dict.fromkeys(query))}
+    if not vocabulary:
+        return np.zeros(len(documents))
+    tf = _term_matrix(documents, vocabulary)
+    doc_len = np.array([len(tokens) for tokens in documents], dtype=np.float64)
+    avg_len = doc_len.mean() or 1.0
+    df = (tf > 0).sum(axis=0)
+    n = len(documents)
+    idf = np.log((n - df + 0.5) / (df + 0.5) + 1.0)
+    norm = k1 * (1.0 - b + b * doc_len / avg_len)
+    return ((tf * (k1 + 1.0)) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+
+def tfidf_vectors(documents: Sequence[List[str]]) -> np.ndarray:
+    """
+    L2-normalized TF-IDF vectors over the documents' shared vocabulary.
+
+    Args:
+        documents: Tokenized documents
+
+    Returns:
+        Matrix of shape (documents, vocabulary)
+    """
+    vocabulary: Dict[str, int] = {}
+    for tokens in documents:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+    if not vocabulary:
+        return np.zeros((len(documents), 0))
+    tf = _term_matrix(documents, vocabulary)
+    df = (tf > 0).sum(axis=0)
+    idf = np.log((1.0 + len(documents)) / (1.0 + df)) + 1.0
+    vectors = tf * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def novelty_scores(documents: Sequence[List[str]], past_themes: Sequence[List[str]]) -> np.ndarray:
+    """
+    Novelty of each document: 1 minus its highest cosine similarity to a past theme.
+
+    Args:
+        documents: Tokenized results
+        past_themes: Tokenized previously used themes
+
+    Returns:
+        Array of scores in [0, 1]
+    """
+    if not past_themes:
+        return np.ones(len(documents))
+    vectors = tfidf_vectors(list(documents) + list(past_themes))
+    similarity = vectors[:len(documents)] @ vectors[len(documents):].T
+    return 1.0 - np.clip(similarity.max(axis=1), 0.0, 1.0)
+
+
+def result_age_days(result: Dict[str, Any], now: float) -> Optional[float]:
+    """
+    Age of a search result in days, from Brave's "page_age" (ISO date) or "age" field.
+
+    Args:
+        result: Search result dictionary
+        now: Current time (epoch seconds)
+
+    Returns:
+        Age in days, or None if unknown
+    """
+    page_age = result.get("page_age")
+    if page_age:
+        try:
+            published = datetime.fromisoformat(str(page_age).replace("Z", "+00:00"))
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            return max(0.0, (now - published.timestamp()) / 86400.0)
+        except ValueError:
+            pass
+    match = _RELATIVE_AGE_PATTERN.search(str(result.get("age", "")).lower())
+    if match:
+        return int(match.group(1)) * _UNIT_DAYS[match.group(2)]
+    return None
+
+
+def recency_scores(results: Sequence[Dict[str, Any]], now: Optional[float] = None,
+                   half_life_days: float = RECENCY_HALF_LIFE_DAYS) -> np.ndarray:
+    """
+    Exponential-decay recency score of each result (1.0 = published now).
+
+    Args:
+        results: Search results
+        now: Current time (epoch seconds), defaults to time.time()
+        half_life_days: Age at which the score halves
+
+    Returns:
+        Array of scores in [0, 1]
+    """
+    now = time.time() if now is None else now
+    ages = np.array([
+        np.nan if (age := result_age_days(result, now)) is None else age
+        for result in results
+    ], dtype=np.float64)
+    scores = np.exp(-math.log(2) * ages / half_life_days)
+    return np.where(np.isnan(scores), UNKNOWN_RECENCY, scores)
+
+
+def rank_results(results: List[Dict[str, Any]], keywords: Sequence[str], past_themes: Sequence[str],
+                 top_k: int = 5, weights: Optional[Dict[str, float]] = None,
+                 now: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Rank search results by relevance, novelty and recency and keep the top k.
+
+    Args:
+        results: Search results with title/description (and optionally age fields)
+        keywords: Profile keywords and tool names
+        past_themes: Previously used post titles
+        top_k: Number of results to keep
+        weights: Weights for "relevance", "novelty" and "recency"
+        now: Current time (epoch seconds), for tests
+
+    Returns:
+        Top-k results, best first, each with an added "score"
+    """
+    if not results:
+        return []
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    documents = [tokenize(f"{r.get('title', '')} {r.get('description', '')}") for r in results]
+
+    relevance = bm25_scores(documents, tokenize(" ".join(keywords)))
+    if relevance.max() > 0:
+        relevance = relevance / relevance.max()
+    novelty = novelty_scores(documents, [tokenize(theme) for theme in past_themes])
+    recency = recency_scores(results, now=now)
+
+    scores = (
+        weights["relevance"] * relevance
+        + weights["novelty"] * novelty
+        + weights["recency"] * recency
+    )
+    # Relevant results first, then by score; lexsort is stable, so ties keep API order
+    order = np.lexsort((-scores, relevance <= 0))[:top_k]
+    return [{**results[i], "score": round(float(scores[i]), 4)} for i in order]
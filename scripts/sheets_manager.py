@@ -6,21 +6,26 @@ Handles reading and writing themes to/from Google Sheets to track published cont
 
 import os
 import json
-from typing import List, Dict, Any, Optional
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from instrumentation import span
+from rate_limiter import acquire
+
+# The Google client libraries are imported inside the functions that use them:
+# they are slow to load and callers such as the agent only need them once a
+# Sheets request is actually made.
+if TYPE_CHECKING:
+    from google.auth.credentials import Credentials
 
 
 # Google Sheets API configuration
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 SPREADSHEET_ID = os.environ.get('LINKEDIN_CONTENT_SPREADSHEET_ID', '1g7ZLdPYc8-XyKIexgHhpot8HTtcAv5uQmMXjBK4QUEo')
 SHEET_NAME = 'Sheet1'
+# Optional API endpoint override (e.g. a local stand-in server for benchmarks)
+SHEETS_API_ENDPOINT = os.environ.get('GOOGLE_SHEETS_API_ENDPOINT')
 
 
-def get_credentials() -> Credentials:
+def get_credentials() -> "Credentials":
     """
     Authenticate with Google Sheets API using service account or OAuth.
     
@@ -41,6 +46,9 @@ def get_credentials() -> Credentials:
         )
     else:
         # Fallback to OAuth flow (for local development)
+        from google.oauth2.credentials import Credentials
+        from google.auth.transport.requests import Request
+        
         token_file = 'token.json'
         if os.path.exists(token_file):
             creds = Credentials.from_authorized_user_file(token_file, SCOPES)
@@ -57,26 +65,67 @@ def get_credentials() -> Credentials:
     return creds
 
 
-def get_recent_themes(limit: int = 20) -> List[str]:
+def get_sheets_service():
+    """
+    Build an authenticated Google Sheets API client.
+    
+    Returns:
+        Sheets ``spreadsheets()`` resource
+    """
+    from googleapiclient.discovery import build
+    
+    creds = get_credentials()
+    client_options = {'api_endpoint': SHEETS_API_ENDPOINT} if SHEETS_API_ENDPOINT else None
+    service = build('sheets', 'v4', credentials=creds, cache_discovery=False, client_options=client_options)
+    return service.spreadsheets()
+
+
+def a1_range(sheet_name: str, columns: str) -> str:
+    """
+    Build an A1 range for a sheet tab, quoting the tab name so names with
+    spaces or punctuation work.
+    
+    Args:
+        sheet_name: Sheet tab name
+        columns: Column range, e.g. "A:A"
+        
+    Returns:
+        Range such as 'My Tab'!A:A
+    """
+    return "'" + sheet_name.replace("'", "''") + "'!" + columns
+
+
+def _themes_from_values(values: List[List[str]], limit: int) -> List[str]:
+    """Skip the header row and empty rows, and keep the last ``limit`` themes."""
+    themes = [row[0] for row in values[1:] if row]
+    return themes[-limit:] if len(themes) > limit else themes
+
+
+def get_recent_themes(limit: int = 20, sheet_name: str = SHEET_NAME) -> List[str]:
     """
     Retrieve the most recent themes from Google Sheets.
     
     Args:
         limit: Maximum number of themes to retrieve
+        sheet_name: Sheet tab holding the themes
         
     Returns:
         List of theme strings (post titles)
     """
+    from googleapiclient.errors import HttpError
+    
     try:
-        creds = get_credentials()
-        service = build('sheets', 'v4', credentials=creds)
-        sheet = service.spreadsheets()
+        sheet = get_sheets_service()
         
         # Read values from TEMA column (assuming column A)
-        result = sheet.values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range=f'{SHEET_NAME}!A:A'
-        ).execute()
+        sheet_range = a1_range(sheet_name, 'A:A')
+        with span("sheets.values.get", range=sheet_range) as s:
+            acquire("sheets")
+            result = sheet.values().get(
+                spreadsheetId=SPREADSHEET_ID,
+                range=sheet_range
+            ).execute()
+            s.record_payload(received=result)
         
         values = result.get('values', [])
         
@@ -84,9 +133,7 @@ def get_recent_themes(limit: int = 20) -> List[str]:
             print("ℹ️ No themes found in sheet")
             return []
         
-        # Skip header row and get last N themes
-        themes = [row[0] for row in values[1:] if row]  # Skip empty rows
-        recent_themes = themes[-limit:] if len(themes) > limit else themes
+        recent_themes = _themes_from_values(values, limit)
         
         print(f"📊 Retrieved {len(recent_themes)} recent themes from Google Sheets")
         return recent_themes
@@ -99,32 +146,130 @@ def get_recent_themes(limit: int = 20) -> List[str]:
         return []
 
 
-def add_theme(theme: str) -> bool:
+def get_recent_themes_batch(sheet_names: List[str], limit: int = 20) -> Dict[str, List[str]]:
+    """
+    Retrieve the most recent themes of several sheet tabs in one request.
+    
+    If the batch fails (e.g. one tab is missing, which fails the whole
+    batchGet), each tab is read on its own so the others keep their history.
+    
+    Args:
+        sheet_names: Sheet tabs to read
+        limit: Maximum number of themes per tab
+        
+    Returns:
+        Dictionary mapping each sheet tab to its themes (empty list if a tab cannot be read)
+    """
+    from googleapiclient.errors import HttpError
+    
+    sheet_names = list(dict.fromkeys(sheet_names))
+    ranges = [a1_range(name, 'A:A') for name in sheet_names]
+    try:
+        sheet = get_sheets_service()
+        
+        with span("sheets.values.batch_get", ranges=len(ranges)) as s:
+            acquire("sheets")
+            result = sheet.values().batchGet(
+                spreadsheetId=SPREADSHEET_ID,
+                ranges=ranges
+            ).execute()
+            s.record_payload(received=result)
+        
+        # valueRanges come back in request order
+        value_ranges = result.get('valueRanges', [])
+        themes = {
+            name: _themes_from_values(value_range.get('values', []), limit)
+            for name, value_range in zip(sheet_names, value_ranges)
+        }
+        print(f"📊 Retrieved themes for {len(themes)} sheet tabs in one request")
+        return {name: themes.get(name, []) for name in sheet_names}
+        
+    except HttpError as error:
+        print(f"⚠️ Google Sheets batch read failed ({error}), reading tabs one by one")
+    except Exception as e:
+        print(f"⚠️ Batch theme read failed ({e}), reading tabs one by one")
+    return {name: get_recent_themes(limit=limit, sheet_name=name) for name in sheet_names}
+
+
+def get_published_posts(sheet_names: List[str]) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Read the published posts (theme, post id, publication time) of several
+    sheet tabs in one request.
+    
+    Args:
+        sheet_names: Sheet tabs to read
+        
+    Returns:
+        Dictionary mapping each sheet tab to its posts that have a post id
+    """
+    from googleapiclient.errors import HttpError
+    
+    sheet_names = list(dict.fromkeys(sheet_names))
+    posts: Dict[str, List[Dict[str, str]]] = {name: [] for name in sheet_names}
+    try:
+        sheet = get_sheets_service()
+        
+        with span("sheets.values.batch_get", ranges=len(sheet_names)) as s:
+            acquire("sheets")
+            result = sheet.values().batchGet(
+                spreadsheetId=SPREADSHEET_ID,
+                ranges=[a1_range(name, 'A:C') for name in sheet_names]
+            ).execute()
+            s.record_payload(received=result)
+        
+        for name, value_range in zip(sheet_names, result.get('valueRanges', [])):
+            for row in value_range.get('values', [])[1:]:
+                if len(row) >= 2 and row[1]:
+                    posts[name].append({
+                        "theme": row[0],
+                        "post_id": row[1],
+                        "published_at": row[2] if len(row) > 2 else ""
+                    })
+        
+    except HttpError as error:
+        print(f"❌ Google Sheets API error: {error}")
+    except Exception as e:
+        print(f"❌ Error retrieving published posts: {e}")
+    return posts
+
+
+def add_theme(theme: str, sheet_name: str = SHEET_NAME, post_id: Optional[str] = None,
+              published_at: Optional[str] = None) -> bool:
     """
     Add a new theme to Google Sheets.
     
+    With a post id, the row also records the LinkedIn post URN (column B)
+    and publication time (column C) for the engagement harvester.
+    
     Args:
         theme: The post title/theme to add
+        sheet_name: Sheet tab holding the themes
+        post_id: LinkedIn post URN
+        published_at: ISO 8601 publication time (UTC)
         
     Returns:
         True if successful, False otherwise
     """
+    from googleapiclient.errors import HttpError
+    
     try:
-        creds = get_credentials()
-        service = build('sheets', 'v4', credentials=creds)
-        sheet = service.spreadsheets()
+        sheet = get_sheets_service()
         
         # Append new row with theme
-        values = [[theme]]
+        values = [[theme, post_id, published_at or ""]] if post_id else [[theme]]
         body = {'values': values}
+        sheet_range = a1_range(sheet_name, 'A:C' if post_id else 'A:A')
         
-        result = sheet.values().append(
-            spreadsheetId=SPREADSHEET_ID,
-            range=f'{SHEET_NAME}!A:A',
-            valueInputOption='RAW',
-            insertDataOption='INSERT_ROWS',
-            body=body
-        ).execute()
+        with span("sheets.values.append", range=sheet_range) as s:
+            acquire("sheets")
+            result = sheet.values().append(
+                spreadsheetId=SPREADSHEET_ID,
+                range=sheet_range,
+                valueInputOption='RAW',
+                insertDataOption='INSERT_ROWS',
+                body=body
+            ).execute()
+            s.record_payload(sent=body, received=result)
         
         print(f"✅ Added theme to Google Sheets: {theme}")
         print(f"📝 Updated cells: {result.get('updates').get('updatedCells')}")
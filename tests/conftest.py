@@ -0,0 +1,17 @@
+"""
+Shared pytest fixtures
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limiter(tmp_path, monkeypatch):
+    """Give every test its own rate limiter database, so runs never share quota."""
+    import rate_limiter
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_DB", str(tmp_path / "rate_limits.sqlite3"))
@@ -0,0 +1,100 @@
+"""
+Unit tests for the artifact store and resume mode
+
+Run with: pytest tests/test_artifact_store.py -v
+"""
+
+import pytest
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from artifact_store import ArtifactStore, input_hash
+
+
+class TestArtifactStore:
+    """Tests for content-addressed storage"""
+
+    def test_roundtrip_json_and_bytes(self, tmp_path):
+        """Values are returned for the same inputs only"""
+        store = ArtifactStore(str(tmp_path))
+        store.put("agent.post", {"prompt": "a"}, {"title": "T", "content": "C"})
+        store.put_bytes("image.generate", {"prompt": "a"}, b"\x89PNG")
+
+        assert store.get("agent.post", {"prompt": "a"}) == {"title": "T", "content": "C"}
+        assert store.get("agent.post", {"prompt": "b"}) is None
+        assert store.get_bytes("image.generate", {"prompt": "a"}) == b"\x89PNG"
+        assert store.get_bytes("agent.post", {"prompt": "a"}) is None
+
+    def test_identical_content_is_deduplicated(self, tmp_path):
+        """Two stages producing the same content share one blob"""
+        store = ArtifactStore(str(tmp_path))
+        first = store.put("a", {"x": 1}, "same")
+        second = store.put("b", {"x": 2}, "same")
+
+        assert first == second
+        blobs = [f for _, _, files in os.walk(tmp_path / "blobs") for f in files]
+        assert len(blobs) == 1
+
+    def test_input_hash_is_key_order_independent(self):
+        """Inputs hash canonically"""
+        assert input_hash({"a": 1, "b": [1, 2]}) == input_hash({"b": [1, 2], "a": 1})
+
+    def test_corrupted_blob_is_ignored(self, tmp_path):
+        """A blob whose content no longer matches its digest is treated as missing"""
+        store = ArtifactStore(str(tmp_path))
+        digest = store.put("agent.post", {"p": 1}, {"title": "T"})
+        with open(tmp_path / "blobs" / digest[:2] / digest, "wb") as f:
+            f.write(b"garbage")
+
+        assert store.get("agent.post", {"p": 1}) is None
+
+    def test_cached_reuses_only_when_resuming(self, tmp_path):
+        """cached() always stores, but reads back only in resume mode"""
+        store = ArtifactStore(str(tmp_path))
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        assert store.cached("s", {"i": 1}, compute, resume=False) == {"n": 1}
+        assert store.cached("s", {"i": 1}, compute, resume=False) == {"n": 2}
+        assert store.cached("s", {"i": 1}, compute, resume=True) == {"n": 2}
+        assert len(calls) == 2
+
+
+class TestResumePipeline:
+    """Resume mode against the local stand-in services"""
+
+    def test_retry_after_publish_failure_only_redoes_publish(self, tmp_path, monkeypatch):
+        """A resumed run reuses search, LLM and image results and never publishes twice"""
+        from bench_end_to_end import pipeline_environment, run_pipeline
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices, ServiceConfig
+
+        monkeypatch.setenv("LINKEDIN_RESUME", "1")
+        chat_model = FakeChatModel()
+        linkedin = ServiceConfig(error_rate=1.0)
+        with FakeServices(config={"linkedin": linkedin}, image_bytes=1024) as services, \
+                pipeline_environment(services, chat_model):
+            first = run_pipeline(str(tmp_path))
+            requests_after_first = dict(services.requests)
+            linkedin.error_rate = 0.0
+            second = run_pipeline(str(tmp_path))
+            calls_after_second = chat_model.calls
+            third = run_pipeline(str(tmp_path))
+
+        assert first["failed_stage"] == "publish"
+        assert second["ok"] and third["ok"]
+        assert calls_after_second == 2
+        assert services.requests["brave"] == requests_after_first["brave"]
+        assert services.requests["openai"] == requests_after_first["openai"]
+        assert len(services.published) == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
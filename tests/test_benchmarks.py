@@ -0,0 +1,62 @@
+"""
+Smoke tests for the end-to-end benchmark harness
+
+Run with: pytest tests/test_benchmarks.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add benchmarks directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_end_to_end import run_benchmark, compare_to_baseline
+from fake_services import ServiceConfig
+
+
+class TestEndToEndBenchmark:
+    """Tests for the pipeline benchmark against local stand-in services"""
+
+    def test_pipeline_runs_against_fakes(self):
+        """A full run generates, uploads and publishes through the fakes"""
+        report = run_benchmark(runs=1, image_bytes=1024)
+
+        assert report["single"]["ok"]
+        assert report["batch"]["succeeded"] == 1
+        assert report["services"]["posts_published"] == 3
+        assert report["chat_model_calls"] == 6
+        assert set(report["single"]["stages_ms"]) == {"generate_content", "generate_image", "publish"}
+
+    def test_injected_errors_fail_publish(self):
+        """Error injection on LinkedIn makes the publish stage fail"""
+        report = run_benchmark(
+            runs=1,
+            service_config={"linkedin": ServiceConfig(error_rate=1.0)},
+            image_bytes=1024
+        )
+
+        assert not report["single"]["ok"]
+        assert report["batch"]["succeeded"] == 0
+        assert report["services"]["posts_published"] == 0
+        assert report["services"]["injected_errors"]["linkedin"] > 0
+
+    def test_compare_to_baseline(self):
+        """Latency increases beyond the tolerance are reported"""
+        baseline = {
+            "single": {"peak_memory_bytes": 1000},
+            "batch": {"latency_ms": {"p50": 100.0, "p95": 200.0}, "throughput_runs_per_min": 60.0}
+        }
+        report = {
+            "single": {"peak_memory_bytes": 1000},
+            "batch": {"latency_ms": {"p50": 150.0, "p95": 210.0}, "sequential_runs_per_min": 58.0}
+        }
+
+        regressions = compare_to_baseline(report, baseline, tolerance=0.2)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith("batch p50 latency")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
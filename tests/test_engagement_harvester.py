@@ -0,0 +1,137 @@
+"""
+Unit tests for the engagement harvester
+
+Run with: pytest tests/test_engagement_harvester.py -v
+"""
+
+import pytest
+import os
+import sys
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import engagement_harvester
+from engagement_harvester import (
+    load_engagement, posts_due, save_engagement, top_themes, update_engagement
+)
+
+NOW = 1_800_000_000.0
+DAY = 86400.0
+
+
+def record(post_id, theme, reactions=0, comments=0, profile="guilherme", published_at=NOW - DAY, fetched_at=NOW):
+    return {
+        "post_id": post_id, "profile": profile, "theme": theme, "published_at": published_at,
+        "fetched_at": fetched_at, "reactions": reactions, "comments": comments, "impressions": -1,
+    }
+
+
+class TestEngagementStore:
+    """Tests for the columnar store"""
+
+    def test_roundtrip_and_upsert(self, tmp_path):
+        """Snapshots are replaced per post and survive a save/load cycle"""
+        path = str(tmp_path / "engagement.npz")
+        columns = update_engagement(load_engagement(path), [record("urn:li:share:1", "A", reactions=1)])
+        columns = update_engagement(columns, [
+            record("urn:li:share:1", "A", reactions=9),
+            record("urn:li:share:2", "A much longer theme than the first one", comments=3),
+        ])
+        save_engagement(columns, path)
+
+        loaded = load_engagement(path)
+        assert loaded["post_id"].tolist() == ["urn:li:share:1", "urn:li:share:2"]
+        assert loaded["reactions"].tolist() == [9, 0]
+        assert loaded["theme"][1] == "A much longer theme than the first one"
+
+    def test_top_themes_aggregates_by_theme(self, tmp_path):
+        """Engagement is summed per theme, comments weigh more, profiles filter"""
+        path = str(tmp_path / "engagement.npz")
+        save_engagement(update_engagement(load_engagement(path), [
+            record("urn:li:share:1", "Agents", reactions=10),
+            record("urn:li:share:2", "Agents", reactions=5),
+            record("urn:li:share:3", "Zapier", reactions=4, comments=6),
+            record("urn:li:share:4", "Quiet"),
+            record("urn:li:share:5", "Other client", reactions=100, profile="acme"),
+        ]), path)
+
+        best = top_themes(path=path, profile_id="guilherme")
+
+        assert [item["theme"] for item in best] == ["Zapier", "Agents"]
+        assert best[1]["posts"] == 2 and best[1]["engagement"] == 15
+        assert top_themes(path=path)[0]["theme"] == "Other client"
+        assert top_themes(path=str(tmp_path / "missing.npz")) == []
+
+
+class TestPostsDue:
+    """Tests for incremental polling"""
+
+    def test_only_new_or_fresh_and_stale_posts_are_polled(self):
+        """Old posts are polled once; fresh posts at most every interval"""
+        columns = update_engagement(load_engagement("missing.npz"), [
+            record("old", "t", published_at=NOW - 60 * DAY, fetched_at=NOW - 10 * DAY),
+            record("fresh-recent", "t", fetched_at=NOW - 60),
+            record("fresh-stale", "t", fetched_at=NOW - 2 * DAY),
+        ])
+        posts = [
+            {"post_id": "old", "published_at": NOW - 60 * DAY},
+            {"post_id": "fresh-recent", "published_at": NOW - DAY},
+            {"post_id": "fresh-stale", "published_at": NOW - 3 * DAY},
+            {"post_id": "new", "published_at": NOW - 90 * DAY},
+        ]
+
+        due = [post["post_id"] for post in posts_due(posts, columns, NOW)]
+
+        assert due == ["fresh-stale", "new"]
+
+
+class TestHarvest:
+    """Harvesting against the local stand-in services"""
+
+    def test_publish_then_harvest(self, tmp_path):
+        """Published post ids reach the sheet and their engagement the store"""
+        from bench_end_to_end import pipeline_environment, run_pipeline
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices
+
+        path = str(tmp_path / "engagement.npz")
+        (tmp_path / "run").mkdir()
+        with FakeServices(image_bytes=1024) as services, pipeline_environment(services, FakeChatModel()):
+            assert run_pipeline(str(tmp_path / "run"))["ok"]
+            row = services.sheet_rows["Sheet1"][-1]
+            first = engagement_harvester.harvest(path=path)
+            second = engagement_harvester.harvest(path=path)
+
+        assert row[1] == "urn:li:share:1" and row[2].endswith("Z")
+        with open(tmp_path / "run" / "publish_result.json") as f:
+            assert json.load(f)["post_id"] == "urn:li:share:1"
+        assert first == {"posts": 1, "polled": 1, "updated": 1}
+        assert second["polled"] == 0
+        assert top_themes(path=path)[0]["theme"] == row[0]
+
+    def test_bulk_fetches_are_paginated(self, tmp_path, monkeypatch):
+        """Posts are fetched ENGAGEMENT_BATCH_SIZE at a time"""
+        from bench_end_to_end import pipeline_environment
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices
+
+        monkeypatch.setattr(engagement_harvester, "ENGAGEMENT_BATCH_SIZE", 2)
+        path = str(tmp_path / "engagement.npz")
+        with FakeServices() as services, pipeline_environment(services, FakeChatModel()):
+            services.sheet_rows["Sheet1"] = [["TEMA"]] + [
+                [f"Theme {n}", f"urn:li:share:{n}", "2026-01-0{}T09:00:00Z".format(n)] for n in range(1, 6)
+            ]
+            summary = engagement_harvester.harvest(path=path)
+            linkedin_requests = services.requests["linkedin"]
+
+        assert summary["updated"] == 5
+        assert linkedin_requests == 3
+        columns = load_engagement(path)
+        assert columns["reactions"].tolist() == [services.engagement(p)["reactions"] for p in columns["post_id"]]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,27 @@
+"""
+Import-time budget tests for the pipeline stages
+
+Run with: pytest tests/test_import_time.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add benchmarks directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from import_time import IMPORT_BUDGETS_MS, loaded_heavy_modules, measure_import_time
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_stage_has_no_heavy_imports(module):
+    """Importing a stage must not load LangChain, OpenAI or the Google clients"""
+    assert loaded_heavy_modules(module) == []
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_stage_import_within_budget(module):
+    """Each stage starts within its import-time budget (best of 3 runs)"""
+    best = min(measure_import_time(module) for _ in range(3))
+    assert best <= IMPORT_BUDGETS_MS[module], f"{module} imported in {best:.1f} ms"
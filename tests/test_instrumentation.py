@@ -0,0 +1,129 @@
+"""
+Unit tests for the instrumentation layer
+
+Run with: pytest tests/test_instrumentation.py -v
+"""
+
+import pytest
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import instrumentation
+from instrumentation import span, write_metrics, render_prometheus, instrumented_stage
+
+
+@pytest.fixture
+def metrics_enabled():
+    instrumentation.configure(enabled=True, prometheus=True)
+    instrumentation.reset()
+    yield
+    instrumentation.configure(enabled=False)
+    instrumentation.reset()
+
+
+class TestSpans:
+    """Tests for span recording"""
+
+    def test_disabled_span_is_shared_noop(self):
+        """Disabled instrumentation hands out one shared no-op span"""
+        instrumentation.configure(enabled=False)
+        with span("brave.search") as s:
+            s.record_payload(sent="x", received=b"abc")
+        assert span("other") is s
+        assert instrumentation.finished_spans() == []
+
+    def test_span_records_sizes_tokens_and_parent(self, metrics_enabled):
+        """Spans capture payload sizes, token usage and nesting"""
+        with span("stage.generate_content"):
+            with span("gemini.invoke", model="m") as s:
+                s.record_payload(sent="héllo", received=[{"text": "ok"}])
+                s.record_usage({"input_tokens": 12, "output_tokens": 30})
+                s.add_retry()
+
+        spans = {item["name"]: item for item in instrumentation.finished_spans()}
+        gemini = spans["gemini.invoke"]
+        assert gemini["parent"] == "stage.generate_content"
+        assert gemini["bytes_out"] == len("héllo".encode("utf-8"))
+        assert gemini["bytes_in"] > 0
+        assert gemini["input_tokens"] == 12 and gemini["output_tokens"] == 30
+        assert gemini["retries"] == 1
+        assert gemini["attrs"] == {"model": "m"}
+
+    def test_payload_parts_are_sized_lazily(self, metrics_enabled):
+        """Payload parts are summed when recorded and never touched when disabled"""
+        parts = ["system ", "prompté"]
+        with span("gemini.invoke") as s:
+            s.record_payload(sent=(part for part in parts))
+        assert instrumentation.finished_spans()[0]["bytes_out"] == len("system prompté".encode("utf-8"))
+
+        instrumentation.configure(enabled=False)
+        consumed = []
+        with span("gemini.invoke") as s:
+            s.record_payload(sent=(consumed.append(part) for part in parts))
+        assert consumed == []
+
+    def test_span_marks_errors(self, metrics_enabled):
+        """An exception inside a span is recorded and re-raised"""
+        with pytest.raises(ValueError):
+            with span("linkedin.ugc_posts.create"):
+                raise ValueError("boom")
+
+        item = instrumentation.finished_spans()[0]
+        assert item["status"] == "error"
+        assert "boom" in item["error"]
+
+
+class TestWriteMetrics:
+    """Tests for the metrics document"""
+
+    def test_stages_merge_into_one_document(self, metrics_enabled, tmp_path, monkeypatch):
+        """Each stage adds its entry to the document left by the previous one"""
+        monkeypatch.chdir(tmp_path)
+
+        @instrumented_stage("generate_content")
+        def generate():
+            with span("brave.search"):
+                pass
+
+        @instrumented_stage("publish")
+        def publish():
+            sys.exit(1)
+
+        generate()
+        with pytest.raises(SystemExit):
+            publish()
+
+        document = json.loads((tmp_path / "metrics.json").read_text())
+        assert set(document["stages"]) == {"generate_content", "publish"}
+        assert document["stages"]["generate_content"]["status"] == "ok"
+        assert document["stages"]["publish"]["status"] == "error"
+        assert [s["name"] for s in document["stages"]["publish"]["spans"]] == ["stage.publish"]
+
+        prom = (tmp_path / "metrics.prom").read_text()
+        assert 'linkedin_span_duration_seconds_count{stage="generate_content",span="brave.search"} 1' in prom
+
+    def test_write_metrics_disabled(self, tmp_path):
+        """Nothing is written when instrumentation is disabled"""
+        instrumentation.configure(enabled=False)
+        assert write_metrics("publish", path=str(tmp_path / "metrics.json")) is None
+        assert not (tmp_path / "metrics.json").exists()
+
+    def test_render_prometheus_tokens(self):
+        """Token usage is exported per direction"""
+        document = {"stages": {"generate_content": {"spans": [{
+            "name": "gemini.invoke", "duration_ms": 1500.0, "status": "ok",
+            "bytes_in": 10, "bytes_out": 20, "retries": 0,
+            "input_tokens": 100, "output_tokens": 50
+        }]}}}
+        prom = render_prometheus(document)
+        assert "# TYPE linkedin_span_duration_seconds summary" in prom
+        assert 'linkedin_llm_tokens_total{stage="generate_content",span="gemini.invoke",direction="input"} 100' in prom
+        assert 'linkedin_span_duration_seconds_sum{stage="generate_content",span="gemini.invoke"} 1.5' in prom
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -33,7 +33,7 @@ class TestBraveSearch:
         result = brave_search("test query")
         result_data = json.loads(result)
         
-        assert 'web' in result_data
+        assert result_data['results'][0]['title'] == 'Test Result'
         assert mock_get.called
     
     @patch.dict(os.environ, {}, clear=True)
@@ -0,0 +1,228 @@
+"""
+Unit tests for hedged LLM invocation
+
+Run with: pytest tests/test_llm_invoker.py -v
+"""
+
+import pytest
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import instrumentation
+from fake_chat_model import FakeChatModel
+from llm_invoker import MIN_LATENCY_SAMPLES, HedgedInvoker, LatencyTracker
+
+
+def seeded_tracker(model, seconds, path=None):
+    """Tracker whose percentile for the model is `seconds`."""
+    tracker = LatencyTracker(path)
+    for _ in range(MIN_LATENCY_SAMPLES):
+        tracker.record(model, seconds)
+    return tracker
+
+
+class SlowAsyncModel:
+    """Async-native model that never answers in time and notes its cancellation."""
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+    def invoke(self, messages):
+        raise AssertionError("async models are called through ainvoke")
+
+    async def ainvoke(self, messages):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+
+
+class TestLatencyTracker:
+    """Tests for the latency history"""
+
+    def test_percentile_needs_enough_samples(self):
+        """No percentile until MIN_LATENCY_SAMPLES are recorded"""
+        tracker = LatencyTracker()
+        tracker.record("m", 1.0)
+        assert tracker.percentile("m", 90) is None
+
+        for seconds in (2.0, 3.0, 4.0, 10.0):
+            tracker.record("m", seconds)
+        assert tracker.percentile("m", 50) == 3.0
+        assert tracker.percentile("m", 90) == 10.0
+
+    def test_history_is_persisted(self, tmp_path):
+        """A new tracker on the same file sees earlier samples"""
+        path = str(tmp_path / "latency.json")
+        seeded_tracker("m", 2.5, path)
+
+        assert LatencyTracker(path).percentile("m", 90) == 2.5
+        with open(path) as f:
+            assert json.load(f)["m"] == [2.5] * MIN_LATENCY_SAMPLES
+
+
+    def test_concurrent_records_keep_the_file_whole(self, tmp_path):
+        """Threads recording at once leave a complete, up-to-date history file"""
+        path = str(tmp_path / "latency.json")
+        tracker = LatencyTracker(path)
+        threads = [
+            threading.Thread(target=lambda n=n: [tracker.record(f"m{n}", 1.0) for _ in range(20)])
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with open(path) as f:
+            history = json.load(f)
+        assert {name: len(values) for name, values in history.items()} == {f"m{n}": 20 for n in range(4)}
+        assert [name for name in os.listdir(tmp_path) if name.startswith(".tmp-")] == []
+
+
+class TestHedgedInvoker:
+    """Tests for hedging, failover and the latency budget"""
+
+    def test_fast_primary_is_not_hedged(self):
+        """A primary answering before the deadline is the only request"""
+        primary, fallback = FakeChatModel(), FakeChatModel()
+        invoker = HedgedInvoker([("primary", primary), ("fallback", fallback)],
+                                tracker=seeded_tracker("primary", 1.0))
+
+        response, model = invoker.invoke(["hello"])
+
+        assert model == "primary"
+        assert response.content
+        assert (primary.calls, fallback.calls) == (1, 0)
+
+    def test_slow_primary_is_hedged_to_fallback(self):
+        """The fallback wins when the primary is slower than the hedge deadline"""
+        primary = FakeChatModel(latency_ms=3000)
+        fallback = FakeChatModel(latency_ms=10)
+        invoker = HedgedInvoker([("primary", primary), ("fallback", fallback)],
+                                tracker=seeded_tracker("primary", 0.05))
+        invoker.hedge_after = lambda: 0.05
+
+        start = time.perf_counter()
+        _, model = invoker.invoke(["hello"])
+
+        assert model == "fallback"
+        assert time.perf_counter() - start < 1.0
+        assert (primary.calls, fallback.calls) == (1, 1)
+
+    def test_losing_request_is_cancelled(self):
+        """Once the hedge wins, the in-flight primary call is torn down and not recorded"""
+        primary = SlowAsyncModel()
+        tracker = seeded_tracker("primary", 0.05)
+        invoker = HedgedInvoker([("primary", primary), ("fallback", FakeChatModel())], tracker=tracker)
+        invoker.hedge_after = lambda: 0.05
+
+        _, model = invoker.invoke(["hello"])
+
+        assert model == "fallback"
+        assert primary.cancelled.wait(1.0)
+        assert list(tracker._samples["primary"]) == [0.05] * MIN_LATENCY_SAMPLES
+
+    def test_failure_fails_over_immediately(self):
+        """An error does not wait for the hedge deadline"""
+        invoker = HedgedInvoker([("primary", FakeChatModel(error_rate=1.0)), ("fallback", FakeChatModel())])
+
+        start = time.perf_counter()
+        _, model = invoker.invoke(["hello"])
+
+        assert model == "fallback"
+        assert time.perf_counter() - start < 1.0
+
+    def test_invalid_response_counts_as_failure(self):
+        """Responses rejected by validate are not returned"""
+        invoker = HedgedInvoker([("primary", FakeChatModel()), ("fallback", FakeChatModel(model_name="ok"))])
+
+        response, model = invoker.invoke(
+            ["hello"], validate=lambda r: r.response_metadata["model_name"] == "ok"
+        )
+
+        assert model == "fallback"
+
+    def test_all_failures_raise(self):
+        """Every attempt failing raises RuntimeError with the reasons"""
+        invoker = HedgedInvoker([("only", FakeChatModel(error_rate=1.0))], max_attempts=2)
+
+        with pytest.raises(RuntimeError, match="All 2 LLM attempts failed"):
+            invoker.invoke(["hello"])
+
+    def test_latency_budget_bounds_the_call(self):
+        """A call never takes much longer than the budget"""
+        invoker = HedgedInvoker([("slow", FakeChatModel(latency_ms=3000))], latency_budget_s=0.2)
+
+        start = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            invoker.invoke(["hello"])
+        assert time.perf_counter() - start < 1.0
+
+    def test_rate_limiter_wait_is_not_model_latency(self, monkeypatch):
+        """Waiting on the limiter neither hedges, eats the budget, nor counts as latency"""
+        def slow_acquire(api, cancel=None):
+            time.sleep(0.3)
+            return 0.3
+
+        monkeypatch.setattr("llm_invoker.acquire", slow_acquire)
+        primary, fallback = FakeChatModel(latency_ms=10), FakeChatModel()
+        tracker = LatencyTracker()
+        invoker = HedgedInvoker([("primary", primary), ("fallback", fallback)], tracker=tracker,
+                                latency_budget_s=0.2)
+        invoker.hedge_after = lambda: 0.05
+
+        _, model = invoker.invoke(["hello"])
+
+        assert model == "primary"
+        assert fallback.calls == 0
+        assert tracker._samples["primary"][0] < 0.2
+
+    def test_rate_limit_wait_reaches_calling_span(self, monkeypatch):
+        """The request thread runs in the caller's context, so its limiter wait is on the span"""
+        import rate_limiter
+
+        monkeypatch.setitem(rate_limiter.QUOTAS, "gemini", (600, 1))
+        rate_limiter.acquire("gemini")  # Drain the bucket so the call has to wait
+        instrumentation.configure(enabled=True)
+        instrumentation.reset()
+        try:
+            invoker = HedgedInvoker([("primary", FakeChatModel())])
+            with instrumentation.span("gemini.invoke"):
+                invoker.invoke(["hello"])
+
+            record = instrumentation.finished_spans()[-1]
+            assert record["attrs"]["rate_limit_wait_ms"] > 0
+        finally:
+            instrumentation.configure(enabled=False)
+            instrumentation.reset()
+
+    def test_winner_is_recorded_on_span(self):
+        """The calling span records the winning model and hedged attempts"""
+        instrumentation.configure(enabled=True)
+        instrumentation.reset()
+        try:
+            invoker = HedgedInvoker([("primary", FakeChatModel(error_rate=1.0)), ("fallback", FakeChatModel())])
+            with instrumentation.span("gemini.invoke"):
+                invoker.invoke(["hello"])
+
+            record = instrumentation.finished_spans()[-1]
+            assert record["attrs"]["model"] == "fallback"
+            assert record["attrs"]["attempts"] == 2
+            assert record["retries"] == 1
+        finally:
+            instrumentation.configure(enabled=False)
+            instrumentation.reset()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
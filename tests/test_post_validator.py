@@ -0,0 +1,163 @@
+"""
+Unit tests for the post validator
+
+Run with: pytest tests/test_post_validator.py -v
+"""
+
+import pytest
+import json
+import sys
+import os
+from unittest.mock import Mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from post_validator import (
+    MAX_WORDS, MIN_WORDS, build_repair_prompt, parse_post_json, repair_post, validate_post, word_count
+)
+
+
+def make_content(sentences: int, closing: str = "What would you automate first? Tell me below.") -> str:
+    body = " ".join(f"Sentence number {i} talks about automation with n8n and AI agents." for i in range(sentences))
+    return f"{body}\n\n{closing}"
+
+
+class TestValidatePost:
+    """Tests for local validation"""
+
+    def test_valid_post(self):
+        """A post within the guidelines has no issues"""
+        post = {"title": "Stop copying data by hand", "content": make_content(26)}
+        assert MIN_WORDS <= word_count(post["content"]) <= MAX_WORDS
+        assert validate_post(post) == []
+
+    def test_detects_every_violation(self):
+        """Emojis, markdown, title length and word count are all reported"""
+        post = {"title": "x" * 200, "content": "**Bold** claim 🚀\n## Heading\nshort"}
+        codes = {issue["code"] for issue in validate_post(post)}
+        assert codes == {"title_too_long", "emoji", "markdown", "too_short"}
+
+    @pytest.mark.parametrize("post", [None, [], {"title": "T"}, {"title": "T", "content": "  "}])
+    def test_bad_shape(self, post):
+        """Anything that is not a title/content object is a shape issue"""
+        assert [issue["code"] for issue in validate_post(post)] == ["shape"]
+
+    def test_hashtags_are_not_markdown(self):
+        """Hashtags are allowed"""
+        post = {"title": "T", "content": make_content(26, closing="#automation #n8n")}
+        assert validate_post(post) == []
+
+
+class TestRepairPost:
+    """Tests for local repairs"""
+
+    def test_strips_emojis_and_markdown(self):
+        """Mechanical issues are fixed without a model call"""
+        post = {"title": "**The** hook 🚀", "content": "## Intro\n" + make_content(26).replace("n8n", "`n8n` ✅")}
+        repaired, issues = repair_post(post)
+        assert issues == []
+        assert repaired["title"] == "The hook"
+        assert "`" not in repaired["content"] and "✅" not in repaired["content"]
+        assert not repaired["content"].startswith("#")
+
+    def test_trims_long_post_keeping_call_to_action(self):
+        """Long posts lose whole body sentences, not the closing paragraph"""
+        post = {"title": "T", "content": make_content(32)}
+        assert word_count(post["content"]) > MAX_WORDS
+
+        repaired, issues = repair_post(post)
+
+        assert issues == []
+        assert repaired["content"].endswith("Tell me below.")
+        assert repaired["content"].split("\n\n")[0].endswith("AI agents.")
+
+    def test_short_post_needs_model(self):
+        """Too-short posts cannot be repaired locally"""
+        repaired, issues = repair_post({"title": "T 😀", "content": "Too short."})
+        assert [issue["code"] for issue in issues] == ["too_short"]
+        assert repaired["title"] == "T"
+
+    def test_long_title_cut_at_word_boundary(self):
+        """Titles are shortened at a word boundary"""
+        repaired, _ = repair_post({"title": "word " * 50, "content": make_content(26)})
+        assert len(repaired["title"]) <= 150
+        assert repaired["title"].endswith("word")
+
+
+class TestParseAndPrompt:
+    """Tests for JSON parsing and repair prompts"""
+
+    def test_parse_wrapped_json(self):
+        """JSON wrapped in prose or code fences is extracted"""
+        text = 'Here you go:\n```json\n{"title": "T", "content": "C"}\n```'
+        assert parse_post_json(text) == {"title": "T", "content": "C"}
+        assert parse_post_json("not json") is None
+
+    def test_repair_prompt_is_targeted(self):
+        """The repair prompt lists the problems and carries only the draft"""
+        post = {"title": "T", "content": "Too short."}
+        prompt = build_repair_prompt(post, validate_post(post))
+        assert "Post has 2 words (min 250)" in prompt
+        assert json.dumps(post) in prompt
+
+
+class TestGeneratePostRepair:
+    """Tests for the repair loop in linkedin_agent.generate_post"""
+
+    def test_short_post_gets_one_targeted_reprompt(self):
+        """Only semantically broken output triggers a (single) extra model call"""
+        from linkedin_agent import generate_post
+        from llm_invoker import HedgedInvoker
+
+        short = Mock(content=json.dumps({"title": "T", "content": "Too short."}), usage_metadata=None)
+        fixed = Mock(content=json.dumps({"title": "T", "content": make_content(26)}), usage_metadata=None)
+        model = Mock()
+        model.invoke.side_effect = [short, fixed]
+
+        post = generate_post(HedgedInvoker([("test-model", model)]), "system", "user")
+
+        assert model.invoke.call_count == 2
+        repair_messages = model.invoke.call_args_list[1][0][0]
+        assert len(repair_messages) == 1 and "min 250" in repair_messages[0].content
+        assert post["validation_issues"] == []
+
+    def test_mechanical_issues_need_no_reprompt(self):
+        """Emojis and markdown are repaired locally"""
+        from linkedin_agent import generate_post
+        from llm_invoker import HedgedInvoker
+
+        response = Mock(content=json.dumps({"title": "**T** 🚀", "content": make_content(26)}), usage_metadata=None)
+        model = Mock()
+        model.invoke.return_value = response
+
+        post = generate_post(HedgedInvoker([("test-model", model)]), "system", "user")
+
+        assert model.invoke.call_count == 1
+        assert post["title"] == "T"
+        assert post["validation_issues"] == []
+        assert post["model"] == "test-model"
+
+    def test_invalid_post_gets_no_image_prompt(self, tmp_path):
+        """A post that is still invalid after repair stops before the image prompt"""
+        from artifact_store import ArtifactStore
+        from linkedin_agent import generate_profile_content
+        from llm_invoker import HedgedInvoker
+        from profiles import DEFAULT_PROFILE
+
+        short = Mock(content=json.dumps({"title": "T", "content": "Too short."}), usage_metadata=None)
+        model = Mock()
+        model.invoke.return_value = short
+
+        output = generate_profile_content(
+            DEFAULT_PROFILE, HedgedInvoker([("test-model", model)]), ArtifactStore(str(tmp_path)),
+            [], json.dumps({"results": []}), "test-model", resume=False
+        )
+
+        # Post plus one repair, no image prompt call
+        assert model.invoke.call_count == 2
+        assert output["validation_issues"] and output["image_prompt"] == ""
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
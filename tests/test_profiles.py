@@ -0,0 +1,146 @@
+"""
+Unit tests for profile configs and multi-profile generation
+
+Run with: pytest tests/test_profiles.py -v
+"""
+
+import pytest
+import os
+import sys
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from profiles import DEFAULT_PROFILE, build_system_prompt, load_profiles, profile_file, resolve_profile, select_profiles
+
+
+PROFILES = [
+    {"id": "ana", "name": "Ana", "persona": "Ana builds n8n automations.", "queries": ["n8n news"]},
+    {"id": "bruno", "name": "Bruno", "persona": "Bruno builds AI agents.", "queries": ["n8n news", "AI agents news"],
+     "person_urn": "urn:li:person:bruno"},
+    {"id": "carla", "name": "Carla", "persona": "Carla ships low-code apps.", "queries": ["AI agents news"],
+     "sheet_name": "Carla Themes"},
+]
+
+
+@pytest.fixture
+def profiles_file(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"profiles": PROFILES}))
+    return str(path)
+
+
+class TestProfileConfig:
+    """Tests for loading and selecting profiles"""
+
+    def test_default_profile_without_file(self, tmp_path):
+        """A missing profiles file means the built-in profile"""
+        profiles = load_profiles(str(tmp_path / "missing.json"))
+        assert [p["id"] for p in profiles] == [DEFAULT_PROFILE["id"]]
+
+    def test_file_profiles_get_defaults(self, profiles_file):
+        """Unspecified fields fall back to defaults, sheet tab to the profile id"""
+        profiles = {p["id"]: p for p in load_profiles(profiles_file)}
+
+        assert profiles["ana"]["sheet_name"] == "ana"
+        assert profiles["carla"]["sheet_name"] == "Carla Themes"
+        assert profiles["ana"]["keywords"] == DEFAULT_PROFILE["keywords"]
+        assert profiles["ana"]["person_urn"] is None
+        assert profiles["bruno"]["person_urn"] == "urn:li:person:bruno"
+
+    def test_incomplete_profile_is_rejected(self, tmp_path):
+        """Profiles need an id, name and persona"""
+        path = tmp_path / "profiles.json"
+        path.write_text(json.dumps([{"id": "x", "name": "X"}]))
+        with pytest.raises(ValueError, match="persona"):
+            load_profiles(str(path))
+
+    def test_select_profiles(self, profiles_file):
+        """Selections are 'all' or comma-separated ids"""
+        profiles = load_profiles(profiles_file)
+
+        assert len(select_profiles(profiles, "all")) == 3
+        assert [p["id"] for p in select_profiles(profiles, "carla, ana")] == ["ana", "carla"]
+        with pytest.raises(ValueError, match="Unknown profile"):
+            select_profiles(profiles, "dora")
+
+    def test_resolve_profile_needs_exactly_one(self, profiles_file, monkeypatch):
+        """Per-profile stages accept a single profile only"""
+        monkeypatch.setattr("profiles.PROFILES_FILE", profiles_file)
+
+        assert resolve_profile(None) is None
+        assert resolve_profile("bruno")["id"] == "bruno"
+        with pytest.raises(ValueError, match="exactly one"):
+            resolve_profile("all")
+
+    def test_profile_file_names(self):
+        """Per-profile outputs get an id suffix"""
+        assert profile_file("linkedin_post.json", None) == "linkedin_post.json"
+        assert profile_file("linkedin_image.png", "ana") == "linkedin_image_ana.png"
+
+    def test_system_prompt_uses_persona(self):
+        """The prompt is rendered from the profile"""
+        prompt = build_system_prompt({"name": "Ana", "persona": "Ana builds n8n automations.", "contact": "ana@x"})
+        assert prompt.startswith("You are an AI Content Strategist for Ana's LinkedIn profile.")
+        assert "Ana builds n8n automations." in prompt
+        assert '"title": "Hook-based title without **"' in prompt
+
+    def test_system_prompt_topics_come_from_profile(self):
+        """Topic area and tools are per profile, defaulting to the built-in ones"""
+        default_prompt = build_system_prompt(DEFAULT_PROFILE)
+        assert "search results for AI/Automation/Low-Code topics" in default_prompt
+        assert "Mention tools like n8n, Make, or AI agents if relevant" in default_prompt
+
+        prompt = build_system_prompt({"name": "Dora", "persona": "Dora sells shoes.", "topics": "e-commerce",
+                                      "tools": "Shopify"})
+        assert "search results for e-commerce topics" in prompt
+        assert "Mention tools like Shopify if relevant" in prompt
+        assert "n8n" not in prompt
+
+
+class TestMultiProfileGeneration:
+    """Multi-profile runs against the local stand-in services"""
+
+    def test_shared_search_and_single_sheets_read(self, profiles_file, tmp_path, monkeypatch):
+        """Three profiles cost two searches (distinct queries) and one Sheets read"""
+        from bench_end_to_end import pipeline_environment
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices
+        import linkedin_agent
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("profiles.PROFILES_FILE", profiles_file)
+        chat_model = FakeChatModel()
+        with FakeServices() as services, pipeline_environment(services, chat_model):
+            services.sheet_rows["Carla Themes"] = [["TEMA"], ["Low-code apps in 2026"]]
+            outputs = linkedin_agent.main(resume=False, selection="all")
+
+        assert sorted(outputs) == ["ana", "bruno", "carla"]
+        assert services.requests["brave"] == 2
+        # One token request plus one batchGet
+        assert services.requests["google"] == 2
+        assert chat_model.calls == 6
+        for profile_id in outputs:
+            with open(tmp_path / f"linkedin_post_{profile_id}.json") as f:
+                assert json.load(f)["content"]
+
+
+    def test_batch_read_falls_back_per_sheet(self):
+        """A missing tab fails the batchGet; the other tabs are then read one by one"""
+        from bench_end_to_end import pipeline_environment
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices
+        import sheets_manager
+
+        assert sheets_manager.a1_range("Carla's Themes", "A:A") == "'Carla''s Themes'!A:A"
+        with FakeServices(strict_sheets=True) as services, pipeline_environment(services, FakeChatModel()):
+            services.sheet_rows["Carla's Themes"] = [["TEMA"], ["Low-code apps in 2026"]]
+            themes = sheets_manager.get_recent_themes_batch(["missing", "Carla's Themes"])
+
+        assert themes == {"missing": [], "Carla's Themes": ["Low-code apps in 2026"]}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,284 @@
+"""
+Unit tests for the scheduled publish queue
+
+Run with: pytest tests/test_publish_queue.py -v
+"""
+
+import pytest
+import os
+import sys
+import json
+import time
+import base64
+from datetime import datetime, timezone
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import publish_queue
+from publish_queue import PublishDispatcher, enqueue, list_posts, next_slot, parse_time, parse_weekdays
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+# Friday 2026-10-16 10:00 UTC
+FRIDAY = utc(2026, 10, 16, 10, 0)
+
+
+@pytest.fixture(autouse=True)
+def utc_slots(monkeypatch):
+    monkeypatch.setattr(publish_queue, "PUBLISH_SLOTS", "09:00,16:00")
+    monkeypatch.setattr(publish_queue, "PUBLISH_WEEKDAYS", "MON-FRI")
+    monkeypatch.setattr(publish_queue, "PUBLISH_TIMEZONE", "UTC")
+
+
+class FakeClock:
+    """Clock whose sleep advances time instantly."""
+
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestSlots:
+    """Tests for slot calculation"""
+
+    def test_next_free_slot_skips_weekend_and_taken(self):
+        """Slots follow the configured times and weekdays"""
+        afternoon = utc(2026, 10, 16, 16, 0)
+
+        assert next_slot(FRIDAY) == afternoon
+        assert next_slot(FRIDAY, taken=[afternoon]) == utc(2026, 10, 19, 9, 0)
+        assert next_slot(FRIDAY, weekdays="SAT,SUN", slots="07:30") == utc(2026, 10, 17, 7, 30)
+
+    def test_parsing(self):
+        """Weekday ranges and naive times in the publishing time zone"""
+        assert parse_weekdays("MON-WED,FRI") == [0, 1, 2, 4]
+        assert parse_time("2026-10-16T16:00") == utc(2026, 10, 16, 16, 0)
+        assert parse_time("2026-10-16T13:00-03:00") == utc(2026, 10, 16, 16, 0)
+
+
+class TestEnqueue:
+    """Tests for adding posts to the queue"""
+
+    def test_slots_per_author_and_dedup(self, tmp_path):
+        """Each author gets its own next free slot; re-enqueuing is idempotent"""
+        path = str(tmp_path / "queue.sqlite3")
+
+        first = enqueue("A", "Post A", author_urn="urn:li:person:a", path=path, now=FRIDAY)
+        second = enqueue("B", "Post B", author_urn="urn:li:person:a", path=path, now=FRIDAY)
+        other = enqueue("C", "Post C", author_urn="urn:li:person:c", path=path, now=FRIDAY)
+        again = enqueue("A", "Post A", author_urn="urn:li:person:a", path=path, now=FRIDAY)
+
+        assert first["scheduled_at"] == utc(2026, 10, 16, 16, 0)
+        assert second["scheduled_at"] == utc(2026, 10, 19, 9, 0)
+        assert other["scheduled_at"] == first["scheduled_at"]
+        assert again["id"] == first["id"]
+        assert len(list_posts(path=path)) == 3
+
+    def test_published_content_is_not_queued_again(self, tmp_path):
+        """Re-enqueuing a post that already went out returns the published entry"""
+        from bench_end_to_end import pipeline_environment
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices
+
+        path = str(tmp_path / "queue.sqlite3")
+        first = enqueue("A", "Post A", scheduled_at=FRIDAY, path=path)
+        clock = FakeClock(FRIDAY)
+        with FakeServices() as services, pipeline_environment(services, FakeChatModel()):
+            dispatcher = PublishDispatcher(path, clock=clock.time, sleep=clock.sleep)
+            dispatcher.run(horizon_s=3600)
+            dispatcher.close()
+
+        again = enqueue("A", "Post A", path=path, now=FRIDAY + 60)
+
+        assert again["id"] == first["id"] and again["status"] == "published"
+        assert len(list_posts(path=path)) == 1
+
+
+class TestDispatcher:
+    """Dispatching against the local stand-in services"""
+
+    def test_publishes_in_slot_order_on_time(self, tmp_path):
+        """Posts go out earliest first, exactly at their slot, and reach the sheet"""
+        from bench_end_to_end import pipeline_environment
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices
+
+        path = str(tmp_path / "queue.sqlite3")
+        enqueue("Later", "Second post", image_base64=base64.b64encode(b"png").decode(),
+                scheduled_at=FRIDAY + 600, path=path)
+        enqueue("Sooner", "First post", scheduled_at=FRIDAY + 300, path=path)
+        enqueue("Tomorrow", "Third post", scheduled_at=FRIDAY + 86400, path=path)
+        clock = FakeClock(FRIDAY)
+
+        with FakeServices() as services, pipeline_environment(services, FakeChatModel()):
+            dispatcher = PublishDispatcher(path, clock=clock.time, sleep=clock.sleep)
+            summary = dispatcher.run(horizon_s=3600)
+            dispatcher.close()
+
+        assert summary == {"published": 2, "retried": 0, "failed": 0}
+        texts = [p["specificContent"]["com.linkedin.ugc.ShareContent"]["shareCommentary"]["text"]
+                 for p in services.published]
+        assert texts == ["First post", "Second post"]
+        assert clock.now == FRIDAY + 600
+        assert [row[0] for row in services.sheet_rows["Sheet1"][-2:]] == ["Sooner", "Later"]
+        assert services.sheet_rows["Sheet1"][-1][1] == "urn:li:share:2"
+        statuses = [entry["status"] for entry in list_posts(path=path)]
+        assert statuses == ["published", "published", "pending"]
+
+    def test_images_are_uploaded_ahead_of_the_slot(self, tmp_path, monkeypatch):
+        """The dispatcher uploads during its lead time; only the post is created at the slot"""
+        from bench_end_to_end import pipeline_environment
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices
+
+        path = str(tmp_path / "queue.sqlite3")
+        clock = FakeClock(FRIDAY)
+        upload, create_post = publish_queue.upload_image_to_linkedin, publish_queue.create_linkedin_post
+        events = []
+
+        def timed_upload(*args, **kwargs):
+            events.append(("upload", clock.now))
+            return upload(*args, **kwargs)
+
+        def flaky_create(**kwargs):
+            events.append(("create", clock.now, kwargs["image_asset_urn"]))
+            # LinkedIn rejects the first attempt
+            return None if len(events) == 2 else create_post(**kwargs)
+
+        with FakeServices() as services, pipeline_environment(services, FakeChatModel()):
+            enqueue("Pic", "Post with image", image_base64=base64.b64encode(b"png").decode(),
+                    scheduled_at=FRIDAY + 300, path=path)
+            assert services.uploads == {}
+
+            monkeypatch.setattr(publish_queue, "upload_image_to_linkedin", timed_upload)
+            monkeypatch.setattr(publish_queue, "create_linkedin_post", flaky_create)
+            dispatcher = PublishDispatcher(path, clock=clock.time, sleep=clock.sleep)
+            summary = dispatcher.run(horizon_s=600)
+            dispatcher.close()
+
+        retry_at = FRIDAY + 300 + publish_queue.PUBLISH_RETRY_DELAY_S
+        assert summary == {"published": 1, "retried": 1, "failed": 0}
+        # Uploaded before the slot, and again before the retry
+        assert events == [
+            ("upload", FRIDAY),
+            ("create", FRIDAY + 300, "urn:li:digitalmediaAsset:1"),
+            ("upload", FRIDAY + 300),
+            ("create", retry_at, "urn:li:digitalmediaAsset:2"),
+        ]
+        assert services.uploads == {"urn:li:digitalmediaAsset:1": 3, "urn:li:digitalmediaAsset:2": 3}
+        entry = list_posts(path=path)[0]
+        assert entry["image_asset_urn"] == "urn:li:digitalmediaAsset:2"
+        assert entry["image_base64"] is None
+
+    def test_failed_publish_is_retried_then_given_up(self, tmp_path, monkeypatch):
+        """LinkedIn errors reschedule the post until the attempts run out"""
+        from bench_end_to_end import pipeline_environment
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices, ServiceConfig
+
+        monkeypatch.setattr(publish_queue, "PUBLISH_MAX_ATTEMPTS", 2)
+        path = str(tmp_path / "queue.sqlite3")
+        enqueue("Doomed", "Never accepted", scheduled_at=FRIDAY, path=path)
+        clock = FakeClock(FRIDAY)
+
+        with FakeServices(config={"linkedin": ServiceConfig(error_rate=1.0)}) as services, \
+                pipeline_environment(services, FakeChatModel()):
+            dispatcher = PublishDispatcher(path, clock=clock.time, sleep=clock.sleep)
+            summary = dispatcher.run(horizon_s=3600)
+            dispatcher.close()
+
+        assert summary == {"published": 0, "retried": 1, "failed": 1}
+        entry = list_posts(path=path)[0]
+        assert entry["status"] == "failed" and entry["attempts"] == 2
+        assert clock.now == FRIDAY + publish_queue.PUBLISH_RETRY_DELAY_S
+
+    def test_retry_that_succeeds_is_not_a_failure(self, tmp_path, monkeypatch):
+        """A post published on retry leaves the dispatch stage successful"""
+        from bench_end_to_end import pipeline_environment
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(publish_queue, "PUBLISH_QUEUE_DB", str(tmp_path / "queue.sqlite3"))
+        monkeypatch.setattr(publish_queue, "PUBLISH_RETRY_DELAY_S", 0.0)
+        enqueue("Flaky", "Accepted the second time", scheduled_at=time.time() - 1)
+        create_post = publish_queue.create_linkedin_post
+        calls = []
+
+        def flaky_create(**kwargs):
+            calls.append(kwargs)
+            return None if len(calls) == 1 else create_post(**kwargs)
+
+        with FakeServices() as services, pipeline_environment(services, FakeChatModel()):
+            monkeypatch.setattr(publish_queue, "create_linkedin_post", flaky_create)
+            summary = publish_queue.dispatch_main(horizon_s=60)
+
+        assert summary == {"published": 1, "retried": 1, "failed": 0}
+        with open(tmp_path / "dispatch_result.json") as f:
+            assert json.load(f) == summary
+
+
+    def test_missing_token_claims_nothing(self, tmp_path, monkeypatch):
+        """Without a token the dispatcher fails before any post is claimed"""
+        monkeypatch.delenv("LINKEDIN_ACCESS_TOKEN", raising=False)
+        path = str(tmp_path / "queue.sqlite3")
+        enqueue("Waiting", "No token yet", scheduled_at=FRIDAY, path=path)
+        clock = FakeClock(FRIDAY)
+
+        dispatcher = PublishDispatcher(path, clock=clock.time, sleep=clock.sleep)
+        with pytest.raises(ValueError, match="LINKEDIN_ACCESS_TOKEN"):
+            dispatcher.run(horizon_s=3600)
+        dispatcher.close()
+
+        entry = list_posts(path=path)[0]
+        assert (entry["status"], entry["attempts"]) == ("pending", 0)
+
+    def test_error_before_sending_releases_the_claim(self, tmp_path, monkeypatch):
+        """A crash before the LinkedIn request puts the post back for the next run"""
+        from bench_end_to_end import pipeline_environment
+        from fake_chat_model import FakeChatModel
+        from fake_services import FakeServices
+
+        path = str(tmp_path / "queue.sqlite3")
+        enqueue("Pic", "Post with image", image_base64=base64.b64encode(b"png").decode(),
+                scheduled_at=FRIDAY, path=path)
+        clock = FakeClock(FRIDAY)
+
+        upload = publish_queue.upload_image_to_linkedin
+
+        def broken_upload(*args, **kwargs):
+            raise RuntimeError("disk on fire")
+
+        with FakeServices() as services, pipeline_environment(services, FakeChatModel()):
+            monkeypatch.setattr(publish_queue, "upload_image_to_linkedin", broken_upload)
+            dispatcher = PublishDispatcher(path, clock=clock.time, sleep=clock.sleep)
+            with pytest.raises(RuntimeError):
+                dispatcher.run(horizon_s=3600)
+            dispatcher.close()
+            entry = list_posts(path=path)[0]
+            assert (entry["status"], entry["attempts"]) == ("pending", 0)
+            assert services.published == []
+
+            monkeypatch.setattr(publish_queue, "upload_image_to_linkedin", upload)
+            dispatcher = PublishDispatcher(path, clock=clock.time, sleep=clock.sleep)
+            summary = dispatcher.run(horizon_s=3600)
+            dispatcher.close()
+
+        assert summary["published"] == 1
+        assert list_posts(path=path)[0]["status"] == "published"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,95 @@
+"""
+Unit tests for the shared rate limiter
+
+Run with: pytest tests/test_rate_limiter.py -v
+"""
+
+import pytest
+import os
+import sys
+import json
+import threading
+import subprocess
+from concurrent.futures import CancelledError
+
+# Add parent directory to path
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+import rate_limiter
+from rate_limiter import _parse_quota, acquire, reserve
+
+
+# Reserves `count` slots and prints the times at which each request may be sent
+WORKER = """
+import json, sys, time
+sys.path.insert(0, {scripts!r})
+import rate_limiter
+rate_limiter.RATE_LIMIT_DB = {db!r}
+rate_limiter.QUOTAS = {{"brave": (600, 1)}}
+slots = [time.time() + rate_limiter.reserve("brave") for _ in range({count})]
+print(json.dumps(slots))
+"""
+
+
+class TestRateLimiter:
+    """Tests for the SQLite token buckets"""
+
+    def test_burst_then_spaced_at_quota(self, monkeypatch):
+        """The burst is free, later requests wait exactly one interval each"""
+        monkeypatch.setattr(rate_limiter, "QUOTAS", {"brave": (60, 2)})
+
+        waits = [reserve("brave") for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(1.0, abs=0.05)
+        assert waits[3] == pytest.approx(2.0, abs=0.05)
+
+    def test_buckets_are_per_api(self, monkeypatch):
+        """Exhausting one API does not throttle another"""
+        monkeypatch.setattr(rate_limiter, "QUOTAS", {"brave": (60, 1), "sheets": (60, 1)})
+
+        reserve("brave")
+        assert reserve("brave") > 0
+        assert reserve("sheets") == 0.0
+
+    def test_cancelled_request_refunds_its_token(self, monkeypatch):
+        """A request abandoned while waiting gives its slot back"""
+        monkeypatch.setattr(rate_limiter, "QUOTAS", {"gemini": (60, 1)})
+        cancel = threading.Event()
+        cancel.set()
+
+        acquire("gemini")
+        with pytest.raises(CancelledError):
+            acquire("gemini", cancel=cancel)
+        assert reserve("gemini") == pytest.approx(1.0, abs=0.05)
+
+    def test_processes_share_the_quota(self, tmp_path):
+        """Reservations from separate processes never exceed the quota together"""
+        db = str(tmp_path / "shared.sqlite3")
+        code = WORKER.format(scripts=os.path.abspath(SCRIPTS_DIR), db=db, count=5)
+        workers = [subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE) for _ in range(2)]
+        slots = sorted(slot for w in workers for slot in json.loads(w.communicate(timeout=60)[0]))
+
+        assert len(slots) == 10
+        gaps = [later - earlier for earlier, later in zip(slots, slots[1:])]
+        # 600 per minute: one request every 0.1 s across both processes
+        assert slots[-1] - slots[0] >= 0.85
+        assert min(gaps) >= 0.0
+
+    def test_unusable_database_does_not_block(self, tmp_path, monkeypatch):
+        """Requests proceed unthrottled when the database cannot be opened"""
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        monkeypatch.setattr(rate_limiter, "RATE_LIMIT_DB", str(blocker / "db.sqlite3"))
+
+        assert acquire("brave") == 0.0
+
+    def test_parse_quota(self):
+        """Quotas are '<per minute>/<burst>' with burst defaulting to 1"""
+        assert _parse_quota("120/10") == (120.0, 10.0)
+        assert _parse_quota("30") == (30.0, 1.0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
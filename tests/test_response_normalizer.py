@@ -0,0 +1,99 @@
+"""
+Unit tests for the LLM response normalizer
+
+Run with: pytest tests/test_response_normalizer.py -v
+"""
+
+import pytest
+import os
+import sys
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from response_normalizer import normalize_response, normalize_stream, response_text
+from fake_chat_model import FakeResponse
+
+
+POST_JSON = json.dumps({"title": "Agents in production", "content": "Ship small, measure, iterate."})
+
+
+class TestResponseText:
+    """Tests for content extraction"""
+
+    def test_string_is_returned_unchanged(self):
+        """String content is not copied"""
+        assert response_text(POST_JSON) is POST_JSON
+
+    def test_parts_are_concatenated_exactly(self):
+        """JSON split across parts stays parseable (no separator inserted)"""
+        parts = [{"type": "text", "text": POST_JSON[:17]}, POST_JSON[17:40], {"text": POST_JSON[40:]}]
+
+        assert response_text(parts) == POST_JSON
+        assert json.loads(response_text(parts))["title"] == "Agents in production"
+
+    def test_non_text_parts_are_skipped(self):
+        """Thinking blocks and other non-text parts do not leak into the text"""
+        parts = [
+            {"type": "thinking", "thinking": "Let me plan the post..."},
+            {"type": "text", "text": "Hello"},
+            {"type": "image_url", "image_url": {"url": "data:..."}},
+        ]
+        assert response_text(parts) == "Hello"
+        assert response_text([]) == ""
+        assert response_text(None) == ""
+
+
+class TestNormalize:
+    """Tests for metadata extraction"""
+
+    def test_response_metadata(self):
+        """Usage, finish reason and model are exposed with the text"""
+        response = FakeResponse(
+            [{"type": "text", "text": "Hi"}],
+            {"input_tokens": 10, "output_tokens": 3, "total_tokens": 13},
+            {"finish_reason": "MAX_TOKENS", "model_name": "gemini-3-pro-preview"}
+        )
+
+        normalized = normalize_response(response)
+
+        assert normalized.text == "Hi"
+        assert normalized.input_tokens == 10 and normalized.output_tokens == 3
+        assert normalized.finish_reason == "MAX_TOKENS" and normalized.truncated
+        assert normalized.model == "gemini-3-pro-preview"
+
+    def test_stream_chunks(self):
+        """Chunks are concatenated in order, usage summed, last finish reason kept"""
+        chunks = [
+            FakeResponse(POST_JSON[:9], {"input_tokens": 10, "output_tokens": 1, "total_tokens": 11}, {}),
+            FakeResponse([{"type": "text", "text": POST_JSON[9:30]}], None, {}),
+            FakeResponse([POST_JSON[30:]], {"input_tokens": 0, "output_tokens": 4, "total_tokens": 4},
+                         {"finish_reason": "STOP", "model_name": "gemini-2.5-flash"}),
+        ]
+
+        normalized = normalize_stream(iter(chunks))
+
+        assert normalized.text == POST_JSON
+        assert normalized.usage == {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+        assert normalized.finish_reason == "STOP" and not normalized.truncated
+        assert normalized.model == "gemini-2.5-flash"
+
+
+class TestMicroBenchmark:
+    """Smoke test for the normalizer micro-benchmark"""
+
+    def test_benchmark_reports_exact_text(self):
+        """The normalizer keeps split answers intact; the old loop did not"""
+        from bench_response_normalizer import run_benchmark
+
+        results = run_benchmark(number=10, parts=4)
+
+        assert set(results) == {"string", "parts", "stream"}
+        assert all(result["exact"] for result in results.values())
+        assert not results["parts"]["legacy_exact"]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,98 @@
+"""
+Unit tests for search result ranking
+
+Run with: pytest tests/test_search_ranker.py -v
+"""
+
+import pytest
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from search_ranker import bm25_scores, novelty_scores, rank_results, recency_scores, result_age_days, tokenize
+
+NOW = 1_780_000_000.0  # Fixed clock for recency
+
+
+class TestScores:
+    """Tests for the individual score components"""
+
+    def test_tokenize_keeps_tool_names(self):
+        """Tool names with dots and digits survive tokenization"""
+        assert tokenize("New n8n and Bubble.io release!") == ["n8n", "bubble.io", "release"]
+
+    def test_bm25_prefers_matching_documents(self):
+        """Documents mentioning the query terms score higher"""
+        docs = [tokenize("n8n workflow automation tips"), tokenize("football results today"), []]
+        scores = bm25_scores(docs, tokenize("n8n automation"))
+        assert scores[0] > 0
+        assert scores[1] == 0 and scores[2] == 0
+
+    def test_novelty_penalizes_used_themes(self):
+        """Results similar to a past theme have lower novelty"""
+        docs = [tokenize("AI agents replace chatbots"), tokenize("Supabase edge functions launch")]
+        novelty = novelty_scores(docs, [tokenize("Why AI agents will replace chatbots")])
+        assert novelty[0] < novelty[1]
+        assert novelty[1] == pytest.approx(1.0)
+
+    def test_recency_decay(self):
+        """Newer results score higher; unknown ages get a neutral score"""
+        results = [
+            {"page_age": "2026-05-28T00:00:00"},
+            {"age": "14 days ago"},
+            {"age": "sometime"},
+        ]
+        scores = recency_scores(results, now=NOW)
+        assert scores[0] > scores[1]
+        assert scores[1] == pytest.approx(0.25)
+        assert scores[2] == 0.5
+
+    def test_result_age_from_page_age(self):
+        """ISO page_age is converted to days"""
+        assert result_age_days({"page_age": "2026-05-27T00:00:00Z"}, now=NOW) == pytest.approx(
+            (NOW - 1779840000.0) / 86400.0
+        )
+
+
+class TestRankResults:
+    """Tests for the combined ranking"""
+
+    def test_top_k_ordering(self):
+        """Relevant, novel and recent results are kept, best first"""
+        results = [
+            {"title": "Celebrity gossip", "description": "Nothing about tech", "age": "1 day ago"},
+            {"title": "n8n adds AI agents", "description": "Automation with n8n and AI agents", "age": "1 day ago"},
+            {"title": "Zapier AI agents", "description": "Why AI agents replace chatbots", "age": "1 day ago"},
+            {"title": "n8n 2019 retrospective", "description": "n8n automation history", "age": "2 years ago"},
+        ]
+        ranked = rank_results(
+            results, ["n8n", "AI agents", "automation"], ["Why AI agents replace chatbots"], top_k=2, now=NOW
+        )
+        assert [r["title"] for r in ranked] == ["n8n adds AI agents", "n8n 2019 retrospective"]
+        assert ranked[0]["score"] >= ranked[1]["score"]
+
+    def test_empty_results(self):
+        """No results rank to an empty list"""
+        assert rank_results([], ["n8n"], []) == []
+
+
+class TestRankSearchResults:
+    """Tests for the ranking step in linkedin_agent"""
+
+    def test_prompt_gets_only_top_k(self):
+        """Only the top-k results, without ranking fields, reach the prompt"""
+        from linkedin_agent import rank_search_results
+
+        results = [{"title": f"n8n news {i}", "description": "automation", "url": f"u{i}",
+                    "age": f"{i} days ago", "page_age": ""} for i in range(10)]
+        ranked = json.loads(rank_search_results(json.dumps({"results": results}), [], top_k=3))
+
+        assert [r["url"] for r in ranked["results"]] == ["u0", "u1", "u2"]
+        assert set(ranked["results"][0]) == {"title", "description", "url", "age"}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])